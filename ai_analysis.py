@@ -0,0 +1,155 @@
+import queue
+import threading
+
+from gemini_client import response_text
+from llm_cache import make_cache_key
+from prompting import PROMPT_TEMPLATE_VERSION, analysis_plan, build_analysis_prompts
+
+# The rewritten resume is by far the longest part, so it is streamed; the others arrive whole
+STREAMED_PART = "improved_resume"
+
+
+def part_cache_key(model_name, part, resume_text, job_description=None):
+    return make_cache_key(
+        model_name,
+        f"{PROMPT_TEMPLATE_VERSION}/{part.name}",
+        resume_text,
+        job_description if part.uses_job_description else None,
+    )
+
+
+def _strip_echoed_heading(text, heading):
+    lines = (text or "").strip().split("\n")
+    if lines and lines[0].lstrip("#* ").rstrip(":* ").strip().lower() == heading.lower():
+        lines = lines[1:]
+    return "\n".join(lines).strip()
+
+
+def _strip_echoed_heading_line(head, heading):
+    # Streaming version of _strip_echoed_heading for the start of a streamed part
+    first, newline, rest = head.lstrip().partition("\n")
+    if first.lstrip("#* ").rstrip(":* ").strip().lower() == heading.lower():
+        return rest.lstrip("\n")
+    return head.lstrip()
+
+
+def _section(part, text):
+    return f"## {part.heading}\n{_strip_echoed_heading(text, part.heading)}\n\n"
+
+
+# 📌 Function to Merge part results into the markdown layout extract_improved_resume expects
+def merge_analysis(parts, results):
+    return "".join(_section(part, results[part.name]) for part in parts if results.get(part.name)).strip()
+
+
+# 📌 Function to Return the full analysis if every part is already cached (never calls the API)
+def cached_analysis(cache, model_name, resume_text, job_description=None):
+    parts = analysis_plan(job_description)
+    results = {}
+    for part in parts:
+        cached = cache.get(part_cache_key(model_name, part, resume_text, job_description))
+        if not cached:
+            return None
+        results[part.name] = cached
+    return merge_analysis(parts, results)
+
+
+# 📌 Function to Run every uncached part concurrently and merge the results
+def run_analysis(client, cache, model_name, resume_text, job_description=None):
+    parts = analysis_plan(job_description)
+    prompts, _ = build_analysis_prompts(resume_text, job_description)
+
+    results = {}
+    missing = []
+    for part in parts:
+        cached = cache.get(part_cache_key(model_name, part, resume_text, job_description))
+        if cached:
+            results[part.name] = cached
+        else:
+            missing.append(part)
+
+    responses = client.generate_many([prompts[part.name] for part in missing])
+    errors = []
+    for part, response in zip(missing, responses):
+        if isinstance(response, Exception):
+            errors.append(response)
+            continue
+        text = response_text(response)
+        if text:
+            # Successful parts are cached even if a sibling failed, so a retry only re-runs the failures
+            cache.put(part_cache_key(model_name, part, resume_text, job_description), text)
+            results[part.name] = text
+    if errors:
+        raise errors[0]
+    return merge_analysis(parts, results)
+
+
+def _stream_into_queue(client, prompt, chunks):
+    try:
+        for chunk in client.generate_stream(prompt):
+            chunks.put(("chunk", chunk))
+        chunks.put(("done", None))
+    except Exception as e:
+        chunks.put(("error", e))
+
+
+# 📌 Function to Stream the analysis: sections are yielded in document order as soon as they are ready.
+# The first section (the assessment) and the rewritten resume stream chunk by chunk; the other parts run
+# concurrently behind them and arrive whole.
+def stream_analysis(client, cache, model_name, resume_text, job_description=None):
+    parts = analysis_plan(job_description)
+    prompts, _ = build_analysis_prompts(resume_text, job_description)
+
+    # Start everything that is not cached before yielding anything
+    pending = {}
+    for index, part in enumerate(parts):
+        key = part_cache_key(model_name, part, resume_text, job_description)
+        cached = cache.get(key)
+        if cached:
+            pending[part.name] = cached
+        elif index == 0 or part.name == STREAMED_PART:
+            chunks = queue.Queue()
+            threading.Thread(
+                target=_stream_into_queue, args=(client, prompts[part.name], chunks), daemon=True
+            ).start()
+            pending[part.name] = chunks
+        else:
+            pending[part.name] = client.submit(prompts[part.name])
+
+    for part in parts:
+        key = part_cache_key(model_name, part, resume_text, job_description)
+        result = pending[part.name]
+
+        if isinstance(result, queue.Queue):
+            # Strip an echoed heading from the first line before passing chunks through
+            yield f"## {part.heading}\n"
+            collected = []
+            head = ""
+            while True:
+                kind, value = result.get()
+                if kind == "error":
+                    raise value
+                if kind == "done":
+                    break
+                collected.append(value)
+                if head is not None:
+                    head += value
+                    if "\n" not in head:
+                        continue
+                    value, head = _strip_echoed_heading_line(head, part.heading), None
+                yield value
+            if head:
+                yield _strip_echoed_heading_line(head, part.heading)
+            if collected:
+                cache.put(key, "".join(collected))
+            # End the section the way _section does, with exactly one blank line
+            yield "\n" if collected and collected[-1].endswith("\n") else "\n\n"
+            continue
+
+        if not isinstance(result, str):
+            text = response_text(result.result())
+            if not text:
+                continue
+            cache.put(key, text)
+            result = text
+        yield _section(part, result)
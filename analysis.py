@@ -0,0 +1,187 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from ats_rules import get_ruleset, resume_features, summarize_breakdown
+from metrics import record_cache, trace
+from nlp_pipeline import tokenize
+from sections import SectionSegmenter, section_kinds, span_at
+from skills import get_skill_matcher
+
+ESSENTIAL_SECTIONS = ['experience', 'education', 'skills', 'summary']
+
+BULLET_PATTERN = re.compile(r'•|\u2022|\d+\.')
+EMAIL_PATTERN = re.compile(r'\b[\w\.-]+@[\w\.-]+\.\w{2,4}\b')
+
+ANALYSIS_CACHE_SIZE = 128
+
+
+# ✅ Everything derived from a resume's text, computed once and shared by every view
+@dataclass
+class ResumeAnalysis:
+    text: str
+    content_hash: str
+    lowered: str
+    tokens: list = field(default_factory=list)
+    skill_matches: list = field(default_factory=list)
+    sections: list = field(default_factory=list)
+    section_spans: list = field(default_factory=list)
+    contact: dict = field(default_factory=dict)
+    formatting: dict = field(default_factory=dict)
+
+    @property
+    def skills(self):
+        return _unique_skills(self.skill_matches)
+
+    @property
+    def missing_sections(self):
+        return [section for section in ESSENTIAL_SECTIONS if section not in self.sections]
+
+    # 📌 Text of every section of one type (e.g. "experience"), joined
+    def section_text(self, kind):
+        return "\n".join(self.text[span.content_start:span.end].strip() for span in self.section_spans if span.kind == kind)
+
+    # 📌 Skills grouped by the section they appear in
+    @property
+    def skills_by_section(self):
+        grouped = {}
+        for match in self.skill_matches:
+            span = span_at(self.section_spans, match.start)
+            skills = grouped.setdefault(span.kind if span else "header", [])
+            if match.skill not in skills:
+                skills.append(match.skill)
+        return grouped
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _remember(analysis):
+    with _cache_lock:
+        _cache[analysis.content_hash] = analysis
+        _cache.move_to_end(analysis.content_hash)
+        while len(_cache) > ANALYSIS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analysis
+
+
+# 📌 Function to Drop every cached analysis (benchmarks use it to time the uncached path)
+def clear_analysis_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+# ✅ Builds a ResumeAnalysis from text chunks as they arrive (pages, paragraph groups)
+# Chunks are joined with newlines, matching the text parse_resume returns.
+class IncrementalAnalysis:
+    def __init__(self):
+        self._chunks = []
+        self._scanner = get_skill_matcher().scanner()
+        self.skill_matches = []
+        self._segmenter = SectionSegmenter()
+        self.emails = []
+        self.bullet_count = 0
+        self.char_count = 0
+
+    @property
+    def text(self):
+        return '\n'.join(self._chunks)
+
+    @property
+    def chunk_count(self):
+        return len(self._chunks)
+
+    @property
+    def skills(self):
+        return _unique_skills(self.skill_matches)
+
+    @property
+    def sections(self):
+        return self._segmenter.kinds
+
+    def feed(self, chunk):
+        piece = '\n' + chunk if self._chunks else chunk
+        self._chunks.append(chunk)
+        self.char_count += len(piece)
+
+        # Headings, emails and bullets never span a newline, so each chunk is checked on its own
+        self._segmenter.feed(piece)
+        self.emails.extend(EMAIL_PATTERN.findall(piece))
+        self.bullet_count += len(BULLET_PATTERN.findall(piece))
+        self.skill_matches.extend(self._scanner.feed(piece))
+        return self
+
+    def finish(self):
+        self.skill_matches.extend(self._scanner.finish())
+        self.skill_matches.sort(key=lambda match: (match.start, -match.end))
+        text = self.text
+        section_spans = self._segmenter.finish()
+        return _remember(ResumeAnalysis(
+            text=text,
+            content_hash=content_hash(text),
+            lowered=text.lower(),
+            tokens=[token.text for token in tokenize(text)],
+            skill_matches=self.skill_matches,
+            sections=section_kinds(section_spans),
+            section_spans=section_spans,
+            contact={"emails": self.emails},
+            formatting={
+                "bullet_count": self.bullet_count,
+                "char_count": self.char_count,
+            },
+        ))
+
+
+def _unique_skills(skill_matches):
+    seen = {}
+    for match in skill_matches:
+        seen.setdefault(match.skill, None)
+    return list(seen)
+
+
+# 📌 Function to Build the shared analysis for a resume (cached by content hash)
+def analyze_resume(text):
+    if isinstance(text, ResumeAnalysis):
+        return text
+
+    text = text or ""
+    cached = _cached(content_hash(text))
+    record_cache("analysis", cached is not None)
+    if cached is not None:
+        return cached
+    # Tokenizing, the skill scan and sectioning all happen here, for every caller: this is the extract_skills stage
+    with trace("extract_skills") as span:
+        analysis = IncrementalAnalysis().feed(text).finish()
+        span.size("characters", len(text))
+        span.size("tokens", len(analysis.tokens))
+    return analysis
+
+
+# 📌 Function to Generate ATS Score (rules come from the ATS ruleset, see ats_rules.json)
+def calculate_ats_score(resume, profile=None):
+    analysis = analyze_resume(resume)
+    with trace("calculate_ats_score"):
+        score, breakdown = get_ruleset(profile).evaluate(resume_features(analysis))
+
+    return {
+        "score": score,
+        **summarize_breakdown(breakdown),
+        "skills_found": analysis.skills,
+        "sections_found": analysis.sections,
+        "breakdown": breakdown,
+    }
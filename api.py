@@ -0,0 +1,380 @@
+import asyncio
+import hmac
+import io
+import os
+import time
+import unicodedata
+import uuid
+import zipfile
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+# ✅ Load .env before the app modules read their settings from the environment
+load_dotenv()
+
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from ai_analysis import run_analysis
+from ats_rules import ruleset_profiles
+from batch import (
+    API_MAX_BATCH_BYTES, API_MAX_BATCH_FILES, API_MAX_UPLOAD_BYTES, BATCH_WORKERS, RESULT_COLUMNS, RESUME_EXTENSIONS,
+    ArchiveTooLarge, create_worker_pool, iter_resume_sources, record_worker_metrics, screen_resume
+)
+from core import (
+    DOCX_TEMPLATES, GEMINI_MODEL, extract_improved_resume, gemini_error_message, get_analysis_store, get_blob_store,
+    get_llm_cache, save_screening_row, text_to_docx
+)
+from docx_templates import export_all_templates, export_docx_zip, shortlist_entry_name
+from gemini_client import GEMINI_MAX_CONCURRENCY, configure_gemini, get_gemini_client
+from metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus, trace
+from prompting import estimate_tokens
+
+# ✅ Service limits (overridable from the environment)
+API_PARSE_WORKERS = int(os.getenv("API_PARSE_WORKERS", str(BATCH_WORKERS)))
+API_MAX_PENDING_PARSES = int(os.getenv("API_MAX_PENDING_PARSES", str(API_PARSE_WORKERS * 4)))
+API_AI_WORKERS = int(os.getenv("API_AI_WORKERS", str(GEMINI_MAX_CONCURRENCY)))
+API_MAX_QUEUED_JOBS = int(os.getenv("API_MAX_QUEUED_JOBS", "1000"))
+API_JOB_HISTORY = int(os.getenv("API_JOB_HISTORY", "10000"))
+API_RETRY_AFTER_SECONDS = int(os.getenv("API_RETRY_AFTER_SECONDS", "5"))
+API_KEY = os.getenv("RESUME_API_KEY")
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+LIST_COLUMNS = ("skills", "missing_sections", "formatting_issues")
+
+
+class AnalysisRequest(BaseModel):
+    job_description: Optional[str] = None
+
+
+# ✅ Shared service state: the parse worker pool, the AI job queue and recent job results
+class ServiceState:
+    def __init__(self):
+        self.pool = None
+        self.parse_slots = None
+        self.parsing = 0
+        self.jobs = OrderedDict()
+        self.queue = None
+        self.workers = []
+        self.ai_enabled = False
+
+    def remember(self, job):
+        self.jobs[job["job_id"]] = job
+        # Keep a bounded history; finished results stay available from the store
+        while len(self.jobs) > API_JOB_HISTORY:
+            self.jobs.popitem(last=False)
+
+
+state = ServiceState()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if api_key:
+        configure_gemini(api_key)
+    state.ai_enabled = bool(api_key)
+    state.pool = create_worker_pool(API_PARSE_WORKERS)
+    state.parse_slots = asyncio.Semaphore(API_MAX_PENDING_PARSES)
+    state.queue = asyncio.Queue(maxsize=API_MAX_QUEUED_JOBS)
+    state.workers = [asyncio.create_task(analysis_worker(state.queue)) for _ in range(max(1, API_AI_WORKERS))]
+    try:
+        yield
+    finally:
+        for worker in state.workers:
+            worker.cancel()
+        await asyncio.gather(*state.workers, return_exceptions=True)
+        state.pool.shutdown(cancel_futures=True)
+
+
+app = FastAPI(title="AI Resume Analyzer API", lifespan=lifespan)
+
+
+# 📌 Function to Check the X-API-Key header when RESUME_API_KEY is set
+def require_api_key(x_api_key: Optional[str] = Header(None)):
+    if API_KEY and not (x_api_key and hmac.compare_digest(x_api_key, API_KEY)):
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+
+def _busy(detail):
+    return HTTPException(status_code=503, detail=detail, headers={"Retry-After": str(API_RETRY_AFTER_SECONDS)})
+
+
+def _check_profile(profile):
+    if profile and profile not in ruleset_profiles():
+        raise HTTPException(status_code=400, detail=f"Unknown scoring profile '{profile}'")
+
+
+async def _read_upload(upload):
+    data = await upload.read(API_MAX_UPLOAD_BYTES + 1)
+    if len(data) > API_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"{upload.filename} is larger than {API_MAX_UPLOAD_BYTES} bytes")
+    return data
+
+
+# 📌 Function to Build a Content-Disposition header for any filename: an ASCII fallback
+# (accents dropped, quotes and control characters replaced) plus the exact UTF-8 name per RFC 5987
+def _attachment(filename):
+    filename = os.path.basename(filename.replace("\\", "/")) or "download"
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    fallback = "".join("_" if character in '"\\' or not character.isprintable() else character for character in fallback).strip()
+    # A name with no ASCII left ("简历.docx") keeps at least its extension
+    stem, dot, extension = fallback.rpartition(".")
+    if not dot:
+        stem, extension = extension, ""
+    if not stem.strip("_ ."):
+        fallback = "download" + dot + extension
+    return {"Content-Disposition": f'attachment; filename="{fallback}"; '
+                                   f"filename*=UTF-8''{quote(filename, safe='')}"}
+
+
+def _row_response(row):
+    response = {column: row.get(column) for column in RESULT_COLUMNS if column not in ("content_hash", "duplicate_of")}
+    response["resume_id"] = row.get("content_hash")
+    for column in LIST_COLUMNS:
+        response[column] = row[column].split(", ") if row.get(column) else []
+    return response
+
+
+# 📌 Function to Parse, score and store one file in the worker pool
+# With wait=False a full parse queue is rejected at once (503) instead of queueing the request
+async def screen_upload(name, data, profile=None, wait=False):
+    if not wait and state.parse_slots.locked():
+        raise _busy("All parse workers are busy, retry shortly")
+    async with state.parse_slots:
+        state.parsing += 1
+        try:
+            loop = asyncio.get_running_loop()
+            row = record_worker_metrics(await loop.run_in_executor(state.pool, screen_resume, name, data, profile))
+        finally:
+            state.parsing -= 1
+    if row.get("text"):
+        blob_key = await asyncio.to_thread(get_blob_store().put, data)
+        await asyncio.to_thread(save_screening_row, row, row["text"], blob_key)
+    return row
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "ok",
+        "parsing": state.parsing,
+        "queued_jobs": state.queue.qsize() if state.queue else 0,
+        "ai_enabled": state.ai_enabled,
+    }
+
+
+# Prometheus scrape endpoint: stage durations, input sizes, cache hits and errors (no resume data, so no API key)
+@app.get("/metrics")
+async def metrics():
+    return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.post("/v1/resumes", dependencies=[Depends(require_api_key)])
+async def upload_resume(file: UploadFile = File(...), profile: Optional[str] = Form(None)):
+    _check_profile(profile)
+    if not file.filename.lower().endswith(RESUME_EXTENSIONS):
+        raise HTTPException(status_code=415, detail="Upload a PDF or DOCX file")
+    row = await screen_upload(file.filename, await _read_upload(file), profile)
+    if row["error"]:
+        raise HTTPException(status_code=422, detail=row["error"])
+    return _row_response(row)
+
+
+@app.post("/v1/resumes/batch", dependencies=[Depends(require_api_key)])
+async def upload_resumes(files: List[UploadFile] = File(...), profile: Optional[str] = Form(None)):
+    _check_profile(profile)
+    sources = []
+    total_bytes = 0
+    for upload in files:
+        data = await _read_upload(upload)
+        if upload.filename.lower().endswith(".zip"):
+            # Each entry gets the single-upload limit; the archive gets whatever is left of the batch limits
+            try:
+                entries = list(iter_resume_sources(
+                    io.BytesIO(data), max_files=API_MAX_BATCH_FILES - len(sources),
+                    max_file_bytes=API_MAX_UPLOAD_BYTES, max_total_bytes=API_MAX_BATCH_BYTES - total_bytes,
+                ))
+            except ArchiveTooLarge as e:
+                raise HTTPException(status_code=413, detail=f"{upload.filename}: {e}")
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=422, detail=f"{upload.filename} is not a valid ZIP archive")
+        elif upload.filename.lower().endswith(RESUME_EXTENSIONS):
+            entries = [(upload.filename, data)]
+        else:
+            continue
+        sources.extend(entries)
+        total_bytes += sum(len(entry) for _, entry in entries)
+        if len(sources) > API_MAX_BATCH_FILES:
+            raise HTTPException(status_code=413, detail=f"A batch holds at most {API_MAX_BATCH_FILES} resumes")
+        if total_bytes > API_MAX_BATCH_BYTES:
+            raise HTTPException(status_code=413, detail=f"A batch holds at most {API_MAX_BATCH_BYTES} bytes of resumes")
+    if state.parse_slots.locked():
+        raise _busy("All parse workers are busy, retry shortly")
+    # An accepted batch waits for parse slots instead of failing halfway through
+    rows = await asyncio.gather(*(screen_upload(name, data, profile, wait=True) for name, data in sources))
+    return {"results": [_row_response(row) for row in rows]}
+
+
+@app.get("/v1/resumes/{resume_id}", dependencies=[Depends(require_api_key)])
+async def get_resume(resume_id: str, include_text: bool = False):
+    stored = await asyncio.to_thread(get_analysis_store().get_resume, resume_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    response = stored._asdict()
+    if not include_text:
+        response.pop("text")
+    return response
+
+
+@app.get("/v1/resumes/{resume_id}/file", dependencies=[Depends(require_api_key)])
+async def get_original_file(resume_id: str):
+    stored = await asyncio.to_thread(get_analysis_store().get_resume, resume_id)
+    if stored is None or not stored.blob_key or stored.blob_key not in get_blob_store():
+        raise HTTPException(status_code=404, detail="Original file not found")
+    data = await asyncio.to_thread(get_blob_store().get, stored.blob_key)
+    media_type = DOCX_MEDIA_TYPE if stored.extension == "docx" else "application/pdf"
+    return Response(data, media_type=media_type,
+                    headers=_attachment(stored.filename or f"{resume_id}.{stored.extension}"))
+
+
+# 📌 Function to Run one queued AI analysis job (blocking Gemini calls run in a thread)
+def run_analysis_job(resume_text, job_description):
+    with trace("ai_resume_improvement_gemini") as span:
+        span.size("characters", len(resume_text))
+        span.size("tokens", estimate_tokens(resume_text))
+        client = get_gemini_client(GEMINI_MODEL)
+        return run_analysis(client, get_llm_cache(), GEMINI_MODEL, resume_text, job_description)
+
+
+# ✅ AI workers: a fixed number of tasks drain the job queue, so Gemini load stays bounded
+async def analysis_worker(queue):
+    while True:
+        job, resume_text = await queue.get()
+        job["status"] = "running"
+        try:
+            suggestions = await asyncio.to_thread(run_analysis_job, resume_text, job["job_description"])
+            if not suggestions:
+                raise ValueError("No suggestions available.")
+            await asyncio.to_thread(
+                get_analysis_store().save_ai_output, job["resume_id"], GEMINI_MODEL, suggestions, job["job_description"]
+            )
+            job.update(status="done", result=suggestions)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.update(status="failed", error=gemini_error_message(e))
+        finally:
+            job["finished_at"] = time.time()
+            queue.task_done()
+
+
+def _job_response(job):
+    response = {key: value for key, value in job.items() if key != "job_description"}
+    if job.get("result"):
+        response["improved_resume"] = extract_improved_resume(job["result"])
+    return response
+
+
+@app.post("/v1/resumes/{resume_id}/analysis", status_code=202, dependencies=[Depends(require_api_key)])
+async def request_analysis(resume_id: str, request: AnalysisRequest = AnalysisRequest()):
+    if not state.ai_enabled:
+        raise HTTPException(status_code=503, detail="AI analysis is disabled: GOOGLE_API_KEY is not set")
+    store = get_analysis_store()
+    stored = await asyncio.to_thread(store.get_resume, resume_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    job = {
+        "job_id": uuid.uuid4().hex, "resume_id": resume_id, "status": "queued", "result": None, "error": None,
+        "job_description": request.job_description, "created_at": time.time(), "finished_at": None,
+    }
+    # Suggestions already stored for this resume and job description are returned without a new job
+    previous = await asyncio.to_thread(store.get_ai_output, resume_id, GEMINI_MODEL, request.job_description)
+    if previous:
+        job.update(status="done", result=previous, finished_at=job["created_at"])
+    else:
+        try:
+            state.queue.put_nowait((job, stored.text))
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=429, detail="Too many queued analyses, retry later",
+                                headers={"Retry-After": str(API_RETRY_AFTER_SECONDS)})
+    state.remember(job)
+    return _job_response(job)
+
+
+@app.get("/v1/jobs/{job_id}", dependencies=[Depends(require_api_key)])
+async def get_job(job_id: str):
+    job = state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+
+async def _improved_resume(resume_id, job_description=None):
+    suggestions = await asyncio.to_thread(get_analysis_store().get_ai_output, resume_id, GEMINI_MODEL, job_description)
+    return extract_improved_resume(suggestions) if suggestions else None
+
+
+def _check_template(template):
+    if template not in DOCX_TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template. Choose from: {', '.join(DOCX_TEMPLATES)}")
+
+
+# ?template=all returns the resume in every template as a ZIP
+@app.get("/v1/resumes/{resume_id}/docx", dependencies=[Depends(require_api_key)])
+async def download_improved_resume(resume_id: str, template: str = "Modern", job_description: Optional[str] = None):
+    if template != "all":
+        _check_template(template)
+    improved = await _improved_resume(resume_id, job_description)
+    if not improved:
+        raise HTTPException(status_code=404, detail="No improved resume yet; request an analysis first")
+    if template == "all":
+        buffer = await asyncio.to_thread(export_all_templates, improved, f"improved_resume_{resume_id[:12]}")
+        return Response(buffer.getvalue(), media_type="application/zip",
+                        headers=_attachment("improved_resume_all_templates.zip"))
+    buffer = await asyncio.to_thread(text_to_docx, improved, template)
+    return Response(buffer.getvalue(), media_type=DOCX_MEDIA_TYPE,
+                    headers=_attachment(f"improved_resume_{template.lower()}.docx"))
+
+
+class ExportRequest(BaseModel):
+    resume_ids: List[str]
+    template: str = "Modern"
+    job_description: Optional[str] = None
+
+
+# 📌 Export a shortlist in one template as a ZIP (AI-improved versions where available, else the parsed text)
+@app.post("/v1/exports/docx", dependencies=[Depends(require_api_key)])
+async def export_shortlist(request: ExportRequest):
+    _check_template(request.template)
+    if len(request.resume_ids) > API_MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"An export holds at most {API_MAX_BATCH_FILES} resumes")
+    documents = []
+    for resume_id in request.resume_ids:
+        stored = await asyncio.to_thread(get_analysis_store().get_resume, resume_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail=f"Resume {resume_id} not found")
+        improved = await _improved_resume(resume_id, request.job_description)
+        filename = shortlist_entry_name(stored.filename, resume_id, improved, request.template)
+        documents.append((filename, improved or stored.text, request.template))
+    buffer = await asyncio.to_thread(export_docx_zip, documents)
+    return Response(buffer.getvalue(), media_type="application/zip",
+                    headers=_attachment(f"shortlist_{request.template.lower()}.zip"))
+
+
+@app.get("/v1/search", dependencies=[Depends(require_api_key)])
+async def search_resumes(q: Optional[str] = None, skill: Optional[str] = None, min_score: Optional[float] = None,
+                         since: Optional[float] = None, limit: int = Query(50, ge=1, le=500)):
+    results = await asyncio.to_thread(get_analysis_store().search, q, skill, min_score, since, limit)
+    return {"results": [result._asdict() for result in results]}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", "8000")))
@@ -0,0 +1,248 @@
+import argparse
+import json
+import math
+import os
+import re
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# ✅ Ruleset file (JSON, or YAML if PyYAML is installed); the default reproduces the original scoring
+ATS_RULES_PATH = os.getenv("ATS_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ats_rules.json"))
+
+RuleOutcome = namedtuple("RuleOutcome", ["rule_id", "label", "category", "passed", "penalty"])
+BatchScores = namedtuple("BatchScores", ["scores", "penalties", "rules"])
+
+
+# 📌 Function to Reduce a ResumeAnalysis to what the rules look at (cheap to keep for thousands of resumes)
+def resume_features(analysis):
+    return {
+        "text": analysis.text,
+        "section_spans": analysis.section_spans,
+        "sections": set(analysis.sections),
+        "skills": set(analysis.skills),
+        "char_count": analysis.formatting["char_count"],
+        "bullet_count": analysis.formatting["bullet_count"],
+        "email_count": len(analysis.contact["emails"]),
+        "skill_count": len(analysis.skills),
+        "section_count": len(analysis.sections),
+    }
+
+
+def load_ruleset(path=ATS_RULES_PATH):
+    with open(path, encoding="utf-8") as handle:
+        if path.lower().endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(handle)
+        return json.load(handle)
+
+
+def _metric_values(features, metric):
+    return np.fromiter((item[metric] for item in features), dtype=np.float64, count=len(features))
+
+
+def _section_text(item, section):
+    if section is None:
+        return item["text"]
+    text = item["text"]
+    return "\n".join(text[span.content_start:span.end] for span in item["section_spans"] if span.kind == section)
+
+
+# Each compiler turns one rule into a function: list of feature dicts -> array of penalties
+
+def _compile_section(rule):
+    section, penalty = rule["section"], rule["penalty"]
+
+    def evaluate(features):
+        present = np.fromiter((section in item["sections"] for item in features), dtype=bool, count=len(features))
+        return np.where(present, 0.0, penalty)
+    return evaluate
+
+
+def _compile_metric(rule):
+    metric, penalty = rule["metric"], rule["penalty"]
+    bounds = [
+        (np.greater, rule.get("greater_than")),
+        (np.greater_equal, rule.get("at_least")),
+        (np.less, rule.get("less_than")),
+        (np.less_equal, rule.get("at_most")),
+    ]
+    bounds = [(compare, limit) for compare, limit in bounds if limit is not None]
+
+    def evaluate(features):
+        values = _metric_values(features, metric)
+        passed = np.ones(len(values), dtype=bool)
+        for compare, limit in bounds:
+            passed &= compare(values, limit)
+        return np.where(passed, 0.0, penalty)
+    return evaluate
+
+
+def _compile_shortfall(rule):
+    # Below the target: the full penalty, less credit for each unit present
+    metric, target, penalty = rule["metric"], rule["target"], rule["penalty"]
+    credit = rule.get("credit_per_unit", 0)
+
+    def evaluate(features):
+        values = _metric_values(features, metric)
+        return np.where(values < target, np.maximum(penalty - np.floor(values * credit), 0), 0.0)
+    return evaluate
+
+
+def _compile_skills(rule):
+    skills = [skill.lower() for skill in rule["skills"]]
+    per_missing, max_penalty = rule["penalty_per_missing"], rule.get("max_penalty", math.inf)
+
+    def evaluate(features):
+        missing = np.fromiter(
+            (sum(skill not in item["skills"] for skill in skills) for item in features),
+            dtype=np.float64, count=len(features),
+        )
+        return np.minimum(missing * per_missing, max_penalty)
+    return evaluate
+
+
+def _compile_pattern(rule):
+    pattern = re.compile(rule["pattern"], re.IGNORECASE if rule.get("ignore_case") else 0)
+    section, penalty = rule.get("section"), rule["penalty"]
+    at_least, at_most = rule.get("at_least"), rule.get("at_most")
+
+    def evaluate(features):
+        counts = np.fromiter(
+            (sum(1 for _ in pattern.finditer(_section_text(item, section))) for item in features),
+            dtype=np.float64, count=len(features),
+        )
+        passed = np.ones(len(counts), dtype=bool)
+        if at_least is not None:
+            passed &= counts >= at_least
+        if at_most is not None:
+            passed &= counts <= at_most
+        return np.where(passed, 0.0, penalty)
+    return evaluate
+
+
+RULE_COMPILERS = {
+    "section": _compile_section,
+    "metric": _compile_metric,
+    "shortfall": _compile_shortfall,
+    "skills": _compile_skills,
+    "pattern": _compile_pattern,
+}
+
+
+# ✅ A ruleset (plus an optional role profile) compiled into one evaluator
+class CompiledRuleset:
+    def __init__(self, ruleset, profile=None):
+        self.base_score = ruleset.get("base_score", 100)
+        profiles = ruleset.get("profiles", {})
+        if profile and profile not in profiles:
+            raise ValueError(f"Unknown scoring profile '{profile}'. Choose from: {', '.join(profiles)}")
+        overrides = profiles.get(profile, {}) if profile else {}
+
+        rules = {rule["id"]: dict(rule) for rule in ruleset["rules"]}
+        for rule in overrides.get("rules", []):
+            rules[rule["id"]] = dict(rule)
+        for rule_id, penalty in overrides.get("weights", {}).items():
+            rules[rule_id]["penalty"] = penalty
+        for rule_id in overrides.get("disabled", []):
+            rules.pop(rule_id, None)
+
+        self.profile = profile
+        self.rules = list(rules.values())
+        self._evaluators = []
+        for rule in self.rules:
+            if rule["type"] not in RULE_COMPILERS:
+                raise ValueError(f"Rule '{rule['id']}' has unknown type '{rule['type']}'")
+            self._evaluators.append(RULE_COMPILERS[rule["type"]](rule))
+
+    # 📌 Score many resumes at once: one penalty column per rule, vectorized over resumes
+    def evaluate_batch(self, features):
+        features = list(features)
+        penalties = np.zeros((len(features), len(self.rules)))
+        for column, evaluate in enumerate(self._evaluators):
+            if features:
+                penalties[:, column] = evaluate(features)
+        scores = np.clip(self.base_score - penalties.sum(axis=1), 0, 100)
+        return BatchScores(scores, penalties, self.rules)
+
+    # 📌 Score one resume with a per-rule breakdown
+    def evaluate(self, features):
+        batch = self.evaluate_batch([features])
+        breakdown = [
+            RuleOutcome(rule["id"], rule.get("label", rule["id"]), rule.get("category", "other"),
+                        bool(penalty == 0), _as_number(penalty))
+            for rule, penalty in zip(self.rules, batch.penalties[0])
+        ]
+        return _as_number(batch.scores[0]), breakdown
+
+
+def _as_number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 1)
+
+
+# 📌 Function to Load and compile a ruleset once per (path, modification time, profile)
+def get_ruleset(profile=None, path=ATS_RULES_PATH):
+    return _compiled_ruleset(path, os.path.getmtime(path), profile)
+
+
+@lru_cache(maxsize=16)
+def _compiled_ruleset(path, modified, profile):
+    return CompiledRuleset(load_ruleset(path), profile)
+
+
+# 📌 Function to List the role profiles of a ruleset as {name: label}
+def ruleset_profiles(path=ATS_RULES_PATH):
+    return {name: profile.get("label", name) for name, profile in load_ruleset(path).get("profiles", {}).items()}
+
+
+# 📌 Function to Turn a breakdown into the fields calculate_ats_score has always returned
+def summarize_breakdown(breakdown):
+    failed = [outcome for outcome in breakdown if not outcome.passed]
+    return {
+        "missing_sections": [outcome.rule_id for outcome in failed if outcome.category == "sections"],
+        "formatting_issues": [outcome.rule_id for outcome in failed if outcome.category == "formatting"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score cached resumes against an ATS ruleset.")
+    parser.add_argument("parse_cache", help="SQLite parse cache (PARSE_CACHE_PATH) holding parsed resumes")
+    parser.add_argument("-r", "--rules", default=ATS_RULES_PATH, help="Ruleset (.json, .yaml)")
+    parser.add_argument("-p", "--profile", help="Role profile from the ruleset")
+    parser.add_argument("-o", "--output", help="Write scores and the per-rule breakdown to this CSV file")
+    args = parser.parse_args(argv)
+
+    from analysis import analyze_resume
+    from parse_cache import ParseCache
+
+    started = time.perf_counter()
+    keys, features = [], []
+    for key, text in ParseCache(disk_path=args.parse_cache).iter_texts():
+        keys.append(key)
+        features.append(resume_features(analyze_resume(text)))
+    loaded = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ruleset = CompiledRuleset(load_ruleset(args.rules), args.profile)
+    batch = ruleset.evaluate_batch(features)
+    scored = time.perf_counter() - started
+    print(f"✅ Scored {len(features)} resumes in {scored * 1000:.0f} ms (features built in {loaded:.1f}s)")
+    if len(features):
+        print(f"   mean {batch.scores.mean():.1f} · median {np.median(batch.scores):.1f}")
+        for column, rule in enumerate(batch.rules):
+            failed = np.count_nonzero(batch.penalties[:, column])
+            print(f"   {rule['id']:<20} failed by {failed / len(features):6.1%}")
+
+    if args.output:
+        import pandas as pd
+        table = pd.DataFrame(batch.penalties, columns=[rule["id"] for rule in batch.rules])
+        table.insert(0, "score", batch.scores)
+        table.insert(0, "file_hash", keys)
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
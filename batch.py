@@ -0,0 +1,289 @@
+import argparse
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+# ✅ Load .env before the app modules read their settings from the environment
+load_dotenv()
+
+import parsing
+from analysis import analyze_resume, calculate_ats_score
+from ats_rules import get_ruleset, resume_features
+from dedup import DuplicateIndex, minhash_signature
+from entities import extract_entities
+from metrics import capture_metrics, replay
+from matching import ResumeIndex
+from nlp_pipeline import warm_up as warm_up_nlp
+from parsing import parse_resume
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+RESUME_EXTENSIONS = (".pdf", ".docx")
+# Upload limits, shared by the HTTP API and the Streamlit bulk upload
+API_MAX_UPLOAD_BYTES = int(os.getenv("API_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+API_MAX_BATCH_FILES = int(os.getenv("API_MAX_BATCH_FILES", "200"))
+# Uncompressed size of all the resumes in one batch (ZIP entries included)
+API_MAX_BATCH_BYTES = int(os.getenv("API_MAX_BATCH_BYTES", str(100 * 1024 * 1024)))
+
+RESULT_COLUMNS = [
+    "file", "content_hash", "score", "skill_count", "skills", "years_experience", "latest_title",
+    "latest_employer", "highest_degree", "email", "phone", "missing_sections", "formatting_issues",
+    "characters", "duplicate_of", "seconds", "error"
+]
+
+
+class ArchiveTooLarge(ValueError):
+    pass
+
+
+# 📌 Function to List resumes (name, bytes) from a directory, a ZIP file or a ZIP upload
+# For untrusted ZIPs, the limits are checked against the entry headers before anything is decompressed
+# (zipfile never inflates an entry past its declared size, so a lying header cannot get around them)
+def iter_resume_sources(source, max_files=None, max_file_bytes=None, max_total_bytes=None):
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for filename in sorted(files):
+                if filename.lower().endswith(RESUME_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    with open(path, "rb") as handle:
+                        yield os.path.relpath(path, source), handle.read()
+        return
+
+    with zipfile.ZipFile(source) as archive:
+        entries = []
+        for info in archive.infolist():
+            filename = os.path.basename(info.filename)
+            # Skip folders and macOS resource forks
+            if info.is_dir() or filename.startswith("._") or not filename.lower().endswith(RESUME_EXTENSIONS):
+                continue
+            if max_file_bytes is not None and info.file_size > max_file_bytes:
+                raise ArchiveTooLarge(f"{info.filename} is larger than {max_file_bytes} bytes")
+            entries.append(info)
+        if max_files is not None and len(entries) > max_files:
+            raise ArchiveTooLarge(f"The archive holds more than {max_files} resumes")
+        if max_total_bytes is not None and sum(info.file_size for info in entries) > max_total_bytes:
+            raise ArchiveTooLarge(f"The archive expands to more than {max_total_bytes} bytes")
+        for info in entries:
+            yield info.filename, archive.read(info)
+
+
+# 📌 Function to List resumes from Streamlit uploads (ZIP archives and/or single files)
+# The uploads share the API's batch limits; each ZIP gets whatever is left of them
+def iter_uploaded_sources(uploaded_files):
+    files = total_bytes = 0
+    for uploaded in uploaded_files:
+        if uploaded.name.lower().endswith(".zip"):
+            entries = iter_resume_sources(
+                io.BytesIO(uploaded.getvalue()), max_files=API_MAX_BATCH_FILES - files,
+                max_file_bytes=API_MAX_UPLOAD_BYTES, max_total_bytes=API_MAX_BATCH_BYTES - total_bytes,
+            )
+        elif uploaded.name.lower().endswith(RESUME_EXTENSIONS):
+            entries = [(uploaded.name, uploaded.getvalue())]
+        else:
+            continue
+        for name, data in entries:
+            files += 1
+            total_bytes += len(data)
+            if len(data) > API_MAX_UPLOAD_BYTES:
+                raise ArchiveTooLarge(f"{name} is larger than {API_MAX_UPLOAD_BYTES} bytes")
+            if files > API_MAX_BATCH_FILES:
+                raise ArchiveTooLarge(f"A batch holds at most {API_MAX_BATCH_FILES} resumes")
+            if total_bytes > API_MAX_BATCH_BYTES:
+                raise ArchiveTooLarge(f"A batch holds at most {API_MAX_BATCH_BYTES} bytes of resumes")
+            yield name, data
+
+
+def _init_worker():
+    # Batch workers already run in parallel; don't let each one start its own PDF pool
+    parsing.PDF_WORKERS = 1
+    # Load the tokenizer while the first file is being sent over
+    warm_up_nlp(("tokenizer",))
+
+
+# 📌 Function to Parse, extract skills and score one resume (runs in a worker process)
+# Stage timings and cache lookups ride back with the row, since nobody scrapes a worker's metrics
+def screen_resume(name, data, profile=None):
+    with capture_metrics() as records:
+        row = _screen_resume(name, data, profile)
+    row["metrics"] = records
+    return row
+
+
+def _screen_resume(name, data, profile=None):
+    started = time.perf_counter()
+    row = dict.fromkeys(RESULT_COLUMNS)
+    row["file"] = name
+    try:
+        uploaded = io.BytesIO(data)
+        uploaded.name = name
+        resume_text, _ = parse_resume(uploaded)
+        if not resume_text:
+            row["error"] = "Unsupported or empty file"
+        elif resume_text.startswith(("Error reading PDF", "Error reading DOCX")):
+            row["error"] = resume_text
+        else:
+            analysis = analyze_resume(resume_text)
+            ats_result = calculate_ats_score(analysis, profile)
+            entities = extract_entities(analysis)
+            latest_position = entities.latest_position
+            # The text and MinHash signature ride along (outside RESULT_COLUMNS) so the caller can
+            # index the text for job matching and flag near-duplicates
+            row["text"] = resume_text
+            row["signature"] = minhash_signature(resume_text)
+            # ...and the rule features, so results can be re-scored with another ruleset without re-parsing
+            row["features"] = resume_features(analysis)
+            row.update({
+                "content_hash": analysis.content_hash,
+                "score": ats_result["score"],
+                "skill_count": len(ats_result["skills_found"]),
+                "skills": ", ".join(ats_result["skills_found"]),
+                "years_experience": entities.years_of_experience,
+                "latest_title": latest_position.title if latest_position else None,
+                "latest_employer": latest_position.employer if latest_position else None,
+                "highest_degree": entities.highest_degree,
+                "email": entities.emails[0] if entities.emails else None,
+                "phone": entities.phones[0] if entities.phones else None,
+                "missing_sections": ", ".join(ats_result["missing_sections"]),
+                "formatting_issues": ", ".join(ats_result["formatting_issues"]),
+                "characters": len(resume_text),
+            })
+    except Exception as e:
+        row["error"] = str(e)
+    row["seconds"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+# 📌 Function to Record a screened row's stage timings and cache lookups in this process's metrics
+def record_worker_metrics(row):
+    replay(row.pop("metrics", None) or ())
+    return row
+
+
+# 📌 Function to Start a pool of worker processes for screen_resume
+def create_worker_pool(workers=BATCH_WORKERS):
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context, initializer=_init_worker)
+
+
+# 📌 Function to Screen resumes in a process pool, yielding result rows as they finish
+def screen_resumes(sources, workers=BATCH_WORKERS, profile=None):
+    workers = max(1, workers)
+    # Keep a bounded number of files in flight so large folders don't sit in memory at once
+    max_in_flight = workers * 4
+    with create_worker_pool(workers) as pool:
+        pending = set()
+        for name, data in sources:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield record_worker_metrics(future.result())
+            pending.add(pool.submit(screen_resume, name, data, profile))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield record_worker_metrics(future.result())
+
+
+# 📌 Function to Flag a row that nearly duplicates an earlier one in the same run
+def mark_duplicate(row, duplicates):
+    signature = row.pop("signature", None)
+    if signature is None:
+        return row
+    match = duplicates.find(signature)
+    if match:
+        row["duplicate_of"] = f"{match.label} ({match.similarity:.0%})"
+    else:
+        duplicates.add(row["content_hash"], signature, label=row["file"])
+    return row
+
+
+# 📌 Function to Build the ranked results table
+def results_to_dataframe(rows):
+    # pandas is imported here so worker processes, which only run screen_resume, never load it
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return df.sort_values(["score", "skill_count"], ascending=False, na_position="last").reset_index(drop=True)
+
+
+# 📌 Function to Re-score results with another ruleset/profile from their saved rule features
+def rescore_results(df, features_by_hash, profile=None):
+    keys = [key for key in df["content_hash"] if key in features_by_hash]
+    if not keys:
+        return df
+    ruleset = get_ruleset(profile)
+    batch = ruleset.evaluate_batch(features_by_hash[key] for key in keys)
+    rescored = {}
+    for key, score, penalties in zip(keys, batch.scores, batch.penalties):
+        failed = [(rule, penalty) for rule, penalty in zip(batch.rules, penalties) if penalty]
+        rescored[key] = (
+            int(score) if float(score).is_integer() else round(float(score), 1),
+            ", ".join(rule["id"] for rule, _ in failed if rule.get("category") == "sections"),
+            ", ".join(rule["id"] for rule, _ in failed if rule.get("category") == "formatting"),
+        )
+    df = df.copy()
+    for column, position in (("score", 0), ("missing_sections", 1), ("formatting_issues", 2)):
+        df[column] = [rescored[key][position] if key in rescored else value for key, value in zip(df["content_hash"], df[column])]
+    return df.sort_values(["score", "skill_count"], ascending=False, na_position="last").reset_index(drop=True)
+
+
+# 📌 Function to Score results against a job description and rank by job match
+def add_job_match(df, index, job_description):
+    matches = {match.resume_id: match for match in index.rank(job_description, ids=df["content_hash"].dropna().tolist())}
+    df = df.copy()
+    df["job_match"] = [matches[key].score if key in matches else None for key in df["content_hash"]]
+    df["skill_overlap"] = [matches[key].skill_overlap if key in matches else None for key in df["content_hash"]]
+    df["missing_skills"] = [", ".join(matches[key].missing_skills) if key in matches else None for key in df["content_hash"]]
+    return df.sort_values("job_match", ascending=False, na_position="last").reset_index(drop=True)
+
+
+# 📌 Function to Export results as CSV or Parquet (chosen by file extension)
+def export_results(df, path):
+    if path.lower().endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a folder or ZIP of resumes and export ATS results.")
+    parser.add_argument("source", help="Directory or .zip file containing PDF/DOCX resumes")
+    parser.add_argument("-o", "--output", default="screening_results.csv", help="Output .csv or .parquet file")
+    parser.add_argument("-w", "--workers", type=int, default=BATCH_WORKERS, help="Number of worker processes")
+    parser.add_argument("-j", "--job-description", help="Text file with a job description to rank candidates against")
+    parser.add_argument("-p", "--profile", help="ATS scoring profile from the ruleset (see ats_rules.json)")
+    parser.add_argument("--drop-duplicates", action="store_true", help="Leave near-duplicate resumes out of the results")
+    args = parser.parse_args(argv)
+
+    rows = []
+    index = ResumeIndex()
+    duplicates = DuplicateIndex()
+    started = time.perf_counter()
+    for row in screen_resumes(iter_resume_sources(args.source), args.workers, args.profile):
+        row.pop("features", None)
+        rows.append(mark_duplicate(row, duplicates))
+        if row.get("text"):
+            index.add(row["content_hash"], row.pop("text"), row["skills"].split(", ") if row["skills"] else [])
+        elapsed = time.perf_counter() - started
+        status = f"error: {row['error']}" if row["error"] else f"score {row['score']}"
+        print(f"[{len(rows)}] {row['file']} - {status} ({len(rows) / elapsed:.1f} docs/s)")
+
+    elapsed = time.perf_counter() - started
+    results = results_to_dataframe(rows)
+    if args.drop_duplicates:
+        results = results[results["duplicate_of"].isna()].reset_index(drop=True)
+    if args.job_description:
+        with open(args.job_description, encoding="utf-8") as handle:
+            results = add_job_match(results, index, handle.read())
+    export_results(results, args.output)
+    rate = len(rows) / elapsed if elapsed else 0.0
+    print(f"✅ Screened {len(rows)} resumes in {elapsed:.1f}s ({rate:.1f} docs/s) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from resume_corpus import generate_corpus
+
+# ✅ Benchmarks for the pipeline stages on a synthetic corpus (resume_corpus.py), compared with a stored baseline.
+# The AI stage talks to an in-process fake Gemini (fake_gemini.py), so it runs offline and measures the
+# app's own overhead (prompting, concurrency, caching, parsing the response) rather than the model.
+BENCHMARK_BASELINE_PATH = os.getenv(
+    "BENCHMARK_BASELINE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+)
+STAGES = [
+    "parse_pdf", "parse_docx", "extract_skills", "calculate_ats_score", "text_to_docx",
+    "ai_resume_improvement_gemini", "end_to_end",
+]
+# Calls per stage traced for peak memory; tracemalloc slows everything down, so this is a separate pass
+MEMORY_SAMPLE = 5
+
+
+def _percentile(sorted_values, fraction):
+    # Nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _uploaded(name, data):
+    uploaded = io.BytesIO(data)
+    uploaded.name = name
+    return uploaded
+
+
+# 📌 Function to Time one stage: a warm-up call, then every input `repeat` times, then a traced pass for memory
+# setup runs before each call, outside the timing (e.g. to empty a cache)
+def time_stage(function, inputs, repeat=3, setup=None):
+    def call(item):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        function(item)
+        return time.perf_counter() - started
+
+    # The first call pays for imports, model loading and template bases; it is reported on its own
+    first_call = call(inputs[0])
+    latencies = sorted(call(item) for _ in range(repeat) for item in inputs)
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for item in inputs[:MEMORY_SAMPLE]:
+            if setup:
+                setup()
+            tracemalloc.reset_peak()
+            function(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "calls": len(latencies),
+        "first_call_ms": round(first_call * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "throughput_per_s": round(len(latencies) / sum(latencies), 2),
+        "peak_memory_mb": round(peak / 1024 ** 2, 2),
+    }
+
+
+def _start_llm_backend(latency):
+    from fake_gemini import start_fake_gemini
+    from gemini_client import configure_gemini
+
+    server = start_fake_gemini(port=0, latency=latency, chunk_delay=0.0)
+    configure_gemini("benchmark", f"http://127.0.0.1:{server.server_address[1]}")
+    return server
+
+
+# 📌 Function to Run the benchmarks; returns the report (JSON-serializable)
+def run_benchmarks(count=40, seed=0, repeat=3, stages=STAGES, llm_latency=0.0):
+    import core
+    from analysis import analyze_resume, clear_analysis_cache
+
+    corpus = list(generate_corpus(count, seed))
+    files = {
+        extension: [(name, data) for name, data, _ in corpus if name.endswith("." + extension)]
+        for extension in ("pdf", "docx")
+    }
+    texts = [core.parse_resume(_uploaded(name, data))[0] for name, data, _ in corpus]
+    templates = core.DOCX_TEMPLATES
+
+    def fresh_llm_cache():
+        # A new in-memory response cache, so every call reaches the (fake) model
+        core.get_llm_cache.cache_clear()
+
+    def fresh_caches():
+        clear_analysis_cache()
+        fresh_llm_cache()
+
+    def end_to_end(item):
+        name, data = item
+        resume_text, _ = core.parse_resume(_uploaded(name, data))
+        core.calculate_ats_score(resume_text)
+        improved = None
+        if "ai_resume_improvement_gemini" in stages:
+            improved = core.extract_improved_resume(core.ai_resume_improvement_gemini(resume_text))
+        core.text_to_docx(improved or resume_text, templates[0])
+
+    plan = {
+        "parse_pdf": (lambda item: core.parse_resume(_uploaded(*item)), files["pdf"], None),
+        "parse_docx": (lambda item: core.parse_resume(_uploaded(*item)), files["docx"], None),
+        "extract_skills": (core.extract_skills, texts, clear_analysis_cache),
+        # Scores precomputed analyses, so only the rule evaluation is timed
+        "calculate_ats_score": (core.calculate_ats_score, [analyze_resume(text) for text in texts], None),
+        "text_to_docx": (
+            lambda item: core.text_to_docx(*item),
+            [(text, templates[index % len(templates)]) for index, text in enumerate(texts)], None,
+        ),
+        "ai_resume_improvement_gemini": (core.ai_resume_improvement_gemini, texts, fresh_llm_cache),
+        "end_to_end": (end_to_end, [(name, data) for name, data, _ in corpus], fresh_caches),
+    }
+
+    server = None
+    if "ai_resume_improvement_gemini" in stages:
+        os.environ["LLM_CACHE_PATH"] = ""
+        server = _start_llm_backend(llm_latency)
+    try:
+        results = {}
+        for stage in stages:
+            function, inputs, setup = plan[stage]
+            if inputs:
+                results[stage] = time_stage(function, inputs, repeat, setup)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    return {
+        "python": platform.python_version(),
+        "corpus": {"count": count, "seed": seed, "characters": sum(len(text) for text in texts)},
+        "repeat": repeat,
+        "llm_latency_s": llm_latency,
+        "stages": results,
+    }
+
+
+# 📌 Function to Compare a report with the baseline; returns a list of regressions
+def compare(current, baseline, tolerance=0.5, slack_ms=2.0):
+    problems = []
+    for stage, result in current["stages"].items():
+        expected = baseline.get("stages", {}).get(stage)
+        if expected is None:
+            continue
+        # Timings vary between runs and machines, so only a clear slowdown counts
+        for metric in ("p50_ms", "p90_ms"):
+            limit = expected[metric] * (1 + tolerance) + slack_ms
+            if result[metric] > limit:
+                problems.append(f"{stage}: {metric} {result[metric]:.1f} ms, baseline {expected[metric]:.1f} ms")
+        if result["peak_memory_mb"] > expected["peak_memory_mb"] * (1 + tolerance) + 1:
+            problems.append(
+                f"{stage}: peak memory {result['peak_memory_mb']:.1f} MB, baseline {expected['peak_memory_mb']:.1f} MB"
+            )
+    return problems
+
+
+def _print_report(current, baseline):
+    print(f"{current['corpus']['count']} resumes, {current['corpus']['characters']:,} characters, repeat {current['repeat']}")
+    print(f"{'stage':<30} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'per s':>9} {'peak MB':>8}")
+    for stage, result in current["stages"].items():
+        expected = baseline.get("stages", {}).get(stage) if baseline else None
+        against = f"   (baseline p50 {expected['p50_ms']:.1f})" if expected else ""
+        print(
+            f"{stage:<30} {result['p50_ms']:9.1f} {result['p90_ms']:9.1f} {result['p99_ms']:9.1f} "
+            f"{result['throughput_per_s']:9.1f} {result['peak_memory_mb']:8.1f}{against}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on a synthetic resume corpus.")
+    parser.add_argument("stages", nargs="*", default=STAGES, help=f"Stages to run (default: all): {', '.join(STAGES)}")
+    parser.add_argument("-n", "--count", type=int, default=40, help="Resumes in the corpus (half PDF, half DOCX)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed passes over the corpus per stage")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the fake Gemini waits per request")
+    parser.add_argument("-o", "--output", help="Also write the results to this JSON file")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--write", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with an error on a regression against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown as a fraction of the baseline")
+    args = parser.parse_args(argv)
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    # The fake backend answers instantly, so the client-side rate limit would be all that gets measured
+    os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "1000000")
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    stages = [stage for stage in STAGES if stage in args.stages]
+    current = run_benchmarks(args.count, args.seed, args.repeat, stages, args.llm_latency)
+    _print_report(current, baseline)
+
+    for path in filter(None, [args.output, args.baseline if args.write else None]):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+        print(f"✅ Results written to {path}")
+    if args.check:
+        problems = compare(current, baseline or {}, args.tolerance)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
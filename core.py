@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from functools import lru_cache
+
+from ai_analysis import run_analysis, stream_analysis
+from analysis import analyze_resume, calculate_ats_score
+from docx_templates import render_docx, template_names
+from gemini_client import GeminiError, get_gemini_client
+from llm_cache import DEFAULT_MAX_ENTRIES as DEFAULT_LLM_CACHE_ENTRIES, DEFAULT_TTL_SECONDS, LLMResponseCache
+from metrics import trace, trace_stream
+from parsing import parse_resume
+from prompting import estimate_tokens
+from store import LIBRARY_RETENTION_DAYS, BlobStore, open_store
+
+# ✅ The analysis pipeline without any UI: parsing, skills, ATS scoring, AI suggestions and DOCX export.
+# Importing it starts no UI, model or API client, so the Streamlit app, the HTTP API (api.py) and scripts share it.
+
+# 📌 Function to Extract Skills using the compiled skill matcher
+def extract_skills(text):
+    return analyze_resume(text).skills
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
+
+# ✅ LLM response cache shared by every caller in the process
+@lru_cache(maxsize=None)
+def get_llm_cache():
+    return LLMResponseCache(
+        disk_path=os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3"),
+        ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        max_entries=int(os.getenv("LLM_CACHE_ENTRIES", DEFAULT_LLM_CACHE_ENTRIES))
+    )
+
+# ✅ Persistent analysis store (SQLite + FTS5 by default) and content-addressed file store
+@lru_cache(maxsize=None)
+def get_analysis_store():
+    return open_store()
+
+@lru_cache(maxsize=None)
+def get_blob_store():
+    return BlobStore()
+
+# ✅ Retention: expired resumes and their files are purged at most once per interval, as new ones are saved
+PURGE_INTERVAL_SECONDS = 3600
+_purge_lock = threading.Lock()
+_last_purge = 0.0
+
+# 📌 Function to Delete resumes older than LIBRARY_RETENTION_DAYS and the files only they referred to
+def purge_expired_resumes(force=False):
+    global _last_purge
+    if not LIBRARY_RETENTION_DAYS:
+        return 0
+    with _purge_lock:
+        if not force and time.time() - _last_purge < PURGE_INTERVAL_SECONDS:
+            return 0
+        _last_purge = time.time()
+    blob_keys = get_analysis_store().purge(time.time() - LIBRARY_RETENTION_DAYS * 86400)
+    for key in blob_keys:
+        get_blob_store().delete(key)
+    return len(blob_keys)
+
+# 📌 Function to Persist a parsed resume with its skills and ATS result (owner: who may see it in the library)
+def save_to_store(analysis, filename, file_extension, blob_key=None, ats_result=None, owner=None):
+    purge_expired_resumes()
+    ats_result = ats_result or calculate_ats_score(analysis)
+    get_analysis_store().save_resume(
+        analysis.content_hash, analysis.text, filename, file_extension, blob_key,
+        score=ats_result["score"],
+        skills=analysis.skills,
+        ats={
+            "missing_sections": ats_result["missing_sections"],
+            "formatting_issues": ats_result["formatting_issues"],
+            "breakdown": [outcome._asdict() for outcome in ats_result.get("breakdown", [])],
+        },
+        owner=owner,
+    )
+
+# 📌 Function to Persist a batch-screening row (see batch.screen_resume) with its parsed text
+def save_screening_row(row, resume_text, blob_key=None, owner=None):
+    purge_expired_resumes()
+    get_analysis_store().save_resume(
+        row["content_hash"], resume_text, row["file"], os.path.splitext(row["file"])[1].lstrip(".").lower(),
+        blob_key,
+        score=row["score"],
+        skills=row["skills"].split(", ") if row["skills"] else [],
+        ats={"missing_sections": row["missing_sections"], "formatting_issues": row["formatting_issues"]},
+        owner=owner,
+    )
+
+# 📌 Function to turn a Gemini failure into the message shown to the user
+def gemini_error_message(error):
+    if isinstance(error, GeminiError) and error.status_code == 429:
+        return "Error calling Gemini API: the request quota is exhausted right now. Please try again in a minute."
+    return f"Error calling Gemini API: {str(error)}"
+
+# 📌 Function to Get AI-Powered Resume Suggestions from Gemini API
+# The analysis runs as concurrent, separately cached parts (see prompting.ANALYSIS_PLAN).
+# With stream=True a generator of text chunks is returned instead of the full text;
+# API failures then raise while iterating (see gemini_error_message).
+def ai_resume_improvement_gemini(resume_text, job_description=None, stream=False):
+    sizes = {"characters": len(resume_text), "tokens": estimate_tokens(resume_text)}
+    if stream:
+        chunks = stream_analysis(get_gemini_client(GEMINI_MODEL), get_llm_cache(), GEMINI_MODEL, resume_text, job_description)
+        return trace_stream("ai_resume_improvement_gemini", chunks, sizes)
+
+    with trace("ai_resume_improvement_gemini") as span:
+        span.sizes.update(sizes)
+        try:
+            client = get_gemini_client(GEMINI_MODEL)
+            response_text = run_analysis(client, get_llm_cache(), GEMINI_MODEL, resume_text, job_description)
+            
+            if response_text:
+                return response_text
+            else:
+                span.fail()
+                return "No suggestions available."
+        
+        except Exception as e:
+            span.fail()
+            return gemini_error_message(e)
+
+# 📌 Function to extract the improved resume section from AI suggestions
+IMPROVED_RESUME_MARKER = "## Improved Resume"
+
+def extract_improved_resume(ai_suggestions):
+    if IMPROVED_RESUME_MARKER in ai_suggestions:
+        parts = ai_suggestions.split(IMPROVED_RESUME_MARKER)
+        if len(parts) > 1:
+            return parts[1].strip()
+    return None
+
+# 📌 Function to route streamed AI output to ("assessment", text) / ("improved", text) as chunks arrive
+def split_improved_resume_stream(chunks):
+    buffer = ""
+    in_resume = False
+    for chunk in chunks:
+        if in_resume:
+            yield "improved", chunk
+            continue
+
+        buffer += chunk
+        index = buffer.find(IMPROVED_RESUME_MARKER)
+        if index >= 0:
+            if index:
+                yield "assessment", buffer[:index]
+            in_resume = True
+            rest = buffer[index + len(IMPROVED_RESUME_MARKER):]
+            if rest:
+                yield "improved", rest
+            buffer = ""
+        else:
+            # Hold back a tail that could be the start of a marker split across chunks
+            safe_length = len(buffer) - (len(IMPROVED_RESUME_MARKER) - 1)
+            if safe_length > 0:
+                yield "assessment", buffer[:safe_length]
+                buffer = buffer[safe_length:]
+
+    if buffer:
+        yield "assessment", buffer
+
+# 📌 Function to convert text to DOCX with template styling (templates are defined in docx_templates.json)
+DOCX_TEMPLATES = template_names()
+
+def text_to_docx(text, template_name="Classic"):
+    with trace("text_to_docx") as span:
+        span.size("characters", len(text))
+        return render_docx(text, template_name)
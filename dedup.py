@@ -0,0 +1,155 @@
+import difflib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+# ✅ Near-duplicate settings (overridable from the environment)
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.85"))
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Universal hashing h(x) = (a*x + b) mod p with p = 2^31 - 1 keeps a*x inside uint64
+_PRIME = (1 << 31) - 1
+_random = np.random.default_rng(20240601)
+_A = _random.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _random.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+DuplicateMatch = namedtuple("DuplicateMatch", ["resume_id", "label", "similarity"])
+
+
+# 📌 Function to Hash the word shingles of a text (stable across processes and restarts)
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    words = WORD_PATTERN.findall((text or "").lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+# 📌 Function to Compute the MinHash signature of a text
+def minhash_signature(text):
+    hashes = np.fromiter(shingle_hashes(text), dtype=np.uint64) % np.uint64(_PRIME)
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+def estimate_similarity(signature, other):
+    return float(np.mean(signature == other))
+
+
+def _lsh_parameters(num_permutations, threshold):
+    # Pick bands x rows so the LSH S-curve rises just below the threshold: pairs above it are
+    # almost always candidates, and candidates are verified against the full signature anyway
+    best = (num_permutations, 1)
+    for rows in range(1, num_permutations + 1):
+        if num_permutations % rows:
+            continue
+        bands = num_permutations // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold - 0.1:
+            best = (bands, rows)
+    return best
+
+
+# ✅ LSH index of MinHash signatures with optional SQLite persistence
+# The resume text can be kept too (zlib-compressed) so a later near-duplicate can be diffed against it.
+class DuplicateIndex:
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, disk_path=None):
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_parameters(NUM_PERMUTATIONS, threshold)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+        self._labels = {}
+        self._texts = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_signatures ("
+                "resume_id TEXT PRIMARY KEY, label TEXT, signature BLOB, text BLOB, created_at REAL)"
+            )
+            self._db.commit()
+            for resume_id, label, signature in self._db.execute(
+                "SELECT resume_id, label, signature FROM resume_signatures ORDER BY created_at"
+            ):
+                self._insert(resume_id, label, np.frombuffer(signature, dtype=np.uint64), None)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._signatures
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _insert(self, resume_id, label, signature, compressed_text):
+        if resume_id in self._signatures:
+            return
+        self._signatures[resume_id] = signature
+        self._labels[resume_id] = label
+        if compressed_text is not None and self._db is None:
+            # With a database the text is read back on demand instead of held in memory
+            self._texts[resume_id] = compressed_text
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(resume_id)
+
+    def add(self, resume_id, signature, label=None, text=None):
+        compressed_text = zlib.compress(text.encode("utf-8")) if text is not None else None
+        with self._lock:
+            if resume_id in self._signatures:
+                return
+            self._insert(resume_id, label or resume_id, signature, compressed_text)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO resume_signatures VALUES (?, ?, ?, ?, ?)",
+                    (resume_id, label or resume_id, signature.tobytes(), compressed_text, time.time()),
+                )
+                self._db.commit()
+
+    # 📌 Text stored with a resume (None if it was added without one)
+    def text(self, resume_id):
+        with self._lock:
+            compressed_text = self._texts.get(resume_id)
+            if compressed_text is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT text FROM resume_signatures WHERE resume_id = ?", (resume_id,)
+                ).fetchone()
+                compressed_text = row[0] if row else None
+        return zlib.decompress(compressed_text).decode("utf-8") if compressed_text is not None else None
+
+    # 📌 Most similar indexed resume at or above the threshold (None if there is none)
+    def find(self, signature, exclude=None):
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(exclude)
+
+            best = None
+            for resume_id in candidates:
+                similarity = estimate_similarity(signature, self._signatures[resume_id])
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(resume_id, self._labels[resume_id], round(similarity, 3))
+            return best
+
+
+# 📌 Function to List the lines added and removed between two versions of a resume
+def changed_lines(earlier_text, text):
+    earlier = [line.strip() for line in earlier_text.splitlines() if line.strip()]
+    current = [line.strip() for line in text.splitlines() if line.strip()]
+    added, removed = [], []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, earlier, current, autojunk=False).get_opcodes():
+        if tag != "equal":
+            removed.extend(earlier[i1:i2])
+            added.extend(current[j1:j2])
+    return added, removed
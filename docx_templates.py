@@ -0,0 +1,185 @@
+import io
+import json
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# ✅ Template definitions (JSON); a template may start from its own styled .docx via "base"
+DOCX_TEMPLATES_PATH = os.getenv(
+    "DOCX_TEMPLATES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "docx_templates.json")
+)
+DOCX_RENDER_WORKERS = int(os.getenv("DOCX_RENDER_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+# One compiled pattern classifies every block and line: "# Heading", "- bullet" / "* " / "• ", "1. item"
+LINE_PATTERN = re.compile(r"(?P<heading>#+)|(?P<bullet>[-*•] )|(?P<number>\d+\.\s)")
+
+def _pt(value):
+    from docx.shared import Pt
+    return Pt(value)
+
+
+def _rgb(value):
+    from docx.shared import RGBColor
+    return RGBColor.from_string(value)
+
+
+# Style settings a template can use, applied once when its base document is prepared
+STYLE_SETTERS = {
+    "font": lambda style, value: setattr(style.font, "name", value),
+    "size": lambda style, value: setattr(style.font, "size", _pt(value)),
+    "bold": lambda style, value: setattr(style.font, "bold", value),
+    "italic": lambda style, value: setattr(style.font, "italic", value),
+    "color": lambda style, value: setattr(style.font.color, "rgb", _rgb(value)),
+    "space_before": lambda style, value: setattr(style.paragraph_format, "space_before", _pt(value)),
+    "space_after": lambda style, value: setattr(style.paragraph_format, "space_after", _pt(value)),
+    "line_spacing": lambda style, value: setattr(style.paragraph_format, "line_spacing", value),
+}
+
+
+@lru_cache(maxsize=4)
+def _load_templates(path, modified):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)["templates"]
+
+
+def load_templates(path=DOCX_TEMPLATES_PATH):
+    return _load_templates(path, os.path.getmtime(path))
+
+
+# 📌 Function to List the template names, in file order
+def template_names(path=DOCX_TEMPLATES_PATH):
+    return list(load_templates(path))
+
+
+# 📌 Function to Describe a template for the template picker
+def template_description(name, path=DOCX_TEMPLATES_PATH):
+    return load_templates(path).get(name, {}).get("description", "")
+
+
+# 📌 Function to Build a template's styled base document once and keep it as bytes to clone from
+def template_base(name, path=DOCX_TEMPLATES_PATH):
+    templates = load_templates(path)
+    if name not in templates:
+        raise ValueError(f"Unknown template '{name}'. Choose from: {', '.join(templates)}")
+    return _template_base(path, os.path.getmtime(path), name)
+
+
+@lru_cache(maxsize=32)
+def _template_base(path, modified, name):
+    from docx import Document
+
+    template = load_templates(path)[name]
+    base = template.get("base")
+    doc = Document(os.path.join(os.path.dirname(path), base) if base else None)
+    for style_name, settings in template.get("styles", {}).items():
+        style = doc.styles[style_name]
+        for setting, value in settings.items():
+            STYLE_SETTERS[setting](style, value)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# 📌 Function to Render text (markdown-style headings, bullets, numbered items) into a template
+def render_docx(text, template_name="Classic", path=DOCX_TEMPLATES_PATH):
+    from docx import Document
+
+    doc = Document(io.BytesIO(template_base(template_name, path)))
+    # Look styles up once per document instead of by name for every paragraph
+    bullet_style = doc.styles["List Bullet"]
+    number_style = doc.styles["List Number"]
+
+    for para in text.split("\n\n"):
+        block = para.strip()
+        if not block:
+            continue
+        match = LINE_PATTERN.match(block)
+        if match and match.lastgroup == "heading":
+            level = len(match.group("heading"))
+            doc.add_heading(block.lstrip("#").strip(), level=level if level <= 9 else 1)
+            continue
+        for line in para.split("\n"):
+            line = line.strip()
+            match = LINE_PATTERN.match(line)
+            if match and match.lastgroup == "bullet":
+                doc.add_paragraph(line[2:], style=bullet_style)
+            elif match and match.lastgroup == "number":
+                doc.add_paragraph(line[match.end():].lstrip(), style=number_style)
+            else:
+                doc.add_paragraph(line)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+_render_pool = None
+
+
+def _get_render_pool():
+    global _render_pool
+    if _render_pool is None:
+        # python-docx is pure Python, so batches render in processes; each keeps its own template bases
+        context = multiprocessing.get_context("spawn")
+        _render_pool = ProcessPoolExecutor(max_workers=DOCX_RENDER_WORKERS, mp_context=context)
+    return _render_pool
+
+
+def _render_bytes(text, template_name, path):
+    return render_docx(text, template_name, path).getvalue()
+
+
+# 📌 Function to Render many documents concurrently
+# jobs are (text, template) pairs; the rendered .docx files come back as bytes, in order
+def render_docx_batch(jobs, path=DOCX_TEMPLATES_PATH):
+    jobs = list(jobs)
+    # Check every template up front so a bad name fails before any rendering starts
+    for _, template_name in jobs:
+        template_base(template_name, path)
+    if DOCX_RENDER_WORKERS <= 1 or len(jobs) <= 1:
+        return [_render_bytes(text, template_name, path) for text, template_name in jobs]
+    pool = _get_render_pool()
+    futures = [pool.submit(_render_bytes, text, template_name, path) for text, template_name in jobs]
+    return [future.result() for future in futures]
+
+
+# 📌 Function to Name a shortlisted resume in an export ZIP; the start of its resume_id keeps
+# two uploads with the same filename apart
+def shortlist_entry_name(filename, resume_id, improved, template_name):
+    name = os.path.splitext(os.path.basename(filename or resume_id))[0]
+    suffix = "improved" if improved else "original"
+    return f"{name}_{resume_id[:8]}_{suffix}_{template_name.lower()}.docx"
+
+
+def _unique_name(filename, used):
+    name, extension = os.path.splitext(filename)
+    candidate, number = filename, 1
+    while candidate in used:
+        number += 1
+        candidate = f"{name}_{number}{extension}"
+    used.add(candidate)
+    return candidate
+
+
+# 📌 Function to Render many (filename, text, template) documents into one ZIP
+# Repeated filenames get a number appended, so no document overwrites another in the archive
+def export_docx_zip(documents, path=DOCX_TEMPLATES_PATH):
+    documents = list(documents)
+    rendered = render_docx_batch([(text, template_name) for _, text, template_name in documents], path)
+    buffer = io.BytesIO()
+    used = set()
+    # .docx files are already compressed, so they are stored as-is
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for (filename, _, _), data in zip(documents, rendered):
+            archive.writestr(_unique_name(filename, used), data)
+    buffer.seek(0)
+    return buffer
+
+
+# 📌 Function to Render one resume in every template into a ZIP
+def export_all_templates(text, basename="resume", path=DOCX_TEMPLATES_PATH):
+    return export_docx_zip([(f"{basename}_{name.lower()}.docx", text, name) for name in template_names(path)], path)
@@ -0,0 +1,196 @@
+import argparse
+import io
+import os
+import posixpath
+import re
+import time
+import zipfile
+from xml.etree import ElementTree
+
+# ✅ Streaming DOCX text extraction: word/document.xml and the header/footer parts are read
+# straight from the ZIP with iterparse, so body paragraphs, table cells, text boxes, headers
+# and footers all come out in reading order without building python-docx's object model
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+_RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+P, T, TAB, PTAB, BR, CR, HYPHEN = (
+    _W + "p", _W + "t", _W + "tab", _W + "ptab", _W + "br", _W + "cr", _W + "noBreakHyphen"
+)
+BODY, TBL, TR, TC, TEXT_BOX = _W + "body", _W + "tbl", _W + "tr", _W + "tc", _W + "txbxContent"
+# Text boxes are stored twice: as a drawing (mc:Choice) and as a VML copy (mc:Fallback)
+FALLBACK = _MC + "Fallback"
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+PART_NUMBER_PATTERN = re.compile(r"(\d+)")
+CELL_SEPARATOR = " | "
+
+
+def _break_text(element):
+    # Line breaks become newlines; page and column breaks add nothing (as in python-docx)
+    return "\n" if element.get(_W + "type", "textWrapping") == "textWrapping" else ""
+
+
+def _row_lines(cells):
+    # A row of one-line cells ("Email | Phone | City") stays on one line;
+    # cells holding whole sections (two-column layouts) are read one after another
+    if all(len(cell) <= 1 for cell in cells):
+        return [CELL_SEPARATOR.join(cell[0] for cell in cells if cell and cell[0].strip())]
+    return [line for cell in cells for line in cell]
+
+
+# 📌 Function to Stream the lines (one per paragraph or table row) of one WordprocessingML part
+def iter_part_lines(source):
+    containers = [[]]      # finished lines; table cells and text boxes collect theirs separately
+    paragraphs = []        # text pieces of each open paragraph (text boxes nest paragraphs)
+    rows = []              # cells of the current row of each open table
+    fallback_depth = 0
+    body = None
+
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        tag = element.tag
+        if tag == FALLBACK:
+            fallback_depth += 1 if event == "start" else -1
+            continue
+        if fallback_depth:
+            continue
+
+        if event == "start":
+            if tag == P:
+                paragraphs.append([])
+            elif tag == TR:
+                rows.append([])
+            elif tag in (TC, TEXT_BOX):
+                containers.append([])
+            elif tag == BODY:
+                body = element
+            continue
+
+        if tag == T:
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag in (TAB, PTAB):
+            # w:tab also defines tab stops in paragraph properties; those carry a position
+            if paragraphs and element.get(_W + "pos") is None:
+                paragraphs[-1].append("\t")
+        elif tag in (BR, CR):
+            if paragraphs:
+                paragraphs[-1].append(_break_text(element) if tag == BR else "\n")
+        elif tag == HYPHEN:
+            if paragraphs:
+                paragraphs[-1].append("-")
+        elif tag == P:
+            containers[-1].append("".join(paragraphs.pop()))
+        elif tag == TC:
+            cell = containers.pop()
+            rows[-1].append(cell)
+        elif tag == TR:
+            containers[-1].extend(_row_lines(rows.pop()))
+        elif tag == TEXT_BOX:
+            # A text box's lines go out just before the paragraph that anchors it
+            lines = containers.pop()
+            containers[-1].extend(lines)
+
+        # Between top-level blocks: hand the finished lines over and drop the parsed elements
+        if len(containers) == 1 and not paragraphs and not rows and tag in (P, TBL):
+            yield from containers[0]
+            containers[0].clear()
+            if body is not None:
+                body.clear()
+    yield from containers[0]
+
+
+def _part_order(name):
+    number = PART_NUMBER_PATTERN.search(posixpath.basename(name))
+    return int(number.group()) if number else 0, name
+
+
+def _related_parts(archive, kind):
+    # Header/footer parts referenced by the document, in part-number order
+    try:
+        with archive.open(DOCUMENT_RELS) as rels:
+            relationships = ElementTree.parse(rels).getroot().iter(_RELATIONSHIPS)
+            targets = [
+                relationship.get("Target") for relationship in relationships
+                if relationship.get("Type", "").endswith("/" + kind)
+            ]
+    except KeyError:
+        return []
+    # Targets are relative to word/ unless they start with "/"
+    parts = [
+        target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("word", target))
+        for target in targets
+    ]
+    return sorted((part for part in set(parts) if part in archive.NameToInfo), key=_part_order)
+
+
+def _iter_parts_lines(archive, parts, seen):
+    # First-page, even-page and default headers often repeat the same text; keep one copy
+    for part in parts:
+        with archive.open(part) as stream:
+            lines = [line for line in iter_part_lines(stream) if line.strip()]
+        key = "\n".join(lines)
+        if lines and key not in seen:
+            seen.add(key)
+            yield from lines
+
+
+# 📌 Function to Stream a DOCX's text lines: headers, body (tables and text boxes included), footers
+def iter_docx_lines(docx_file):
+    source = docx_file if not isinstance(docx_file, (bytes, bytearray)) else io.BytesIO(docx_file)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    with zipfile.ZipFile(source) as archive:
+        seen = set()
+        yield from _iter_parts_lines(archive, _related_parts(archive, "header"), seen)
+        with archive.open(DOCUMENT_PART) as stream:
+            yield from iter_part_lines(stream)
+        yield from _iter_parts_lines(archive, _related_parts(archive, "footer"), seen)
+
+
+def _python_docx_text(data):
+    import docx
+    return "\n".join(paragraph.text for paragraph in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare streaming DOCX extraction with python-docx.")
+    parser.add_argument("paths", nargs="+", help="DOCX files or directories")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Extractions per file (best time counts)")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(root, name) for root, _, names in os.walk(path)
+                         for name in sorted(names) if name.lower().endswith(".docx"))
+        else:
+            files.append(path)
+
+    from skills import get_skill_matcher
+
+    totals = {"python-docx": [0.0, 0, 0], "streaming": [0.0, 0, 0]}
+    extractors = {"python-docx": _python_docx_text, "streaming": lambda data: "\n".join(iter_docx_lines(data))}
+    for path in files:
+        with open(path, "rb") as handle:
+            data = handle.read()
+        for name, extract in extractors.items():
+            best = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                text = extract(data)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            totals[name][0] += best
+            totals[name][1] += len(text)
+            totals[name][2] += len(get_skill_matcher().extract(text))
+
+    print(f"{len(files)} file(s)")
+    for name, (seconds, characters, skills) in totals.items():
+        print(f"  {name:<12} {seconds * 1000:9.1f} ms   {characters:>9,} chars   {skills:>6} skills found")
+
+
+if __name__ == "__main__":
+    main()
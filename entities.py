@@ -0,0 +1,237 @@
+import re
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import date
+
+from analysis import EMAIL_PATTERN, analyze_resume
+from sections import span_at
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+_DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?,?\s+\d{4}|\d{1,2}[/.]\d{4}|(?:19|20)\d{2})"
+_DATE_RANGE = (
+    r"(?P<range_start>" + _DATE + r")\s*(?:-|–|—|to|until)\s*"
+    r"(?P<range_end>" + _DATE + r"|present|current|now|today|date)"
+)
+_LINK = r"(?:https?://|www\.)[^\s,;|()<>]+|\b(?:linkedin|github|gitlab)\.com/[^\s,;|()<>]+"
+_PHONE = r"(?<![\w/])\+?(?:\d[\s.-]?){0,3}(?:\(\d{2,4}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,3}(?![\w/])"
+_DEGREE = (
+    r"\b(?:ph\.?\s?d\b|doctor(?:ate| of [a-z]+)|mba\b|m\.b\.a\.?|master(?:'?s)?(?: of [a-z]+)?|"
+    r"m\.?sc\b|m\.?tech\b|m\.s\.|m\.a\.|m\.e\.|bachelor(?:'?s)?(?: of [a-z]+)?|"
+    r"b\.?sc\b|b\.?tech\b|b\.?com\b|b\.s\.|b\.a\.|b\.e\.|associate(?:'?s)? degree|diploma|high school)"
+)
+
+# ✅ Every regex-based field is found in a single finditer pass over the text
+ENTITY_PATTERN = re.compile(
+    r"(?P<email>" + EMAIL_PATTERN.pattern + r")"
+    r"|(?P<link>" + _LINK + r")"
+    r"|(?P<range>" + _DATE_RANGE + r")"
+    r"|(?P<phone>" + _PHONE + r")"
+    r"|(?P<degree>" + _DEGREE + r")",
+    re.IGNORECASE,
+)
+DATE_PARTS_PATTERN = re.compile(r"(?:(?P<month_name>[a-z]{3})[a-z]*\.?,?\s+|(?P<month>\d{1,2})[/.])?(?P<year>\d{4})", re.IGNORECASE)
+
+TITLE_PATTERN = re.compile(
+    r"\b(engineer|developer|programmer|manager|analyst|intern|consultant|designer|scientist|lead|architect|"
+    r"director|specialist|administrator|officer|coordinator|associate|assistant|head|president|founder|"
+    r"researcher|teacher|lecturer|accountant|executive|technician|nurse|supervisor|trainee)\b",
+    re.IGNORECASE,
+)
+HEADER_SEPARATOR_PATTERN = re.compile(r"\s*(?:\||•|,|\s[-–—]\s|\s+at\s+|\s+@\s+|\t|\s{3,})\s*")
+
+DEGREE_LEVELS = [
+    ("phd", re.compile(r"ph\.?\s?d|doctor", re.IGNORECASE)),
+    ("master", re.compile(r"^m|master", re.IGNORECASE)),
+    ("bachelor", re.compile(r"^b|bachelor", re.IGNORECASE)),
+    ("associate", re.compile(r"associate", re.IGNORECASE)),
+    ("diploma", re.compile(r"diploma", re.IGNORECASE)),
+    ("high school", re.compile(r"high school", re.IGNORECASE)),
+]
+
+Position = namedtuple("Position", ["title", "employer", "start", "end", "months"])
+Degree = namedtuple("Degree", ["level", "text"])
+
+
+# ✅ Structured data extracted from a resume
+@dataclass
+class ResumeEntities:
+    emails: list = field(default_factory=list)
+    phones: list = field(default_factory=list)
+    links: list = field(default_factory=list)
+    positions: list = field(default_factory=list)
+    degrees: list = field(default_factory=list)
+    years_of_experience: float = 0.0
+
+    @property
+    def employers(self):
+        return _unique(position.employer for position in self.positions if position.employer)
+
+    @property
+    def titles(self):
+        return _unique(position.title for position in self.positions if position.title)
+
+    @property
+    def latest_position(self):
+        return max(self.positions, key=lambda position: position.end, default=None)
+
+    @property
+    def highest_degree(self):
+        levels = [level for level, _ in DEGREE_LEVELS]
+        return min((degree.level for degree in self.degrees), key=levels.index, default=None)
+
+
+def _unique(values):
+    return list(dict.fromkeys(values))
+
+
+def _month_index(value, is_end, today):
+    if value.lower() in ("present", "current", "now", "today", "date"):
+        return today.year * 12 + today.month + 1
+    parts = DATE_PARTS_PATTERN.search(value)
+    year = int(parts.group("year"))
+    if parts.group("month_name"):
+        month = MONTHS.get(parts.group("month_name").lower())
+    elif parts.group("month"):
+        month = int(parts.group("month"))
+    else:
+        # A bare year starts in January and ends at the start of that year ("2018 - 2021" is 3 years)
+        return year * 12 + 1
+    month = month if month and 1 <= month <= 12 else 1
+    # An end month is inclusive: "Jan 2020 - Mar 2020" is three months
+    return year * 12 + month + (1 if is_end else 0)
+
+
+def _merged_months(ranges):
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _line_around(text, start, end):
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    return line_start, len(text) if line_end < 0 else line_end
+
+
+def _previous_line(text, line_start):
+    end = line_start - 1
+    while end > 0:
+        start = text.rfind("\n", 0, end) + 1
+        line = text[start:end].strip()
+        if line:
+            return line
+        end = start - 1
+    return ""
+
+
+def _role_header(text, match):
+    # The job header is the date range's line without the dates, plus the line above it
+    # when the dates sit on a line of their own or the title and employer are split across two lines
+    line_start, line_end = _line_around(text, match.start(), match.end())
+    same_line = (text[line_start:match.start()] + " " + text[match.end():line_end]).strip(" \t()[]|,-–—")
+    previous = _previous_line(text, line_start)
+    if previous[:1] in ("•", "-", "*") or len(previous) > 120:
+        previous = ""
+    if not same_line:
+        return previous
+    if previous and len(HEADER_SEPARATOR_PATTERN.split(same_line)) == 1:
+        return previous + " | " + same_line
+    return same_line
+
+
+def _title_and_employer(header, organizations):
+    segments = [segment.strip(" ()[]") for segment in HEADER_SEPARATOR_PATTERN.split(header) if segment.strip(" ()[]")]
+    title = next((segment for segment in segments if TITLE_PATTERN.search(segment)), None)
+    employer = next((org for org in organizations if org != title), None)
+    if employer is None:
+        employer = next((segment for segment in segments if segment != title and not segment[:1].isdigit()), None)
+    return title, employer
+
+
+def _scan(analysis, today):
+    text = analysis.text
+    spans = analysis.section_spans
+    has_experience = any(span.kind == "experience" for span in spans)
+    has_education = any(span.kind == "education" for span in spans)
+
+    entities = ResumeEntities()
+    ranges = []
+    for match in ENTITY_PATTERN.finditer(text):
+        span = span_at(spans, match.start())
+        kind = span.kind if span else "header"
+        group = match.lastgroup
+        if group == "email":
+            entities.emails.append(match.group())
+        elif group == "link":
+            entities.links.append(match.group().rstrip(".,"))
+        elif group == "phone":
+            digits = sum(char.isdigit() for char in match.group())
+            if 9 <= digits <= 15:
+                entities.phones.append(match.group().strip())
+        elif group == "degree":
+            # "Scrum Master" in an experience section is not a degree
+            if kind == "education" or not has_education:
+                degree_text = match.group()
+                level = next(level for level, pattern in DEGREE_LEVELS if pattern.search(degree_text))
+                entities.degrees.append(Degree(level, degree_text))
+        elif group == "range" and (kind == "experience" if has_experience else kind != "education"):
+            start = _month_index(match.group("range_start"), False, today)
+            end = _month_index(match.group("range_end"), True, today)
+            if start <= end:
+                ranges.append((start, end, _role_header(text, match)))
+
+    entities.emails = _unique(entities.emails)
+    entities.phones = _unique(entities.phones)
+    entities.links = _unique(entities.links)
+    entities.degrees = _unique(entities.degrees)
+    entities.years_of_experience = round(_merged_months([(start, end) for start, end, _ in ranges]) / 12, 1)
+    return entities, ranges
+
+
+def _format_month(index):
+    year, month = divmod(index - 1, 12)
+    return f"{year}-{month + 1:02d}"
+
+
+def _finish(entities, ranges, docs):
+    for (start, end, header), doc in zip(ranges, docs):
+        organizations = [entity.text for entity in doc.ents if entity.label_ == "ORG"] if doc is not None else []
+        title, employer = _title_and_employer(header, organizations)
+        entities.positions.append(Position(title, employer, _format_month(start), _format_month(end - 1), end - start))
+    return entities
+
+
+def _ner_docs(headers, batch_size):
+    # Only the short job-header lines go through NER, batched with nlp.pipe
+    try:
+        from nlp_pipeline import pipe_texts
+        return list(pipe_texts(headers, profile="ner", batch_size=batch_size))
+    except Exception:
+        return [None] * len(headers)
+
+
+# 📌 Function to Extract structured entities from many resumes, batching NER across all of them
+def extract_entities_batch(texts, batch_size=256, today=None):
+    today = today or date.today()
+    scanned = [_scan(analyze_resume(text), today) for text in texts]
+    headers = [header for _, ranges in scanned for _, _, header in ranges]
+    docs = iter(_ner_docs(headers, batch_size))
+    return [_finish(entities, ranges, [next(docs) for _ in ranges]) for entities, ranges in scanned]
+
+
+# 📌 Function to Extract structured entities from one resume (text or ResumeAnalysis)
+def extract_entities(text, today=None):
+    return extract_entities_batch([text], today=today)[0]
@@ -0,0 +1,193 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ✅ Local stand-in for the Gemini REST API, for load tests and offline development.
+# Point the app at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8765
+# Like the real model, it answers each part of the analysis plan (prompting.ANALYSIS_PLAN) with that part
+# only: the "## <heading>" section of the response text named in the prompt, without the heading itself.
+
+DEFAULT_RESPONSE = """## Overall Assessment
+A solid resume with clear experience; a few sections could be tightened.
+
+## Strengths
+- Relevant technical skills
+- Quantified achievements
+- Clear structure
+
+## Areas for Improvement
+- Add a professional summary
+- Use stronger action verbs
+- Trim older experience
+
+## Specific Suggestions to Match Job Description
+- Mention the job's required skills in the summary
+- Lead with the projects closest to the role
+
+## Improved Resume
+# Jane Doe
+jane.doe@example.com
+
+## Summary
+Software engineer with five years of experience building data products.
+
+## Experience
+- Built Python services handling 1M requests per day
+- Led migration to Docker and Kubernetes
+
+## Skills
+Python, SQL, Docker, Kubernetes, AWS
+"""
+
+PATH_PATTERN = re.compile(r"^/v1beta/models/(?P<model>[^:/]+):(?P<method>generateContent|streamGenerateContent)")
+# The line prompting.PART_PROMPT ends every part prompt with
+PART_HEADING_PATTERN = re.compile(r'do not repeat the section title "(?P<heading>[^"\n]+)"')
+
+
+def _prompt_text(body):
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError:
+        return ""
+    return "\n".join(
+        part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])
+    )
+
+
+# 📌 Function to Pick the reply to one prompt: the section a part prompt asks for, else the whole response
+def reply_for(prompt, response_text):
+    from prompting import ANALYSIS_PLAN
+
+    match = PART_HEADING_PATTERN.search(prompt)
+    if not match:
+        return response_text
+    heading = match.group("heading")
+    # Sections end at the next part heading; the improved resume has "## " headings of its own
+    headings = {part.heading for part in ANALYSIS_PLAN} | {heading}
+    section, inside = [], False
+    for line in response_text.splitlines(keepends=True):
+        title = line[3:].strip() if line.startswith("## ") else None
+        if title in headings:
+            if inside:
+                break
+            inside = title == heading
+        elif inside:
+            section.append(line)
+    return "".join(section).strip() + "\n" if section else f"- Suggestions for {heading.lower()} (fake)\n"
+
+
+def _response_payload(text, finished=True):
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text.split()), "totalTokenCount": len(text.split())},
+    }
+
+
+def _error_payload(code, status, message):
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    server_version = "FakeGemini/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        match = PATH_PATTERN.match(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        prompt = _prompt_text(self.rfile.read(length))
+        with self.server.lock:
+            self.server.request_count += 1
+
+        if not match:
+            self._send_json(404, _error_payload(404, "NOT_FOUND", f"Unknown path {self.path}"))
+            return
+
+        time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            self._send_json(429, _error_payload(429, "RESOURCE_EXHAUSTED", "Quota exceeded (fake)"))
+            return
+
+        text = reply_for(prompt, self.server.response_text)
+        if match.group("method") == "generateContent":
+            self._send_json(200, _response_payload(text))
+        else:
+            self._stream(text, sse="alt=sse" in self.path)
+
+    def _stream(self, text, sse):
+        # Emit the response a line at a time, as the real API streams partial candidates
+        chunks = text.splitlines(keepends=True)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.end_headers()
+        if not sse:
+            self.wfile.write(b"[")
+        for index, chunk in enumerate(chunks):
+            payload = json.dumps(_response_payload(chunk, finished=index == len(chunks) - 1))
+            if sse:
+                self.wfile.write(f"data: {payload}\r\n\r\n".encode("utf-8"))
+            else:
+                self.wfile.write((("," if index else "") + payload + "\n").encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.chunk_delay)
+        if not sse:
+            self.wfile.write(b"]")
+        self.wfile.flush()
+
+
+# 📌 Function to Start a fake server in a background thread (returns the server; call shutdown() to stop)
+def start_fake_gemini(port=8765, latency=0.2, error_rate=0.0, chunk_delay=0.02, response_text=DEFAULT_RESPONSE, verbose=False):
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeGeminiHandler)
+    server.latency = latency
+    server.error_rate = error_rate
+    server.chunk_delay = chunk_delay
+    server.response_text = response_text
+    server.verbose = verbose
+    server.request_count = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, name="fake-gemini", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local fake Gemini API server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Seconds between streamed chunks")
+    parser.add_argument("--response-file", help="Markdown file to return instead of the built-in response")
+    args = parser.parse_args(argv)
+
+    response_text = DEFAULT_RESPONSE
+    if args.response_file:
+        with open(args.response_file, encoding="utf-8") as handle:
+            response_text = handle.read()
+
+    server = start_fake_gemini(args.port, args.latency, args.error_rate, args.chunk_delay, response_text, verbose=True)
+    print(f"✅ Fake Gemini listening on http://127.0.0.1:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+DEFAULT_MODEL = "gemini-1.5-pro"
+
+# ✅ Client limits (overridable from the environment)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "120"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1.0"))
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "30"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+_sdk_settings = None
+_sdk_applied = None
+_sdk_lock = threading.Lock()
+
+
+# 📌 Function to Configure the SDK; GEMINI_API_ENDPOINT points it at a local fake server
+# Only the settings are recorded here: the SDK is one of the slowest imports in the app, so it is
+# imported and configured when the first client is created
+def configure_gemini(api_key, endpoint=None):
+    global _sdk_settings
+    _sdk_settings = (api_key, endpoint or os.getenv("GEMINI_API_ENDPOINT"))
+
+
+def _genai():
+    global _sdk_applied
+    import google.generativeai as genai
+
+    with _sdk_lock:
+        if _sdk_settings is not None and _sdk_applied != _sdk_settings:
+            api_key, endpoint = _sdk_settings
+            if endpoint:
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+            else:
+                genai.configure(api_key=api_key)
+            _sdk_applied = _sdk_settings
+    return genai
+
+
+def _status_code(error):
+    code = getattr(error, "code", None)
+    # google.api_core exceptions expose the HTTP status as .code
+    return code if isinstance(code, int) else None
+
+
+def _is_retryable(error):
+    return isinstance(error, asyncio.TimeoutError) or _status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def response_text(response):
+    try:
+        return response.text
+    except (AttributeError, ValueError):
+        # Blocked or empty responses have no text part
+        return None
+
+
+# ✅ Token bucket shared by every request sent through one client
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ✅ Shared Gemini client: one model object, bounded concurrency, rate limiting, retries and timeouts
+# Requests run on a private event loop thread, so Streamlit sessions (threads) share the same limits.
+class GeminiClient:
+    def __init__(self, model_name=DEFAULT_MODEL, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                 requests_per_minute=GEMINI_REQUESTS_PER_MINUTE, max_retries=GEMINI_MAX_RETRIES,
+                 timeout=GEMINI_TIMEOUT):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._model = _genai().GenerativeModel(model_name)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="gemini-client", daemon=True)
+        self._thread.start()
+        self._semaphore = None
+        self._bucket = None
+        self._run(self._init_limits())
+
+    async def _init_limits(self):
+        # Asyncio primitives must be created on the loop that uses them
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Allow a burst as large as the concurrency limit, then refill at the configured rate
+        self._bucket = TokenBucket(self.requests_per_minute, capacity=max(1, self.max_concurrency))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _call(self, prompt, **kwargs):
+        return await asyncio.to_thread(
+            self._model.generate_content, prompt, request_options={"timeout": self.timeout}, **kwargs
+        )
+
+    # 📌 Async API: one prompt, with rate limiting, timeout and retry on 429/5xx
+    async def generate_async(self, prompt, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            try:
+                async with self._semaphore:
+                    return await asyncio.wait_for(self._call(prompt, **kwargs), self.timeout)
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise GeminiError(str(e), _status_code(e)) from e
+                if attempt == self.max_retries:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise GeminiError(f"Gemini request timed out after {self.timeout:.0f}s") from e
+                    raise GeminiError(str(e), _status_code(e)) from e
+                # Exponential backoff with jitter
+                delay = min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    # 📌 Async API: many prompts concurrently, results in the same order
+    async def generate_many_async(self, prompts, **kwargs):
+        return await asyncio.gather(
+            *(self.generate_async(prompt, **kwargs) for prompt in prompts), return_exceptions=True
+        )
+
+    # 📌 Blocking helpers for callers outside the client's loop (Streamlit, CLI, workers)
+    def generate(self, prompt, **kwargs):
+        return self._run(self.generate_async(prompt, **kwargs))
+
+    def generate_many(self, prompts, **kwargs):
+        return self._run(self.generate_many_async(prompts, **kwargs))
+
+    def submit(self, prompt, **kwargs):
+        # Start a request without waiting for it; returns a concurrent.futures.Future
+        return asyncio.run_coroutine_threadsafe(self.generate_async(prompt, **kwargs), self._loop)
+
+    def generate_text(self, prompt, **kwargs):
+        return response_text(self.generate(prompt, **kwargs))
+
+    # 📌 Streaming: yields text chunks as they arrive; retries only before the first chunk
+    def generate_stream(self, prompt, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self._run(self._bucket.acquire())
+            self._run(self._semaphore.acquire())
+            started = False
+            try:
+                response = self._model.generate_content(
+                    prompt, stream=True, request_options={"timeout": self.timeout}, **kwargs
+                )
+                for chunk in response:
+                    text = response_text(chunk)
+                    if text:
+                        started = True
+                        yield text
+                return
+            except Exception as e:
+                if started or not _is_retryable(e) or attempt == self.max_retries:
+                    raise GeminiError(str(e), _status_code(e)) from e
+            finally:
+                self._loop.call_soon_threadsafe(self._semaphore.release)
+            delay = min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+# 📌 Function to Get the shared client for a model (created once per process)
+def get_gemini_client(model_name=DEFAULT_MODEL):
+    with _clients_lock:
+        if model_name not in _clients:
+            _clients[model_name] = GeminiClient(model_name)
+        return _clients[model_name]
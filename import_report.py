@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+# ✅ Import-time report for the app's entry modules, measured with `python -X importtime`,
+# and a regression check against the checked-in baseline
+IMPORT_BASELINE_PATH = os.getenv(
+    "IMPORT_BASELINE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_baseline.json")
+)
+# The Streamlit app (project) is not measured: importing it runs the whole page script, which needs a
+# Streamlit runtime and GOOGLE_API_KEY; it defers pandas and the other heavy libraries like these modules do
+ENTRY_MODULES = ["core", "batch", "api", "ats_rules", "semantic_index", "docx_templates"]
+
+# Heavy libraries that must not load at import time; each is imported by the code path that needs it
+DEFERRED_MODULES = [
+    "spacy", "google.generativeai", "pdfplumber", "fitz", "pypdfium2", "pandas", "docx", "scipy",
+    "sentence_transformers", "torch",
+]
+
+
+def _parse_importtime(stderr):
+    # Lines look like "import time:       self |   cumulative | <indent>package.module" (microseconds)
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+# 📌 Function to Measure one module's import in fresh interpreters (best of several runs)
+def measure(module, runs=5, top=10):
+    # The best run counts, which also discounts a first run that has to compile bytecode
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        rows = _parse_importtime(result.stderr)
+        # Rows are listed children first, so the module's own imports are the rows since the previous top-level one
+        end = next(index for index, (name, depth, _, _) in enumerate(rows) if name == module and depth == 0)
+        start = max((index for index in range(end) if rows[index][1] == 0), default=-1) + 1
+        if best is None or rows[end][3] < best[0]:
+            best = (rows[end][3], rows[start:end + 1])
+
+    total, rows = best
+    loaded = {name for name, _, _, _ in rows}
+    children = sorted(
+        ((name, cumulative) for name, depth, _, cumulative in rows if depth == 1), key=lambda row: -row[1]
+    )
+    return {
+        "total_ms": round(total, 1),
+        "heaviest": [[name, round(cumulative, 1)] for name, cumulative in children[:top]],
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in loaded],
+    }
+
+
+def report(modules, runs=5, top=10):
+    results = {}
+    for module in modules:
+        try:
+            results[module] = measure(module, runs, top)
+        except RuntimeError as e:
+            # e.g. api without FastAPI installed
+            print(f"⚠ Skipped {module}: {str(e)}")
+    return {"python": platform.python_version(), "runs": runs, "modules": results}
+
+
+# 📌 Function to Compare a report with the baseline; returns a list of regressions
+def compare(current, baseline, tolerance=0.5, slack_ms=50.0):
+    problems = []
+    for module, result in current["modules"].items():
+        if result["deferred_loaded"]:
+            problems.append(f"{module}: loads {', '.join(result['deferred_loaded'])} at import time")
+        expected = baseline.get("modules", {}).get(module)
+        if expected is None:
+            continue
+        # Timings vary between machines, so only a clear slowdown counts
+        limit = expected["total_ms"] * (1 + tolerance) + slack_ms
+        if result["total_ms"] > limit:
+            problems.append(f"{module}: {result['total_ms']:.0f} ms, baseline {expected['total_ms']:.0f} ms")
+    return problems
+
+
+def _print_report(current, baseline):
+    for module, result in current["modules"].items():
+        expected = baseline.get("modules", {}).get(module) if baseline else None
+        against = f" (baseline {expected['total_ms']:.0f} ms)" if expected else ""
+        print(f"{module:<16} {result['total_ms']:8.1f} ms{against}")
+        for name, cumulative in result["heaviest"]:
+            print(f"    {name:<28} {cumulative:8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of the app's modules (python -X importtime).")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES, help="Modules to import (default: entry modules)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Fresh interpreters per module; the best run counts")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest direct imports to list per module")
+    parser.add_argument("--baseline", default=IMPORT_BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--write", action="store_true", help="Save this report as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with an error on a regression against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown as a fraction of the baseline")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    current = report(args.modules, args.runs, args.top)
+    _print_report(current, baseline)
+    if "project" not in args.modules:
+        print("ℹ project (the Streamlit app) is not measured; it only runs inside Streamlit")
+
+    if args.write:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+        print(f"✅ Baseline written to {args.baseline}")
+    if args.check:
+        problems = compare(current, baseline or {}, args.tolerance)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ No import-time regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import record_cache
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def _normalize(text):
+    return " ".join((text or "").split())
+
+
+# 📌 Function to Build the cache key for one LLM request
+def make_cache_key(model_name, template_version, resume_text, job_description=None):
+    payload = json.dumps(
+        [model_name, template_version, _normalize(resume_text), _normalize(job_description)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ✅ LLM response cache with TTL, size-bounded LRU eviction and optional SQLite persistence
+class LLMResponseCache:
+    def __init__(self, disk_path=None, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "cache_key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_created ON llm_responses (created_at)")
+            self._db.commit()
+
+    def _expired(self, created_at):
+        return self.ttl_seconds and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+
+            if entry is not None and self._expired(entry[1]):
+                self._entries.pop(key, None)
+                if self._db is not None:
+                    self._db.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                    self._db.commit()
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                record_cache("llm", False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache("llm", True)
+            return entry[0]
+
+    def put(self, key, response):
+        entry = (response, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?)", (key, response, entry[1]))
+                # Keep the table bounded too: drop the oldest rows beyond max_entries
+                self._db.execute(
+                    "DELETE FROM llm_responses WHERE cache_key IN ("
+                    "SELECT cache_key FROM llm_responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,179 @@
+import math
+import re
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from skills import get_skill_matcher
+
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+REQUIRED_LINE_PATTERN = re.compile(r"\b(required|requirements?|must|need(?:ed)?|essential|mandatory)\b", re.IGNORECASE)
+
+STOP_WORDS = frozenset("""
+a about above after again all also an and any are as at be because been being below between both but by can
+could did do does doing down during each etc few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out
+over own per same she should so some such than that the their theirs them then there these they this those
+through to too under until up very via was we were what when where which while who whom why will with within
+would you your yours work working years year experience team role company candidate candidates ability strong
+""".split())
+
+# Weight of skill overlap vs. TF-IDF similarity in the combined score
+SKILL_WEIGHT = 0.6
+REQUIRED_SKILL_WEIGHT = 2.0
+
+JobProfile = namedtuple("JobProfile", ["text", "skills", "skill_weights", "keywords"])
+JobMatch = namedtuple("JobMatch", ["resume_id", "score", "skill_overlap", "similarity", "matched_skills", "missing_skills"])
+
+
+def tokenize_terms(text):
+    return [term for term in TERM_PATTERN.findall((text or "").lower()) if term not in STOP_WORDS and len(term) > 1]
+
+
+# 📌 Function to Extract required skills (weighted) and keywords from a job description
+def build_job_profile(job_description, top_keywords=25):
+    matcher = get_skill_matcher()
+    weights = {}
+    for line in (job_description or "").splitlines():
+        weight = REQUIRED_SKILL_WEIGHT if REQUIRED_LINE_PATTERN.search(line) else 1.0
+        for skill in matcher.extract(line):
+            weights[skill] = max(weights.get(skill, 0.0), weight)
+    # Multi-word skills broken across lines
+    for skill in matcher.extract(job_description):
+        weights.setdefault(skill, 1.0)
+
+    keywords = [term for term, _ in Counter(tokenize_terms(job_description)).most_common(top_keywords)]
+    return JobProfile(job_description, list(weights), weights, keywords)
+
+
+# ✅ Vectorized index of resumes: TF-IDF term matrix plus a binary skill matrix
+# Resumes are added incrementally; the sparse matrices are rebuilt lazily on the next query.
+class ResumeIndex:
+    def __init__(self):
+        self.ids = []
+        self._positions = {}
+        self._vocabulary = {}
+        self._rows = []
+        self._skill_rows = []
+        self._document_frequency = Counter()
+        self._skill_columns = {skill: index for index, skill in enumerate(get_skill_matcher().skills)}
+        self._matrix = None
+        self._idf = None
+        self._skills = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    # 📌 Add (or replace) one resume
+    def add(self, resume_id, text, skills=None):
+        counts = Counter(tokenize_terms(text))
+        skills = skills if skills is not None else get_skill_matcher().extract(text)
+        with self._lock:
+            row = {}
+            for term, count in counts.items():
+                column = self._vocabulary.setdefault(term, len(self._vocabulary))
+                row[column] = count
+            skill_row = [self._skill_columns[skill] for skill in skills if skill in self._skill_columns]
+
+            if resume_id in self._positions:
+                position = self._positions[resume_id]
+                self._document_frequency.subtract(self._rows[position].keys())
+                self._rows[position] = row
+                self._skill_rows[position] = skill_row
+            else:
+                self._positions[resume_id] = len(self.ids)
+                self.ids.append(resume_id)
+                self._rows.append(row)
+                self._skill_rows.append(skill_row)
+            self._document_frequency.update(row.keys())
+            self._matrix = None
+
+    def _build(self):
+        # scipy.sparse is imported here rather than at module load, which it would slow down noticeably
+        from scipy import sparse
+
+        rows, columns, values = [], [], []
+        for position, row in enumerate(self._rows):
+            rows.extend([position] * len(row))
+            columns.extend(row.keys())
+            values.extend(row.values())
+        shape = (len(self._rows), len(self._vocabulary))
+        counts = sparse.csr_matrix((np.asarray(values, dtype=np.float32), (rows, columns)), shape=shape)
+
+        document_count = len(self._rows)
+        frequency = np.zeros(len(self._vocabulary), dtype=np.float32)
+        for column, count in self._document_frequency.items():
+            frequency[column] = count
+        self._idf = np.log((1.0 + document_count) / (1.0 + frequency)) + 1.0
+
+        # Sublinear TF, IDF weighting and L2 row normalisation, all as sparse operations
+        counts.data = 1.0 + np.log(counts.data)
+        weighted = sparse.csr_matrix(counts.multiply(self._idf))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self._matrix = sparse.csr_matrix(sparse.diags(1.0 / norms) @ weighted)
+
+        skill_rows, skill_columns = [], []
+        for position, row in enumerate(self._skill_rows):
+            skill_rows.extend([position] * len(row))
+            skill_columns.extend(row)
+        self._skills = sparse.csr_matrix(
+            (np.ones(len(skill_rows), dtype=np.float32), (skill_rows, skill_columns)),
+            shape=(len(self._skill_rows), len(self._skill_columns)),
+        )
+
+    def _query_vector(self, text):
+        vector = np.zeros(len(self._vocabulary), dtype=np.float32)
+        for term, count in Counter(tokenize_terms(text)).items():
+            column = self._vocabulary.get(term)
+            if column is not None:
+                vector[column] = (1.0 + math.log(count)) * self._idf[column]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # 📌 Rank resumes against a job description (optionally only the given ids)
+    def rank(self, job_description, ids=None, top_k=None):
+        profile = job_description if isinstance(job_description, JobProfile) else build_job_profile(job_description)
+        with self._lock:
+            if not self.ids:
+                return []
+            if self._matrix is None:
+                self._build()
+
+            similarity = self._matrix @ self._query_vector(profile.text)
+
+            weights = np.zeros(len(self._skill_columns), dtype=np.float32)
+            for skill, weight in profile.skill_weights.items():
+                if skill in self._skill_columns:
+                    weights[self._skill_columns[skill]] = weight
+            total_weight = weights.sum()
+            overlap = self._skills @ weights / total_weight if total_weight else np.zeros(len(self.ids))
+
+            scores = SKILL_WEIGHT * overlap + (1 - SKILL_WEIGHT) * similarity if total_weight else similarity
+
+            positions = np.arange(len(self.ids))
+            if ids is not None:
+                positions = np.array([self._positions[resume_id] for resume_id in ids if resume_id in self._positions], dtype=int)
+            if top_k and top_k < len(positions):
+                best = np.argpartition(-scores[positions], top_k - 1)[:top_k]
+                positions = positions[best]
+            positions = positions[np.argsort(-scores[positions], kind="stable")]
+
+            skill_names = list(self._skill_columns)
+            results = []
+            for position in positions:
+                found = {skill_names[column] for column in self._skill_rows[position]}
+                results.append(JobMatch(
+                    self.ids[position],
+                    round(float(scores[position]) * 100, 1),
+                    round(float(overlap[position]) * 100, 1),
+                    round(float(similarity[position]) * 100, 1),
+                    [skill for skill in profile.skills if skill in found],
+                    [skill for skill in profile.skills if skill not in found],
+                ))
+            return results
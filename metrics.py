@@ -0,0 +1,319 @@
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ✅ Per-stage instrumentation of the pipeline: durations, input sizes (pages, characters, tokens),
+# cache hits and errors, kept in memory and exported in the Prometheus text format
+# (GET /metrics on the HTTP API, METRICS_PORT for the Streamlit app, or the sidebar debug panel)
+METRICS_RECENT_SAMPLES = int(os.getenv("METRICS_RECENT_SAMPLES", "1000"))
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = {
+    "pages": (1, 2, 3, 5, 10, 20, 50, 100),
+    "characters": (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000),
+    "tokens": (250, 500, 1000, 2500, 5000, 10000, 25000, 50000),
+}
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# One finished stage call and one cache lookup; worker processes send these back to the parent with their results
+SpanRecord = namedtuple("SpanRecord", ["stage", "seconds", "failed", "sizes"])
+CacheRecord = namedtuple("CacheRecord", ["cache", "hit"])
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # Prometheus buckets count values <= their upper bound; the last slot is +Inf
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+# ✅ Counters and histograms for every stage, shared by all threads (Streamlit sessions, API workers)
+class MetricsRegistry:
+    def __init__(self, recent_samples=METRICS_RECENT_SAMPLES):
+        self.recent_samples = recent_samples
+        self._lock = threading.Lock()
+        self._calls = defaultdict(int)        # (stage, outcome) -> count
+        self._durations = {}                  # stage -> Histogram
+        self._first_chunk = {}                # stage -> Histogram (streamed stages)
+        self._sizes = {}                      # (stage, unit) -> Histogram
+        self._size_totals = defaultdict(int)  # (stage, unit) -> sum, for the debug panel averages
+        self._recent = {}                     # stage -> latest durations, for exact tail percentiles
+        self._cache = defaultdict(int)        # (cache, result) -> count
+
+    def record(self, record):
+        with self._lock:
+            self._calls[record.stage, "error" if record.failed else "ok"] += 1
+            self._durations.setdefault(record.stage, Histogram(DURATION_BUCKETS)).observe(record.seconds)
+            self._recent.setdefault(record.stage, deque(maxlen=self.recent_samples)).append(record.seconds)
+            for unit, value in record.sizes.items():
+                if unit in SIZE_BUCKETS:
+                    self._sizes.setdefault((record.stage, unit), Histogram(SIZE_BUCKETS[unit])).observe(value)
+                    self._size_totals[record.stage, unit] += value
+
+    def record_first_chunk(self, stage, seconds):
+        with self._lock:
+            self._first_chunk.setdefault(stage, Histogram(DURATION_BUCKETS)).observe(seconds)
+
+    def record_cache(self, cache, hit):
+        with self._lock:
+            self._cache[cache, "hit" if hit else "miss"] += 1
+
+    def reset(self):
+        with self._lock:
+            for table in (self._calls, self._durations, self._first_chunk, self._sizes,
+                          self._size_totals, self._recent, self._cache):
+                table.clear()
+
+    # 📌 Per-stage summary for the debug panel, slowest p95 first
+    def stage_summary(self):
+        with self._lock:
+            recent = {stage: sorted(samples) for stage, samples in self._recent.items()}
+            calls = dict(self._calls)
+            durations = {stage: (histogram.count, histogram.sum) for stage, histogram in self._durations.items()}
+            first_chunk = {stage: (histogram.count, histogram.sum) for stage, histogram in self._first_chunk.items()}
+            size_totals = dict(self._size_totals)
+
+        rows = []
+        for stage, samples in recent.items():
+            count, total = durations[stage]
+            row = {
+                "stage": stage,
+                "calls": count,
+                "errors": calls.get((stage, "error"), 0),
+                "mean_ms": round(total / count * 1000, 1),
+                "p50_ms": round(_percentile(samples, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(samples, 0.99) * 1000, 1),
+                "max_ms": round(samples[-1] * 1000, 1),
+            }
+            if stage in first_chunk:
+                row["first_chunk_ms"] = round(first_chunk[stage][1] / first_chunk[stage][0] * 1000, 1)
+            for unit in SIZE_BUCKETS:
+                if (stage, unit) in size_totals:
+                    row[f"avg_{unit}"] = round(size_totals[stage, unit] / count)
+            rows.append(row)
+        return sorted(rows, key=lambda row: -row["p95_ms"])
+
+    def cache_summary(self):
+        with self._lock:
+            counts = dict(self._cache)
+        rows = []
+        for cache in sorted({cache for cache, _ in counts}):
+            hits, misses = counts.get((cache, "hit"), 0), counts.get((cache, "miss"), 0)
+            rows.append({"cache": cache, "hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)})
+        return rows
+
+    # 📌 Render everything in the Prometheus text exposition format
+    def render(self):
+        with self._lock:
+            lines = [
+                "# HELP resume_stage_calls_total Pipeline stage calls by outcome.",
+                "# TYPE resume_stage_calls_total counter",
+            ]
+            for (stage, outcome), count in sorted(self._calls.items()):
+                lines.append(f"resume_stage_calls_total{_labels(stage=stage, outcome=outcome)} {count}")
+
+            self._render_histograms(lines, "resume_stage_duration_seconds", "Time spent in each pipeline stage.",
+                                    self._durations)
+            self._render_histograms(lines, "resume_stage_first_chunk_seconds",
+                                    "Time to the first chunk of streamed stages.", self._first_chunk)
+            for unit in SIZE_BUCKETS:
+                self._render_histograms(
+                    lines, f"resume_stage_input_{unit}", f"Input size of each stage call, in {unit}.",
+                    {stage: histogram for (stage, size_unit), histogram in self._sizes.items() if size_unit == unit},
+                )
+
+            lines += [
+                "# HELP resume_cache_requests_total Cache lookups by cache and result.",
+                "# TYPE resume_cache_requests_total counter",
+            ]
+            for (cache, result), count in sorted(self._cache.items()):
+                lines.append(f"resume_cache_requests_total{_labels(cache=cache, result=result)} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(lines, name, description, histograms):
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+        for stage, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(stage=stage, le=repr(float(bound)))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(stage=stage, le='+Inf')} {histogram.count}")
+            lines.append(f"{name}_sum{_labels(stage=stage)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{_labels(stage=stage)} {histogram.count}")
+
+
+registry = MetricsRegistry()
+
+_current_span = ContextVar("metrics_current_span", default=None)
+_captured = ContextVar("metrics_captured", default=None)
+
+
+class Span:
+    def __init__(self, stage):
+        self.stage = stage
+        self.sizes = {}
+        self.failed = False
+
+    def size(self, unit, value):
+        self.sizes[unit] = value
+
+    def fail(self):
+        # For stages that report failures as return values (e.g. "Error reading PDF: ...")
+        self.failed = True
+
+
+# 📌 Function to Record a finished stage call (or, inside capture_metrics, keep it for the caller)
+def record_span(record):
+    captured = _captured.get()
+    if captured is not None:
+        captured.append(record)
+    else:
+        registry.record(record)
+
+
+# 📌 Function to Time a block as one call of a stage; exceptions count as errors and are re-raised
+@contextmanager
+def trace(stage):
+    span = Span(stage)
+    token = _current_span.set(span)
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception:
+        span.failed = True
+        raise
+    finally:
+        _current_span.reset(token)
+        record_span(SpanRecord(stage, time.perf_counter() - started, span.failed, dict(span.sizes)))
+
+
+# ✅ One call of a stage whose work is interleaved with another's (text extraction feeding the incremental
+# analysis): time is summed over every `with span.running():` block and recorded once by finish()
+class InterleavedSpan(Span):
+    def __init__(self, stage):
+        super().__init__(stage)
+        self.seconds = 0.0
+
+    @contextmanager
+    def running(self):
+        token = _current_span.set(self)
+        started = time.perf_counter()
+        try:
+            yield self
+        except Exception:
+            self.failed = True
+            raise
+        finally:
+            self.seconds += time.perf_counter() - started
+            _current_span.reset(token)
+
+    def finish(self):
+        record_span(SpanRecord(self.stage, self.seconds, self.failed, dict(self.sizes)))
+
+
+# 📌 Function to Time a generator from the first chunk requested to the last, plus the time to the first chunk
+def trace_stream(stage, chunks, sizes=None):
+    started = time.perf_counter()
+    failed = False
+    first = True
+    try:
+        for chunk in chunks:
+            if first:
+                registry.record_first_chunk(stage, time.perf_counter() - started)
+                first = False
+            yield chunk
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record_span(SpanRecord(stage, time.perf_counter() - started, failed, dict(sizes or {})))
+
+
+# 📌 Function to Add an input size to the stage being traced, from code deeper in the call (e.g. the PDF page count)
+def record_size(unit, value):
+    span = _current_span.get()
+    if span is not None:
+        span.size(unit, value)
+
+
+def record_cache(cache, hit):
+    captured = _captured.get()
+    if captured is not None:
+        captured.append(CacheRecord(cache, hit))
+    else:
+        registry.record_cache(cache, hit)
+
+
+# 📌 Function to Record spans and cache lookups captured elsewhere (see capture_metrics)
+def replay(records):
+    for record in records:
+        if isinstance(record, CacheRecord):
+            registry.record_cache(record.cache, record.hit)
+        else:
+            registry.record(record)
+
+
+# 📌 Function to Collect the spans and cache lookups of a block instead of recording them, e.g. in a worker
+# process whose registry nobody scrapes; the parent passes them to replay
+@contextmanager
+def capture_metrics():
+    records = []
+    token = _captured.set(records)
+    try:
+        yield records
+    finally:
+        _captured.reset(token)
+
+
+def render_prometheus():
+    return registry.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# 📌 Function to Serve GET /metrics from a background thread (for processes without an HTTP API)
+def start_metrics_server(port, host="0.0.0.0"):
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,85 @@
+import os
+import threading
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Components shipped with the en_core_web_* pipelines
+MODEL_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+# ✅ Pipeline profiles: only the components a given analysis needs are loaded
+NLP_PROFILES = {
+    "tokenizer": [],
+    "ner": ["ner"],
+    # tok2vec alone sets doc.tensor, which backs doc.vector in models without static vectors
+    "vectors": ["tok2vec"],
+    "full": MODEL_COMPONENTS,
+}
+
+DEFAULT_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "64"))
+
+# ✅ When the model loads: "background" (warm up in a thread at startup), "eager" (before startup
+# finishes) or "lazy" (on first use). spaCy itself is only imported when a pipeline is loaded.
+NLP_WARM_UP = os.getenv("NLP_WARM_UP", "background")
+
+_pipelines = {}
+_load_lock = threading.Lock()
+
+
+# 📌 Function to Load a spaCy pipeline for a profile (once per process)
+def get_nlp(profile="tokenizer"):
+    nlp = _pipelines.get(profile)
+    if nlp is None:
+        if profile not in NLP_PROFILES:
+            raise ValueError(f"Unknown NLP profile '{profile}'. Choose from: {', '.join(NLP_PROFILES)}")
+        # A caller arriving during a background warm-up waits for it instead of loading a second copy
+        with _load_lock:
+            nlp = _pipelines.get(profile)
+            if nlp is None:
+                nlp = _pipelines[profile] = _load_nlp(profile)
+    return nlp
+
+
+def _load_nlp(profile):
+    import spacy
+
+    model_name = os.getenv("SPACY_MODEL", DEFAULT_MODEL)
+    if profile == "full":
+        return spacy.load(model_name)
+    components = NLP_PROFILES[profile]
+    return spacy.load(model_name, exclude=[name for name in MODEL_COMPONENTS if name not in components])
+
+
+def _warm_up(profiles):
+    for profile in profiles:
+        try:
+            get_nlp(profile)
+        except Exception:
+            # A missing model is reported by the first call that needs it
+            return
+
+
+# 📌 Function to Load pipelines ahead of first use, following NLP_WARM_UP
+# Returns the warm-up thread in background mode, else None
+def warm_up(profiles=("tokenizer",), mode=None):
+    mode = mode or NLP_WARM_UP
+    if mode == "eager":
+        _warm_up(profiles)
+    elif mode == "background":
+        thread = threading.Thread(target=_warm_up, args=(profiles,), name="nlp-warm-up", daemon=True)
+        thread.start()
+        return thread
+    return None
+
+
+# 📌 Function to Tokenize text without running any pipeline component
+def tokenize(text):
+    return get_nlp("tokenizer").make_doc(text)
+
+
+# 📌 Function to Process many documents in batches with nlp.pipe
+def pipe_texts(texts, profile="tokenizer", batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+    nlp = get_nlp(profile)
+    if profile == "tokenizer":
+        # Tokenizer-only pipelines have nothing to batch beyond make_doc
+        return (nlp.make_doc(text) for text in texts)
+    return nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from metrics import record_cache
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def file_hash(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+# ✅ Parsed-text cache keyed by a hash of the file bytes
+# Memory tier: LRU bounded by entry count and text size.
+# Disk tier (optional): SQLite table of zlib-compressed text, survives restarts.
+# Disk entries written by another parser_version are treated as misses and re-parsed.
+class ParseCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, disk_path=None,
+                 parser_version=None):
+        self.max_entries = max_entries
+        self.parser_version = parser_version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parsed_resumes ("
+                "file_hash TEXT PRIMARY KEY, extension TEXT, text BLOB, created_at REAL, parser_version TEXT)"
+            )
+            try:
+                # Caches created before parser versions were recorded
+                self._db.execute("ALTER TABLE parsed_resumes ADD COLUMN parser_version TEXT")
+            except sqlite3.OperationalError:
+                pass
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache("parse", True)
+                return entry
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text, extension FROM parsed_resumes WHERE file_hash = ? AND parser_version IS ?",
+                    (key, self.parser_version)
+                ).fetchone()
+                if row:
+                    entry = (zlib.decompress(row[0]).decode("utf-8"), row[1])
+                    self._remember(key, entry)
+                    self.hits += 1
+                    record_cache("parse", True)
+                    return entry
+
+            self.misses += 1
+            record_cache("parse", False)
+            return None
+
+    def put(self, key, text, extension):
+        entry = (text, extension)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parsed_resumes VALUES (?, ?, ?, ?, ?)",
+                    (key, extension, zlib.compress(text.encode("utf-8")), time.time(), self.parser_version),
+                )
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key)[0])
+        self._entries[key] = entry
+        self._size += len(entry[0])
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted[0])
+
+    # 📌 Every cached (file_hash, text): the disk tier when there is one, otherwise memory
+    def iter_texts(self):
+        if self._db is None:
+            with self._lock:
+                entries = list(self._entries.items())
+            for key, (text, _) in entries:
+                yield key, text
+            return
+        for key, text in self._db.execute("SELECT file_hash, text FROM parsed_resumes"):
+            yield key, zlib.decompress(text).decode("utf-8")
+
+    def stats(self):
+        return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,327 @@
+import importlib.util
+import io
+import multiprocessing
+import os
+import re
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from docx_text import iter_docx_lines
+from metrics import record_size, trace
+
+# Bump when extracted text changes (e.g. DOCX tables/headers/text boxes in v2, PDF page furniture in v3)
+# so cached text is re-parsed
+PARSER_VERSION = "3"
+
+# ✅ Extraction limits and parallelism (overridable from the environment)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+DOCX_PARAGRAPHS_PER_CHUNK = int(os.getenv("DOCX_PARAGRAPHS_PER_CHUNK", "20"))
+
+# ✅ PDF page furniture: lines repeated at the same place at the top or bottom of most pages (running
+# headers, footers, page numbers). Only the first/last PAGE_EDGE_LINES lines of a page are candidates,
+# removed from the edge inwards, and the decision is made from the first FURNITURE_SAMPLE_PAGES pages
+# so extraction still streams.
+PAGE_EDGE_LINES = 2
+FURNITURE_SAMPLE_PAGES = 5
+TRAILING_NUMBER_PATTERN = re.compile(r"\d+$")
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$|^-\s*\d+\s*-$", re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# A PDF backend knows how to count pages and extract a [start, stop) page range
+PdfBackend = namedtuple("PdfBackend", ["name", "page_count", "extract_pages"])
+
+PDF_BACKENDS = {}
+
+
+def register_pdf_backend(name, page_count, extract_pages):
+    PDF_BACKENDS[name] = PdfBackend(name, page_count, extract_pages)
+
+
+# 📌 pdfplumber backend (always available, slowest)
+def _pdfplumber_page_count(data):
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def _pdfplumber_extract_pages(data, start, stop):
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+register_pdf_backend("pdfplumber", _pdfplumber_page_count, _pdfplumber_extract_pages)
+
+# Optional backends are registered when installed but only imported on first use
+def _installed(module):
+    return importlib.util.find_spec(module) is not None
+
+
+# 📌 PyMuPDF backend (optional)
+if _installed("fitz"):
+    def _pymupdf_page_count(data):
+        import fitz
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            return pdf.page_count
+
+    def _pymupdf_extract_pages(data, start, stop):
+        import fitz
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            return [pdf[index].get_text() for index in range(start, min(stop, pdf.page_count))]
+
+    register_pdf_backend("pymupdf", _pymupdf_page_count, _pymupdf_extract_pages)
+
+# 📌 pypdfium2 backend (optional, fastest)
+if _installed("pypdfium2"):
+    def _pdfium_page_count(data):
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def _pdfium_extract_pages(data, start, stop):
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(data)
+        try:
+            pages = []
+            for index in range(start, min(stop, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+
+    register_pdf_backend("pypdfium2", _pdfium_page_count, _pdfium_extract_pages)
+
+# Fastest first; pdfplumber is the fallback
+BACKEND_PREFERENCE = ["pypdfium2", "pymupdf", "pdfplumber"]
+
+
+def get_pdf_backend(name=None):
+    name = name or PDF_BACKEND
+    if name == "auto":
+        return next(PDF_BACKENDS[candidate] for candidate in BACKEND_PREFERENCE if candidate in PDF_BACKENDS)
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"PDF backend '{name}' is not available. Installed: {', '.join(PDF_BACKENDS)}")
+    return PDF_BACKENDS[name]
+
+
+_pdf_pool = None
+
+
+def _get_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn keeps workers independent of the Streamlit server's threads
+        _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pdf_pool
+
+
+def _extract_page_range(backend_name, data, start, stop):
+    return PDF_BACKENDS[backend_name].extract_pages(data, start, stop)
+
+
+def _read_bytes(file):
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def _limit_chunks(chunks, max_chars):
+    # Yield non-empty chunks until their newline-joined length reaches max_chars
+    total = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        separator = 1 if total else 0
+        if max_chars and total + separator + len(chunk) >= max_chars:
+            remaining = max_chars - total - separator
+            if remaining > 0:
+                yield chunk[:remaining]
+            return
+        total += separator + len(chunk)
+        yield chunk
+
+
+# 📌 Yield page texts in order with one backend, stopping at the page limit
+def iter_pdf_pages(data, backend, max_pages=PDF_MAX_PAGES):
+    page_count = backend.page_count(data)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    record_size("pages", page_count)
+    ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count)) for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+
+    if page_count < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+        for start, stop in ranges:
+            yield from backend.extract_pages(data, start, stop)
+        return
+
+    # Large documents: extract page ranges in a process pool, yielding them in order
+    pool = _get_pdf_pool()
+    futures = [pool.submit(_extract_page_range, backend.name, data, start, stop) for start, stop in ranges]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Stopping early (character limit, closed stream) drops the remaining work
+        for future in futures:
+            future.cancel()
+
+
+# 📌 Function to Stream Text from PDF page by page
+def iter_text_from_pdf(pdf_file, backend=None, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    data = _read_bytes(pdf_file)
+    selected = get_pdf_backend(backend)
+    pages = iter_pdf_pages(data, selected, max_pages)
+    try:
+        first = next(pages, None)
+    except Exception:
+        if selected.name == "pdfplumber":
+            raise
+        # Fast backends can choke on unusual files; pdfplumber is the safety net
+        pages = iter_pdf_pages(data, PDF_BACKENDS["pdfplumber"], max_pages)
+        first = next(pages, None)
+    if first is None:
+        return
+    yield from _limit_chunks(_without_page_furniture(_prepend(first, pages)), max_chars)
+
+
+def _edge_key(line, page_number):
+    line = line.strip()
+    # A bare number is a page number only if it is this page's number (a year such as "2019" is not)
+    if PAGE_NUMBER_PATTERN.match(line):
+        # "3", "Page 3", "3 / 4" and "- 3 -" are all the same furniture
+        return "#page" if int(DIGITS_PATTERN.search(line).group()) == page_number else line
+    # Mask a trailing number so "Jane Doe - Page 2" and "Jane Doe - Page 3" count as the same line
+    return TRAILING_NUMBER_PATTERN.sub("#", line)
+
+
+def _edge_indexes(lines):
+    # Line indexes counted from each edge: the top line first, and the bottom line first
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    return filled[:PAGE_EDGE_LINES], filled[::-1][:PAGE_EDGE_LINES]
+
+
+def _edge_keys(lines, indexes, page_number):
+    # Keys carry their distance from the edge, so a line only matches the same place on other pages
+    return [(offset, _edge_key(lines[index], page_number)) for offset, index in enumerate(indexes)]
+
+
+# 📌 Function to Find the (top, bottom) edge lines repeated on most pages; needs at least two pages
+def find_page_furniture(pages):
+    if len(pages) < 2:
+        return set(), set()
+    top, bottom = Counter(), Counter()
+    for page_number, page in enumerate(pages, 1):
+        lines = page.split("\n")
+        head, tail = _edge_indexes(lines)
+        top.update(set(_edge_keys(lines, head, page_number)))
+        bottom.update(set(_edge_keys(lines, tail, page_number)))
+    threshold = len(pages) // 2 + 1
+    return (
+        {key for key, count in top.items() if count >= threshold},
+        {key for key, count in bottom.items() if count >= threshold},
+    )
+
+
+def _furniture_run(lines, indexes, page_number, furniture):
+    # Furniture is peeled off from the edge: a repeated line further in is content
+    dropped = set()
+    for index, key in zip(indexes, _edge_keys(lines, indexes, page_number)):
+        if key not in furniture:
+            break
+        dropped.add(index)
+    return dropped
+
+
+# 📌 Function to Drop furniture lines from one page, only where they sit: at its top or bottom edge
+def strip_page_furniture(page, page_number, furniture):
+    top, bottom = furniture
+    if not top and not bottom:
+        return page
+    lines = page.split("\n")
+    head, tail = _edge_indexes(lines)
+    dropped = _furniture_run(lines, head, page_number, top) | _furniture_run(lines, tail, page_number, bottom)
+    return "\n".join(line for index, line in enumerate(lines) if index not in dropped)
+
+
+def _without_page_furniture(pages):
+    sample = list(islice(pages, FURNITURE_SAMPLE_PAGES))
+    furniture = find_page_furniture(sample)
+    for page_number, page in enumerate(chain(sample, pages), 1):
+        yield strip_page_furniture(page, page_number, furniture)
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+# 📌 Function to Extract Text from PDF
+def extract_text_from_pdf(pdf_file, backend=None, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    try:
+        return '\n'.join(iter_text_from_pdf(pdf_file, backend, max_pages, max_chars))
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
+
+
+# 📌 Function to Stream Text from DOCX in groups of paragraphs
+# Headers, footers, table cells and text boxes are included (see docx_text.iter_docx_lines)
+def iter_text_from_docx(docx_file, paragraphs_per_chunk=DOCX_PARAGRAPHS_PER_CHUNK):
+    chunk = []
+    for line in iter_docx_lines(docx_file):
+        chunk.append(line)
+        if len(chunk) >= paragraphs_per_chunk:
+            yield '\n'.join(chunk)
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk)
+
+
+# 📌 Function to Extract Text from DOCX
+def extract_text_from_docx(docx_file):
+    try:
+        return '\n'.join(iter_text_from_docx(docx_file))
+    except Exception as e:
+        return f"Error reading DOCX: {str(e)}"
+
+
+# 📌 Function to Stream Resume text chunks; chunks joined with newlines give parse_resume's text
+def iter_resume_text(uploaded_file):
+    file_extension = uploaded_file.name.split(".")[-1].lower()
+    if file_extension == "pdf":
+        return iter_text_from_pdf(uploaded_file)
+    elif file_extension == "docx":
+        return iter_text_from_docx(uploaded_file)
+    return iter(())
+
+
+# 📌 Function to Parse Resume
+def parse_resume(uploaded_file):
+    with trace("parse_resume") as span:
+        file_extension = uploaded_file.name.split(".")[-1].lower()
+        if file_extension == "pdf":
+            resume_text = extract_text_from_pdf(uploaded_file)
+        elif file_extension == "docx":
+            resume_text = extract_text_from_docx(uploaded_file)
+        else:
+            span.fail()
+            return None, None
+        span.size("characters", len(resume_text))
+        if resume_text.startswith(("Error reading PDF", "Error reading DOCX")):
+            span.fail()
+        return resume_text, file_extension
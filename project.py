@@ -1,18 +1,40 @@
 import streamlit as st
 import os
-import google.generativeai as genai
-import pandas as pd
-import docx
-from docx import Document
-from docx.shared import Pt, RGBColor
-import pdfplumber
-import spacy
 import io
-import re
 import time
+import uuid
+import zipfile
 from datetime import datetime
 from dotenv import load_dotenv
 
+# ✅ Load .env before the app modules read their settings from the environment
+load_dotenv()
+
+from ai_analysis import cached_analysis
+from analysis import IncrementalAnalysis, analyze_resume
+from ats_rules import ruleset_profiles
+from batch import (
+    ArchiveTooLarge, add_job_match, iter_uploaded_sources, mark_duplicate, rescore_results, results_to_dataframe, screen_resumes
+)
+from core import (
+    DOCX_TEMPLATES, GEMINI_MODEL, IMPROVED_RESUME_MARKER, ai_resume_improvement_gemini, calculate_ats_score,
+    extract_improved_resume, gemini_error_message, get_analysis_store, get_blob_store, get_llm_cache, parse_resume,
+    save_screening_row, save_to_store, split_improved_resume_stream, text_to_docx
+)
+from dedup import DuplicateIndex, changed_lines, minhash_signature
+from docx_templates import export_all_templates, export_docx_zip, shortlist_entry_name, template_description
+from entities import extract_entities
+from gemini_client import configure_gemini
+from matching import ResumeIndex
+from metrics import InterleavedSpan, registry as metrics_registry, start_metrics_server
+from nlp_pipeline import get_nlp, warm_up as warm_up_nlp
+from parse_cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, ParseCache, file_hash
+from parsing import PARSER_VERSION, iter_resume_text
+from prompting import build_analysis_prompts
+from semantic_index import SemanticIndex
+from skills import COMMON_SKILLS
+from store import LIBRARY_RETENTION_DAYS
+
 # ✅ Ensure Streamlit Page Config is FIRST
 st.set_page_config(
     page_title="AI Resume Analyzer", 
@@ -69,7 +91,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ✅ Load API Key from .env
-load_dotenv()
 GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # ✅ Verify API Key
@@ -78,299 +99,149 @@ if not GEMINI_API_KEY:
     st.stop()
 
 # ✅ Configure Google Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
+configure_gemini(GEMINI_API_KEY)
+
+# ✅ Library scope: "session" shows each session only its own uploads; "shared" shows everyone's (single-user setups)
+LIBRARY_SCOPE = os.getenv("LIBRARY_SCOPE", "session")
 
-# ✅ Load NLP Model
+# ✅ Prometheus metrics on METRICS_PORT (e.g. 9100) for the whole app process; off unless set
 @st.cache_resource
-def load_nlp_model():
+def start_metrics_endpoint():
+    port = os.getenv("METRICS_PORT")
+    return start_metrics_server(int(port)) if port else None
+
+start_metrics_endpoint()
+
+# ✅ Load NLP Model in the background while the page renders (tokenizer-only; see NLP_WARM_UP)
+@st.cache_resource
+def start_nlp_warm_up():
+    return warm_up_nlp(("tokenizer",))
+
+start_nlp_warm_up()
+
+# 📌 Function to Make sure the NLP model is loaded before the first analysis (waits for the warm-up)
+def require_nlp_model(profile="tokenizer"):
     try:
-        return spacy.load("en_core_web_sm")
+        return get_nlp(profile)
     except Exception as e:
         st.error("⚠ SpaCy model 'en_core_web_sm' is missing. Run: `python -m spacy download en_core_web_sm`")
-        return None
+        st.stop()
 
-nlp = load_nlp_model()
-if not nlp:
-    st.stop()
+# ✅ Parse cache shared by every session (memory LRU + optional SQLite tier)
+@st.cache_resource
+def get_parse_cache():
+    return ParseCache(
+        max_entries=int(os.getenv("PARSE_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        max_bytes=int(os.getenv("PARSE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        disk_path=os.getenv("PARSE_CACHE_PATH"),
+        parser_version=PARSER_VERSION
+    )
 
-# 📌 Function to Extract Text from PDF
-def extract_text_from_pdf(pdf_file):
-    try:
-        with pdfplumber.open(pdf_file) as pdf:
-            text = '\n'.join([page.extract_text() for page in pdf.pages if page.extract_text()])
-        return text
-    except Exception as e:
-        return f"Error reading PDF: {str(e)}"
+# 📌 Function to Parse Resume, reusing earlier results for identical file bytes
+def parse_resume_cached(uploaded_file, file_key=None):
+    cache = get_parse_cache()
+    file_key = file_key or file_hash(uploaded_file.getvalue())
+    cached = cache.get(file_key)
+    if cached:
+        return cached
 
-# 📌 Function to Extract Text from DOCX
-def extract_text_from_docx(docx_file):
-    try:
-        doc = docx.Document(docx_file)
-        return '\n'.join([para.text for para in doc.paragraphs])
-    except Exception as e:
-        return f"Error reading DOCX: {str(e)}"
+    resume_text, file_extension = parse_resume(uploaded_file)
+    # Only successful extractions are cached; errors are retried on the next upload
+    if resume_text is not None and not resume_text.startswith(("Error reading PDF", "Error reading DOCX")):
+        cache.put(file_key, resume_text, file_extension)
+    return resume_text, file_extension
 
-# 📌 Function to Parse Resume
-def parse_resume(uploaded_file):
-    file_extension = uploaded_file.name.split(".")[-1].lower()
-    if file_extension == "pdf":
-        return extract_text_from_pdf(uploaded_file), file_extension
-    elif file_extension == "docx":
-        return extract_text_from_docx(uploaded_file), file_extension
-    else:
-        return None, None
+# 📌 Function to Parse and analyze a resume chunk by chunk, reporting partial results
+def parse_resume_streaming(uploaded_file, file_key, on_progress=None):
+    cache = get_parse_cache()
+    cached = cache.get(file_key)
+    if cached:
+        return cached[0], cached[1], analyze_resume(cached[0])
 
-# 📌 Function to Extract Skills using NLP
-def extract_skills(text):
-    doc = nlp(text.lower())
-    skills = set()
-    
-    # Enhanced common skills list
-    common_skills = [
-        "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "swift", "kotlin", "go", "rust",
-        "sql", "mysql", "postgresql", "mongodb", "oracle", "nosql", "firebase",
-        "machine learning", "deep learning", "natural language processing", "nlp", "computer vision",
-        "react", "angular", "vue", "node.js", "express", "django", "flask", "spring", "laravel",
-        "docker", "kubernetes", "aws", "azure", "gcp", "cloud computing", "devops", "cicd",
-        "linux", "unix", "bash", "powershell", "git", "github", "gitlab", "bitbucket",
-        "excel", "power bi", "tableau", "data analysis", "data visualization", "statistics", "r",
-        "leadership", "communication", "project management", "agile", "scrum", "kanban",
-        "html", "css", "sass", "less", "responsive design", "ui/ux", "figma", "sketch",
-        "tensorflow", "pytorch", "keras", "pandas", "numpy", "scikit-learn", "matplotlib",
-        "rest api", "graphql", "oauth", "authentication", "blockchain", "cybersecurity"
-    ]
-    
-    # Extract single word skills
-    for token in doc:
-        if token.text in common_skills:
-            skills.add(token.text)
-    
-    # Extract multi-word skills
-    for skill in common_skills:
-        if len(skill.split()) > 1 and skill.lower() in text.lower():
-            skills.add(skill)
-    
-    return list(skills)
+    file_extension = uploaded_file.name.split(".")[-1].lower()
+    if file_extension not in ("pdf", "docx"):
+        return None, None, analyze_resume("")
 
-# 📌 Function to Get AI-Powered Resume Suggestions from Gemini API
-def ai_resume_improvement_gemini(resume_text, job_description=None):
+    # Reading and analysis are interleaved, so each stage's time is summed separately;
+    # the progress callback (UI rendering) counts towards neither
+    parse_span, skills_span = InterleavedSpan("parse_resume"), InterleavedSpan("extract_skills")
+    incremental = IncrementalAnalysis()
+    chunks = iter_resume_text(uploaded_file)
     try:
-        model = genai.GenerativeModel("gemini-1.5-pro")
-        
-        # Enhanced prompt with job matching if available
-        if job_description:
-            prompt = f"""
-            You are a professional resume consultant. Analyze this resume and provide specific improvements to make it more effective and ATS-friendly. 
-            
-            RESUME:
-            {resume_text}
-            
-            JOB DESCRIPTION:
-            {job_description}
-            
-            Please provide your analysis in the following format:
-            
-            ## Overall Assessment
-            [Provide a brief overall assessment]
-            
-            ## Strengths
-            - [Strength 1]
-            - [Strength 2]
-            - [Strength 3]
-            
-            ## Areas for Improvement
-            - [Area 1]
-            - [Area 2]
-            - [Area 3]
-            
-            ## Specific Suggestions to Match Job Description
-            [Detailed suggestions to better align with the job]
-            
-            ## Improved Resume
-            [Provide a complete, improved version of the resume]
-            """
-        else:
-            prompt = f"""
-            You are a professional resume consultant. Analyze this resume and provide specific improvements to make it more effective and ATS-friendly.
-            
-            RESUME:
-            {resume_text}
-            
-            Please provide your analysis in the following format:
-            
-            ## Overall Assessment
-            [Provide a brief overall assessment]
-            
-            ## Strengths
-            - [Strength 1]
-            - [Strength 2]
-            - [Strength 3]
-            
-            ## Areas for Improvement
-            - [Area 1]
-            - [Area 2]
-            - [Area 3]
-            
-            ## Improved Resume
-            [Provide a complete, improved version of the resume]
-            """
-        
-        response = model.generate_content(prompt)
-        
-        if hasattr(response, 'text'):
-            return response.text
-        else:
-            return "No suggestions available."
-    
-    except Exception as e:
-        return f"Error calling Gemini API: {str(e)}"
+        while True:
+            try:
+                with parse_span.running():
+                    chunk = next(chunks, None)
+            except Exception as e:
+                resume_text = f"Error reading {file_extension.upper()}: {str(e)}"
+                return resume_text, file_extension, analyze_resume(resume_text)
+            if chunk is None:
+                break
+            with skills_span.running():
+                incremental.feed(chunk)
+            if on_progress:
+                on_progress(incremental)
 
-# 📌 Function to Generate ATS Score
-def calculate_ats_score(resume_text):
-    # Initialize base score
-    score = 100
-    
-    # Check for essential sections
-    essential_sections = ['experience', 'education', 'skills', 'summary']
-    missing_sections = []
-    for section in essential_sections:
-        if section not in resume_text.lower():
-            missing_sections.append(section)
-            score -= 10
-    
-    # Check for proper formatting
-    formatting_checks = {
-        'bullet_points': len(re.findall(r'•|\u2022|\d+\.', resume_text)) > 5,
-        'contact_info': bool(re.search(r'\b[\w\.-]+@[\w\.-]+\.\w{2,4}\b', resume_text)),
-        'length': 450 < len(resume_text) < 1500
-    }
-    
-    for check, passed in formatting_checks.items():
-        if not passed:
-            score -= 5
-            
-    # Check for keywords
-    skills = extract_skills(resume_text)
-    if len(skills) < 10:
-        score -= (10 - len(skills)//2)
-        
-    # Ensure score stays within 0-100
-    score = max(0, min(100, score))
-    
-    return {
-        "score": score,
-        "missing_sections": missing_sections,
-        "formatting_issues": [k for k,v in formatting_checks.items() if not v],
-        "skills_found": skills
-    }
+        with skills_span.running():
+            analysis = incremental.finish()
+        parse_span.size("characters", len(analysis.text))
+        skills_span.size("characters", len(analysis.text))
+        skills_span.size("tokens", len(analysis.tokens))
+        skills_span.finish()
+    finally:
+        parse_span.finish()
+        if skills_span.failed:
+            skills_span.finish()
+    cache.put(file_key, analysis.text, file_extension)
+    return analysis.text, file_extension, analysis
 
-# 📌 Function to extract the improved resume section from AI suggestions
-def extract_improved_resume(ai_suggestions):
-    if "## Improved Resume" in ai_suggestions:
-        parts = ai_suggestions.split("## Improved Resume")
-        if len(parts) > 1:
-            return parts[1].strip()
-    return None
-
-# 📌 Function to convert text to DOCX with template styling
-def text_to_docx(text, template_name="Classic"):
-    doc = Document()
-    
-    # Apply template styles
-    if template_name == "Classic":
-        # Classic template styles
-        style = doc.styles['Normal']
-        style.font.name = 'Times New Roman'
-        style.font.size = Pt(12)
-        # Heading 1
-        heading_style = doc.styles['Heading 1']
-        heading_style.font.name = 'Times New Roman'
-        heading_style.font.size = Pt(14)
-        heading_style.font.bold = True
-        # Heading 2
-        heading2_style = doc.styles['Heading 2']
-        heading2_style.font.name = 'Times New Roman'
-        heading2_style.font.size = Pt(12)
-        heading2_style.font.bold = True
-        heading2_style.font.italic = False
-    elif template_name == "Modern":
-        # Modern template styles
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(11)
-        style.paragraph_format.space_after = Pt(8)
-        # Heading 1
-        heading_style = doc.styles['Heading 1']
-        heading_style.font.name = 'Arial'
-        heading_style.font.size = Pt(18)
-        heading_style.font.color.rgb = RGBColor(0x1E, 0x88, 0xE5)  # Blue
-        heading_style.paragraph_format.space_before = Pt(12)
-        heading_style.paragraph_format.space_after = Pt(6)
-        # Heading 2
-        heading2_style = doc.styles['Heading 2']
-        heading2_style.font.name = 'Arial'
-        heading2_style.font.size = Pt(14)
-        heading2_style.font.color.rgb = RGBColor(0x0D, 0x47, 0xA1)  # Darker blue
-        heading2_style.paragraph_format.space_after = Pt(6)
-    elif template_name == "Professional":
-        # Professional template styles
-        style = doc.styles['Normal']
-        style.font.name = 'Calibri'
-        style.font.size = Pt(11)
-        # Heading 1
-        heading_style = doc.styles['Heading 1']
-        heading_style.font.name = 'Calibri'
-        heading_style.font.size = Pt(16)
-        heading_style.font.bold = True
-        heading_style.font.color.rgb = RGBColor(0x2C, 0x3E, 0x50)  # Dark gray-blue
-        # Heading 2
-        heading2_style = doc.styles['Heading 2']
-        heading2_style.font.name = 'Calibri'
-        heading2_style.font.size = Pt(14)
-        heading2_style.font.color.rgb = RGBColor(0x4C, 0xAF, 0x50)  # Green
-    elif template_name == "Minimalist":
-        # Minimalist template styles
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(10)
-        style.paragraph_format.line_spacing = 1.2
-        # Heading 1
-        heading_style = doc.styles['Heading 1']
-        heading_style.font.name = 'Arial'
-        heading_style.font.size = Pt(14)
-        heading_style.font.bold = False
-        heading_style.paragraph_format.space_before = Pt(18)
-        heading_style.paragraph_format.space_after = Pt(6)
-        # Heading 2
-        heading2_style = doc.styles['Heading 2']
-        heading2_style.font.name = 'Arial'
-        heading2_style.font.size = Pt(12)
-        heading2_style.font.italic = True
-    
-    # Process text content
-    paragraphs = text.split('\n\n')
-    
-    for para in paragraphs:
-        if para.strip():
-            if para.strip().startswith('#'):
-                level = len(re.match(r'^#+', para.strip()).group(0))
-                heading_text = para.strip().lstrip('#').strip()
-                doc.add_heading(heading_text, level=level if level <= 9 else 1)
-            else:
-                lines = para.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith(('- ', '* ', '• ')):
-                        doc.add_paragraph(line[2:], style='List Bullet')
-                    elif re.match(r'^\d+\.\s', line):
-                        doc.add_paragraph(re.sub(r'^\d+\.\s*', '', line), style='List Number')
-                    else:
-                        doc.add_paragraph(line)
-    
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+# ✅ Resume index of this session's uploads, keyed by content hash, for ranking against job descriptions
+# Kept per session, so it only holds (and computes IDF over) the resumes this user uploaded
+def get_resume_index():
+    if "resume_index" not in st.session_state:
+        st.session_state.resume_index = ResumeIndex()
+    return st.session_state.resume_index
+
+# 📌 Function to Put each (name, bytes) source in the blob store on its way to the batch workers
+# Two sources can share a name (the same path in two ZIPs, a file uploaded twice); the later one gets its
+# position appended, so every row keeps its own blob
+def stored_sources(sources, blob_keys):
+    for index, (name, data) in enumerate(sources):
+        if name in blob_keys:
+            name = f"{name} ({index + 1})"
+        blob_keys[name] = get_blob_store().put(data)
+        yield name, data
+
+# 📌 Function to Identify this session as the owner of what it saves to the library
+def library_owner():
+    if "library_owner" not in st.session_state:
+        st.session_state.library_owner = uuid.uuid4().hex
+    return st.session_state.library_owner
+
+# 📌 Function to Pick the owner library queries are limited to (None when the library is shared)
+def library_filter():
+    return None if LIBRARY_SCOPE == "shared" else library_owner()
+
+# ✅ Near-duplicate index of this session's uploads, kept in memory only
+# Matches (and the earlier text they are diffed against) never come from another user's uploads
+def get_duplicate_index():
+    if "duplicate_index" not in st.session_state:
+        st.session_state.duplicate_index = DuplicateIndex()
+    return st.session_state.duplicate_index
+
+# ✅ On-disk semantic index of screened resumes
+# st.cache_resource does not cache exceptions, so a failed load is retried on the next call
+@st.cache_resource
+def load_semantic_index():
+    return SemanticIndex()
+
+# 📌 Function to Get the semantic index, or None (with a warning) if no embedding model is available right now
+def get_semantic_index():
+    try:
+        return load_semantic_index()
+    except Exception as e:
+        st.warning(f"⚠ Semantic search is unavailable: {str(e)}")
+        return None
 
 # ✅ Sidebar for app navigation
 with st.sidebar:
@@ -397,12 +268,32 @@ with st.sidebar:
         - Professional templates
         """
     )
+    llm_cache_stats = get_llm_cache().stats()
+    st.caption(f"🧠 AI cache: {llm_cache_stats['hits']} hits · {llm_cache_stats['misses']} misses")
+
+    # 🛠 Debug panel: where the time goes in this process (every session), slowest p95 first
+    if st.checkbox("🛠 Show pipeline metrics", key="show_metrics"):
+        # pandas is imported where a table is drawn rather than at startup, which it would slow down noticeably
+        import pandas as pd
+
+        stage_rows = metrics_registry.stage_summary()
+        if stage_rows:
+            st.dataframe(pd.DataFrame(stage_rows).set_index("stage"), use_container_width=True)
+        else:
+            st.caption("No pipeline calls yet.")
+        cache_rows = metrics_registry.cache_summary()
+        if cache_rows:
+            st.dataframe(pd.DataFrame(cache_rows).set_index("cache"), use_container_width=True)
+        if os.getenv("METRICS_PORT"):
+            st.caption(f"Prometheus: http://localhost:{os.getenv('METRICS_PORT')}/metrics")
 
 # ✅ Main App UI
 st.markdown("<h1 class='main-header'>📄 AI-Powered Resume Analyzer</h1>", unsafe_allow_html=True)
 
 # Create tabs for different sections
-tab1, tab2, tab3 = st.tabs(["📤 Upload & Analyze", "📊 ATS Score", "✨ AI Improvements"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    ["📤 Upload & Analyze", "📊 ATS Score", "✨ AI Improvements", "📦 Bulk Screening", "🗂️ Library"]
+)
 
 with tab1:
     st.markdown("<div class='card'>", unsafe_allow_html=True)
@@ -410,37 +301,99 @@ with tab1:
     uploaded_file = st.file_uploader("📂 Upload Your Resume (PDF/DOCX)", type=["pdf", "docx"])
     
     if uploaded_file:
-        # Store the original file
-        if "original_file" not in st.session_state:
-            file_bytes = uploaded_file.getvalue()
-            st.session_state.original_file = io.BytesIO(file_bytes)
+        file_bytes = uploaded_file.getvalue()
+        file_key = file_hash(file_bytes)
+
+        # Store the original file (the session keeps only its content-addressed key)
+        if st.session_state.get("resume_hash") != file_key:
+            st.session_state.original_blob = get_blob_store().put(file_bytes)
             st.session_state.original_filename = uploaded_file.name
         
-        # Extract Resume Text
-        if "resume_text" not in st.session_state or st.session_state.get("resume_filename") != uploaded_file.name:
+        # Extract Resume Text (keyed by content, so a renamed or replaced file is never stale)
+        if "resume_text" not in st.session_state or st.session_state.get("resume_hash") != file_key:
+            require_nlp_model()
             with st.spinner("📄 Extracting resume content..."):
-                resume_text, file_extension = parse_resume(uploaded_file)
+                # Partial results render while pages/paragraphs are still being read
+                progress_status = st.empty()
+                progress_skills = st.empty()
+
+                def show_progress(partial):
+                    sections = ', '.join(partial.sections) or 'none yet'
+                    progress_status.caption(
+                        f"📄 Read {partial.chunk_count} part(s), {partial.char_count:,} characters · Sections: {sections}"
+                    )
+                    if partial.skills:
+                        progress_skills.markdown(f"🔍 **Skills so far:** {', '.join(partial.skills)}")
+
+                # Analyze once; the ATS tab and AI prompt reuse this result
+                resume_text, file_extension, analysis = parse_resume_streaming(uploaded_file, file_key, show_progress)
+                progress_status.empty()
+                progress_skills.empty()
+
                 st.session_state.resume_text = resume_text
                 st.session_state.file_extension = file_extension
                 st.session_state.resume_filename = uploaded_file.name
-                
-                # Extract Skills
-                st.session_state.skills = extract_skills(resume_text) if resume_text else []
+                st.session_state.resume_hash = file_key
+                st.session_state.analysis = analysis
+                st.session_state.duplicate_of = None
+                parsed_ok = resume_text and not resume_text.startswith(("Error reading PDF", "Error reading DOCX"))
+                if parsed_ok:
+                    get_resume_index().add(analysis.content_hash, analysis.text, analysis.skills)
+                    save_to_store(analysis, uploaded_file.name, file_extension, st.session_state.original_blob,
+                                  owner=library_owner())
                 
                 # Reset AI suggestions when a new file is uploaded
                 if "ai_suggestions" in st.session_state:
                     del st.session_state.ai_suggestions
                 if "improved_resume" in st.session_state:
                     del st.session_state.improved_resume
+                st.session_state.suggestions_from = None
+
+                # ...but bring them straight back if this resume was analyzed before
+                previous_suggestions = (cached_analysis(get_llm_cache(), GEMINI_MODEL, analysis.text)
+                                        or get_analysis_store().get_ai_output(analysis.content_hash, GEMINI_MODEL))
+                if previous_suggestions:
+                    st.session_state.ai_suggestions = previous_suggestions
+                    improved_resume = extract_improved_resume(previous_suggestions)
+                    if improved_resume:
+                        st.session_state.improved_resume = improved_resume
+
+                # A lightly edited version of an earlier upload shows that version's AI analysis, marked as such;
+                # its improved resume is not offered, since it is missing this version's changes
+                if parsed_ok:
+                    signature = minhash_signature(analysis.text)
+                    duplicate_index = get_duplicate_index()
+                    duplicate = duplicate_index.find(signature, exclude=analysis.content_hash)
+                    if duplicate:
+                        earlier_text = duplicate_index.text(duplicate.resume_id) or ""
+                        st.session_state.duplicate_of = (duplicate, changed_lines(earlier_text, analysis.text))
+                        earlier_suggestions = cached_analysis(get_llm_cache(), GEMINI_MODEL, earlier_text)
+                        if earlier_suggestions and not previous_suggestions:
+                            st.session_state.ai_suggestions = earlier_suggestions
+                            st.session_state.suggestions_from = duplicate.label
+                    duplicate_index.add(analysis.content_hash, signature, label=uploaded_file.name, text=analysis.text)
                 
             st.success("✅ Resume uploaded successfully!")
+
+        # Near-duplicate notice, with what changed since the earlier version
+        if st.session_state.get("duplicate_of"):
+            duplicate, (added_lines, removed_lines) = st.session_state.duplicate_of
+            reused = " — its AI suggestions are shown in the AI Improvements tab" if st.session_state.get("suggestions_from") else ""
+            st.info(f"♻️ This resume is {duplicate.similarity:.0%} similar to **{duplicate.label}**, uploaded earlier{reused}. "
+                    "Run the AI analysis again to refresh them for this version.")
+            if added_lines or removed_lines:
+                with st.expander(f"🔀 {len(added_lines)} line(s) added, {len(removed_lines)} removed since {duplicate.label}"):
+                    for line in added_lines:
+                        st.markdown(f"➕ {line}")
+                    for line in removed_lines:
+                        st.markdown(f"➖ {line}")
         
         # Display extracted text
         st.markdown("<h2 class='subheader'>📄 Resume Content</h2>", unsafe_allow_html=True)
         st.text_area("Resume Text", st.session_state.resume_text, height=250)
         
         # Display skills
-        skills = st.session_state.skills
+        skills = st.session_state.analysis.skills
         if skills:
             st.markdown("<h2 class='subheader'>🔍 Extracted Skills</h2>", unsafe_allow_html=True)
             
@@ -450,15 +403,84 @@ with tab1:
                 col_idx = i % 3
                 cols[col_idx].markdown(f"<div class='skill-tag'>{skill}</div>", unsafe_allow_html=True)
         
+        # Structured candidate details (contact, positions, tenure, degrees)
+        if "entities" not in st.session_state or st.session_state.get("entities_hash") != st.session_state.analysis.content_hash:
+            st.session_state.entities = extract_entities(st.session_state.analysis)
+            st.session_state.entities_hash = st.session_state.analysis.content_hash
+        entities = st.session_state.entities
+        if entities.emails or entities.phones or entities.positions or entities.degrees:
+            st.markdown("<h2 class='subheader'>👤 Candidate Details</h2>", unsafe_allow_html=True)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Experience", f"{entities.years_of_experience:g} yrs")
+            col2.metric("Positions", len(entities.positions))
+            col3.metric("Highest Degree", (entities.highest_degree or "—").title())
+            contact = entities.emails + entities.phones + entities.links
+            if contact:
+                st.markdown(f"**Contact:** {' · '.join(contact)}")
+            if entities.positions:
+                import pandas as pd
+
+                st.dataframe(pd.DataFrame(entities.positions, columns=["title", "employer", "start", "end", "months"]),
+                             use_container_width=True, hide_index=True)
+
+        # Optional job description: scores the resume against it and tailors the AI suggestions
+        job_description = st.text_area("🎯 Job Description (optional)", height=150, key="job_description").strip() or None
+        if job_description and st.session_state.analysis.content_hash in get_resume_index():
+            job_match = get_resume_index().rank(job_description, ids=[st.session_state.analysis.content_hash])[0]
+            st.markdown("<h2 class='subheader'>🎯 Job Match</h2>", unsafe_allow_html=True)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Match Score", f"{job_match.score}%")
+            col2.metric("Skill Overlap", f"{job_match.skill_overlap}%")
+            col3.metric("Keyword Similarity", f"{job_match.similarity}%")
+            if job_match.matched_skills:
+                st.markdown(f"**Matched Skills:** {', '.join(job_match.matched_skills)}")
+            if job_match.missing_skills:
+                st.markdown(f"**Missing Skills:** {', '.join(job_match.missing_skills)}")
+
         # AI Analysis button
         if st.button("🚀 Analyze Resume with AI", type="primary", use_container_width=True):
-            with st.spinner("🤖 AI is analyzing your resume... This may take a moment..."):
-                # Add a small delay to make the spinner visible
-                time.sleep(1)
-                
-                # Get AI suggestions
-                ai_suggestions = ai_resume_improvement_gemini(st.session_state.resume_text)
+            # Render the response live: the assessment shows as soon as it starts arriving,
+            # the rewritten resume streams into its own area once the marker is seen
+            live_assessment = st.empty()
+            live_improved = st.empty()
+            assessment_text = ""
+            improved_text = ""
+            error_message = None
+
+            # Report the size of the (compacted) prompt that is about to be sent
+            _, prompt_report = build_analysis_prompts(st.session_state.analysis.text, job_description)
+            trimmed = f" · trimmed: {', '.join(prompt_report.removed_sections)}" if prompt_report.removed_sections else ""
+            st.caption(
+                f"🧮 Prompt: ~{prompt_report.prompt_tokens:,} tokens "
+                f"(resume {prompt_report.resume_tokens:,} of {prompt_report.original_resume_tokens:,}){trimmed}"
+            )
+
+            with st.spinner("🤖 AI is analyzing your resume..."):
+                try:
+                    ai_chunks = ai_resume_improvement_gemini(st.session_state.analysis.text, job_description, stream=True)
+                    for part, text in split_improved_resume_stream(ai_chunks):
+                        if part == "assessment":
+                            assessment_text += text
+                            live_assessment.markdown(assessment_text)
+                        else:
+                            improved_text += text
+                            live_improved.markdown(improved_text)
+                except Exception as e:
+                    error_message = gemini_error_message(e)
+
+            live_assessment.empty()
+            live_improved.empty()
+            ai_suggestions = assessment_text + (IMPROVED_RESUME_MARKER + improved_text if improved_text else "")
+
+            # API failures (quota, timeouts) are shown as errors, not as suggestions
+            if error_message:
+                st.error(f"🚨 {error_message}")
+            else:
                 st.session_state.ai_suggestions = ai_suggestions
+                st.session_state.suggestions_from = None
+                get_analysis_store().save_ai_output(
+                    st.session_state.analysis.content_hash, GEMINI_MODEL, ai_suggestions, job_description
+                )
                 
                 # Extract the improved resume part
                 improved_resume = extract_improved_resume(ai_suggestions)
@@ -478,15 +500,17 @@ with tab2:
     ats_file = st.file_uploader("📄 Upload Resume for ATS Analysis", 
                                type=["pdf", "docx"],
                                key="ats_upload")
+    scoring_profiles = {None: "General", **ruleset_profiles()}
+    ats_profile = st.selectbox("🎯 Scoring profile", list(scoring_profiles), format_func=scoring_profiles.get, key="ats_profile")
     
     if ats_file:
         with st.spinner("🔍 Analyzing ATS Compatibility..."):
             # Parse resume
-            resume_text, _ = parse_resume(ats_file)
+            resume_text, _ = parse_resume_cached(ats_file)
             
             if resume_text:
-                # Calculate ATS score
-                ats_result = calculate_ats_score(resume_text)
+                # Calculate ATS score (reuses the upload tab's analysis for the same text)
+                ats_result = calculate_ats_score(analyze_resume(resume_text), ats_profile)
                 st.session_state.ats_result = ats_result
                 
                 # Display results
@@ -532,21 +556,31 @@ with tab2:
                 # Detailed analysis
                 st.markdown("#### 🔍 Detailed Analysis")
                 
+                # Sections detected from their headings
+                if ats_result["sections_found"]:
+                    st.markdown(f"**Sections Found:** {', '.join(section.title() for section in ats_result['sections_found'])}")
+
                 # Missing sections
                 if ats_result["missing_sections"]:
                     st.markdown(f"**Missing Sections:** {', '.join(ats_result['missing_sections'])}")
                 
                 # Formatting issues
                 if ats_result["formatting_issues"]:
-                    issues = {
-                        'bullet_points': 'Insufficient bullet points',
-                        'contact_info': 'Missing contact information',
-                        'length': 'Resume length not optimal'
-                    }
+                    issues = {outcome.rule_id: outcome.label for outcome in ats_result["breakdown"]}
                     st.markdown("**Formatting Issues:**")
                     for issue in ats_result["formatting_issues"]:
                         st.markdown(f"- {issues.get(issue, issue)}")
                 
+                # Per-rule breakdown of the score
+                with st.expander("🧮 Score breakdown"):
+                    import pandas as pd
+
+                    st.dataframe(pd.DataFrame(
+                        [(outcome.label, outcome.category, "✅" if outcome.passed else "❌", -outcome.penalty)
+                         for outcome in ats_result["breakdown"]],
+                        columns=["rule", "category", "passed", "points"]
+                    ), use_container_width=True, hide_index=True)
+
                 # Skills found
                 st.markdown("#### ✅ Identified Skills")
                 cols = st.columns(3)
@@ -564,6 +598,10 @@ with tab3:
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.markdown("<h2 class='subheader'>✨ AI Improvement Suggestions</h2>", unsafe_allow_html=True)
             
+            if st.session_state.get("suggestions_from"):
+                st.info(f"♻️ These suggestions were made for **{st.session_state.suggestions_from}**, an earlier version "
+                        "of this resume. Run the AI analysis again to get an improved resume for this version.")
+
             # Display AI suggestions in a clean format
             st.markdown(st.session_state.ai_suggestions)
             
@@ -575,20 +613,12 @@ with tab3:
                 st.markdown("#### 🎨 Choose a Template")
                 selected_template = st.selectbox(
                     "Select a template for your resume:",
-                    ["Classic", "Modern", "Professional", "Minimalist"],
+                    DOCX_TEMPLATES,
                     index=1,
                     key="template_select"
                 )
                 
-                # Template descriptions
-                if selected_template == "Classic":
-                    st.caption("Traditional format with Times New Roman font, suitable for conservative industries.")
-                elif selected_template == "Modern":
-                    st.caption("Clean design with Arial font and blue accents, ideal for tech and creative roles.")
-                elif selected_template == "Professional":
-                    st.caption("Balanced layout with Calibri font, perfect for corporate environments.")
-                elif selected_template == "Minimalist":
-                    st.caption("Simple and elegant with Arial, focusing on content clarity.")
+                st.caption(template_description(selected_template))
                 
                 # Show before/after comparison
                 col1, col2 = st.columns(2)
@@ -619,9 +649,20 @@ with tab3:
                         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                         use_container_width=True
                     )
+
+                # Every template at once, rendered concurrently into one ZIP
+                if st.button("📦 Download in All Templates (ZIP)", use_container_width=True):
+                    filename = os.path.splitext(st.session_state.original_filename)[0]
+                    st.download_button(
+                        label="📥 Download All Templates (ZIP)",
+                        data=export_all_templates(st.session_state.improved_resume, f"{filename}_improved"),
+                        file_name=f"{filename}_improved_all_templates.zip",
+                        mime="application/zip",
+                        use_container_width=True
+                    )
             
             # Download original resume button
-            if st.session_state.file_extension:
+            if st.session_state.file_extension and st.session_state.original_blob in get_blob_store():
                 mime_types = {
                     "pdf": "application/pdf",
                     "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -631,7 +672,7 @@ with tab3:
                 
                 st.download_button(
                     label=f"📥 Download Original Resume ({st.session_state.file_extension.upper()})",
-                    data=st.session_state.original_file,
+                    data=get_blob_store().get(st.session_state.original_blob),
                     file_name=st.session_state.original_filename,
                     mime=mime_type
                 )
@@ -642,6 +683,204 @@ with tab3:
     else:
         st.info("📄 Upload your resume first to get AI-powered improvement suggestions.")
 
+with tab4:
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<h2 class='subheader'>📦 Bulk Resume Screening</h2>", unsafe_allow_html=True)
+
+    bulk_files = st.file_uploader("📂 Upload a ZIP of resumes or several PDF/DOCX files",
+                                  type=["zip", "pdf", "docx"],
+                                  accept_multiple_files=True,
+                                  key="bulk_upload")
+    bulk_job_description = st.text_area("🎯 Job Description to rank candidates against (optional)",
+                                        height=150, key="bulk_job_description").strip()
+
+    bulk_sources = None
+    if bulk_files and st.button("🚀 Screen Resumes", type="primary", use_container_width=True):
+        # Uploads are already in memory; reading them up front rejects an oversized batch before any screening
+        try:
+            bulk_sources = list(iter_uploaded_sources(bulk_files))
+        except ArchiveTooLarge as e:
+            st.error(f"❌ Upload too large: {e}")
+        except zipfile.BadZipFile:
+            st.error("❌ One of the uploads is not a valid ZIP archive")
+
+    if bulk_sources is not None:
+        require_nlp_model()
+        rows = []
+        progress_status = st.empty()
+        live_table = st.empty()
+        started = time.perf_counter()
+
+        # Results stream in from the worker pool; refresh the table every few documents
+        resume_index = get_resume_index()
+        semantic_index = get_semantic_index()
+        duplicates = DuplicateIndex()
+        bulk_features = {}
+        blob_keys = {}
+        for row in screen_resumes(stored_sources(bulk_sources, blob_keys)):
+            if row.get("features"):
+                bulk_features[row["content_hash"]] = row.pop("features")
+            rows.append(mark_duplicate(row, duplicates))
+            if row.get("text"):
+                resume_text = row.pop("text")
+                resume_index.add(row["content_hash"], resume_text, row["skills"].split(", ") if row["skills"] else [])
+                # Near-duplicates are not embedded again; the earlier version already represents them
+                if semantic_index is not None and not row["duplicate_of"]:
+                    semantic_index.add(row["content_hash"], resume_text, label=row["file"])
+                save_screening_row(row, resume_text, blob_keys.get(row["file"]), owner=library_owner())
+            elapsed = time.perf_counter() - started
+            progress_status.caption(f"📄 Screened {len(rows)} resume(s) · {len(rows) / elapsed:.1f} docs/s")
+            if len(rows) % 5 == 1:
+                live_table.dataframe(results_to_dataframe(rows), use_container_width=True)
+
+        elapsed = time.perf_counter() - started
+        progress_status.empty()
+        live_table.empty()
+        st.session_state.bulk_results = results_to_dataframe(rows)
+        st.session_state.bulk_features = bulk_features
+        st.session_state.bulk_throughput = (len(rows), elapsed)
+
+    if "bulk_results" in st.session_state:
+        bulk_results = st.session_state.bulk_results
+        # Re-scoring with another profile runs the compiled rules on saved features; nothing is re-parsed
+        bulk_profiles = {None: "General", **ruleset_profiles()}
+        bulk_profile = st.selectbox("🎯 Scoring profile", list(bulk_profiles), format_func=bulk_profiles.get, key="bulk_profile")
+        if bulk_profile:
+            bulk_results = rescore_results(bulk_results, st.session_state.bulk_features, bulk_profile)
+        duplicate_count = int(bulk_results["duplicate_of"].notna().sum())
+        if duplicate_count and st.checkbox(f"Hide {duplicate_count} near-duplicate resume(s)", value=True, key="hide_duplicates"):
+            bulk_results = bulk_results[bulk_results["duplicate_of"].isna()].reset_index(drop=True)
+        # Filters are lookups on the extracted fields; nothing is re-parsed
+        min_years = st.number_input("Minimum years of experience", min_value=0.0, value=0.0, step=1.0, key="bulk_min_years")
+        if min_years:
+            bulk_results = bulk_results[bulk_results["years_experience"].fillna(0) >= min_years].reset_index(drop=True)
+        # Ranking is vectorized over the shared index, so changing the job description re-ranks instantly
+        if bulk_job_description:
+            bulk_results = add_job_match(bulk_results, get_resume_index(), bulk_job_description)
+        documents, elapsed = st.session_state.bulk_throughput
+        st.success(f"✅ Screened {documents} resume(s) in {elapsed:.1f}s ({documents / elapsed if elapsed else 0:.1f} docs/s)")
+        st.dataframe(bulk_results, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download Results (CSV)",
+                data=bulk_results.to_csv(index=False).encode("utf-8"),
+                file_name="screening_results.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+        with col2:
+            try:
+                parquet_buffer = io.BytesIO()
+                bulk_results.to_parquet(parquet_buffer, index=False)
+                st.download_button(
+                    label="📥 Download Results (Parquet)",
+                    data=parquet_buffer.getvalue(),
+                    file_name="screening_results.parquet",
+                    mime="application/octet-stream",
+                    use_container_width=True
+                )
+            except ImportError:
+                st.caption("Install pyarrow to export Parquet.")
+
+    # Semantic search over the resumes screened so far (in session scope, only this session's)
+    semantic_index = get_semantic_index()
+    owner = library_filter()
+    searchable, searchable_count = None, len(semantic_index) if semantic_index is not None else 0
+    if searchable_count and owner is not None:
+        searchable = [resume_id for resume_id in get_analysis_store().owned_resume_ids(owner) if resume_id in semantic_index]
+        searchable_count = len(searchable)
+    if searchable_count:
+        st.markdown("<h2 class='subheader'>🔎 Semantic Search</h2>", unsafe_allow_html=True)
+        semantic_query = st.text_input(f"Search {searchable_count} screened resume(s) by meaning",
+                                       placeholder="e.g. backend engineer with payments experience",
+                                       key="semantic_query")
+        if semantic_query:
+            started = time.perf_counter()
+            matches = semantic_index.search(semantic_query, top_k=10, resume_ids=searchable)
+            st.caption(f"⚡ {(time.perf_counter() - started) * 1000:.0f} ms")
+            import pandas as pd
+
+            st.dataframe(pd.DataFrame(
+                [(match.label, match.score, match.section, match.preview) for match in matches],
+                columns=["file", "similarity", "best section", "excerpt"]
+            ), use_container_width=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with tab5:
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<h2 class='subheader'>🗂️ Resume Library</h2>", unsafe_allow_html=True)
+    retention = f" for {LIBRARY_RETENTION_DAYS:g} days" if LIBRARY_RETENTION_DAYS else ""
+    kept_for = "everyone's analyzed resumes" if LIBRARY_SCOPE == "shared" else "the resumes analyzed in this session"
+    st.caption(f"The library keeps {kept_for}{retention}. Search the full text or filter by skill, score and upload date.")
+
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    library_query = col1.text_input("🔎 Full-text search", placeholder="e.g. payments kafka", key="library_query")
+    library_skill = col2.selectbox("Skill", [None] + sorted(COMMON_SKILLS), format_func=lambda skill: skill or "Any", key="library_skill")
+    library_min_score = col3.slider("Minimum ATS score", 0, 100, 0, key="library_min_score")
+    uploaded_within = {"Any time": None, "Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30}
+    library_window = col4.selectbox("Uploaded", list(uploaded_within), key="library_window")
+
+    since = time.time() - uploaded_within[library_window] * 86400 if uploaded_within[library_window] else None
+    library_results = get_analysis_store().search(
+        library_query.strip() or None, library_skill, library_min_score or None, since, limit=100, owner=library_filter()
+    )
+    if library_results:
+        import pandas as pd
+
+        st.dataframe(pd.DataFrame(
+            [(result.filename, result.score, ", ".join(result.skills),
+              datetime.fromtimestamp(result.uploaded_at).strftime("%Y-%m-%d %H:%M"), result.snippet)
+             for result in library_results],
+            columns=["file", "score", "skills", "uploaded", "excerpt"]
+        ), use_container_width=True, hide_index=True)
+
+        # Originals are served from the blob store on demand
+        selected_id = st.selectbox("Download an original file", [result.resume_id for result in library_results],
+                                   format_func={result.resume_id: result.filename for result in library_results}.get,
+                                   key="library_selected")
+        selected = get_analysis_store().get_resume(selected_id, library_filter())
+        if selected and selected.blob_key and selected.blob_key in get_blob_store():
+            st.download_button(
+                label=f"📥 Download {selected.filename}",
+                data=get_blob_store().get(selected.blob_key),
+                file_name=selected.filename,
+                mime="application/octet-stream"
+            )
+
+        # Shortlist export: AI-improved versions (or the parsed text) in one template, as a ZIP
+        st.markdown("#### 📦 Export a Shortlist")
+        col1, col2 = st.columns([3, 1])
+        shortlist = col1.multiselect("Resumes", [result.resume_id for result in library_results],
+                                     format_func={result.resume_id: result.filename for result in library_results}.get,
+                                     key="library_shortlist")
+        shortlist_template = col2.selectbox("Template", DOCX_TEMPLATES, key="library_template")
+        if shortlist and st.button(f"📦 Render {len(shortlist)} resume(s) as DOCX", use_container_width=True):
+            with st.spinner("Rendering..."):
+                documents = []
+                for resume_id in shortlist:
+                    stored = get_analysis_store().get_resume(resume_id, library_filter())
+                    if stored is None:
+                        continue
+                    suggestions = get_analysis_store().get_ai_output(resume_id, GEMINI_MODEL)
+                    improved = extract_improved_resume(suggestions) if suggestions else None
+                    filename = shortlist_entry_name(stored.filename, resume_id, improved, shortlist_template)
+                    documents.append((filename, improved or stored.text, shortlist_template))
+                shortlist_zip = export_docx_zip(documents)
+            st.download_button(
+                label="📥 Download Shortlist (ZIP)",
+                data=shortlist_zip,
+                file_name=f"shortlist_{shortlist_template.lower()}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+    else:
+        st.info("No stored resumes match these filters yet.")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
 # Footer
 st.markdown("---")
 
@@ -0,0 +1,186 @@
+import os
+import re
+import textwrap
+from collections import namedtuple
+from functools import lru_cache
+
+from sections import segment_sections
+
+# ✅ Prompt budgets, in estimated tokens (overridable from the environment)
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "6000"))
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("JOB_DESCRIPTION_TOKEN_BUDGET", "1500"))
+
+# Section types (see sections.SECTION_ALIASES) that carry little signal for the analysis;
+# they are shortened or dropped first
+LOW_VALUE_SECTIONS = [
+    "references", "interests", "declaration", "personal", "languages", "volunteering", "publications"
+]
+
+# Lines kept from a section when it has to be summarized
+SUMMARY_LINES = 3
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+INLINE_SPACE_PATTERN = re.compile(r"[ \t\f\v\u00a0]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+CompactedText = namedtuple("CompactedText", ["text", "original_tokens", "tokens", "removed"])
+
+
+# 📌 Function to Estimate tokens locally (word pieces, long words count as several)
+def estimate_tokens(text):
+    if not text:
+        return 0
+    return sum(1 + len(piece) // 8 for piece in TOKEN_PATTERN.findall(text))
+
+
+# 📌 Function to Normalize whitespace: single spaces, stripped lines, at most one blank line
+def normalize_whitespace(text):
+    lines = [INLINE_SPACE_PATTERN.sub(" ", line).strip() for line in (text or "").splitlines()]
+    return BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _split_sections(text):
+    sections = []
+    for span in segment_sections(text):
+        heading = text[span.start:span.content_start].strip()
+        lines = text[span.content_start:span.end].strip("\n").split("\n")
+        sections.append((span.kind, heading, lines))
+    return sections
+
+
+def _join_sections(sections):
+    parts = []
+    for _, heading, lines in sections:
+        if heading and not any(lines):
+            # Sections emptied by compaction lose their heading too
+            continue
+        parts.append("\n".join(([heading] if heading else []) + lines).strip())
+    return "\n\n".join(part for part in parts if part)
+
+
+# 📌 Function to Fit text into a token budget, giving up low-value content first
+# Page headers, footers and page numbers are already gone: the PDF extractor removes them page by page
+# (see parsing.strip_page_furniture), where it can tell them apart from repeated resume lines
+def compact_text(text, max_tokens):
+    cleaned = normalize_whitespace(text)
+    original_tokens = estimate_tokens(text)
+    removed = []
+
+    if not max_tokens or estimate_tokens(cleaned) <= max_tokens:
+        return CompactedText(cleaned, original_tokens, estimate_tokens(cleaned), removed)
+
+    sections = _split_sections(cleaned)
+
+    # 1. Summarize low-value sections to their first lines, then drop them entirely
+    for keep_lines in (SUMMARY_LINES, 0):
+        for index, (kind, heading, lines) in enumerate(sections):
+            if kind in LOW_VALUE_SECTIONS and len([line for line in lines if line]) > keep_lines:
+                sections[index] = (kind, heading, [line for line in lines if line][:keep_lines])
+                if heading not in removed:
+                    removed.append(heading)
+                if estimate_tokens(_join_sections(sections)) <= max_tokens:
+                    compacted = _join_sections(sections)
+                    return CompactedText(compacted, original_tokens, estimate_tokens(compacted), removed)
+
+    # 2. Trim the longest remaining sections from the end, one line at a time
+    while estimate_tokens(_join_sections(sections)) > max_tokens:
+        index = max(range(len(sections)), key=lambda i: estimate_tokens("\n".join(sections[i][2])))
+        kind, heading, lines = sections[index]
+        if len(lines) <= 1:
+            break
+        sections[index] = (kind, heading, lines[:-1])
+        if (heading or "(top of resume)") not in removed:
+            removed.append(heading or "(top of resume)")
+
+    compacted = _join_sections(sections)
+
+    # 3. Last resort: hard cut at the budget
+    if estimate_tokens(compacted) > max_tokens:
+        pieces = list(re.finditer(r"\S+", compacted))
+        total = 0
+        for match in pieces:
+            total += estimate_tokens(match.group(0))
+            if total > max_tokens:
+                compacted = compacted[:match.start()].rstrip() + "\n[…truncated]"
+                break
+
+    return CompactedText(compacted, original_tokens, estimate_tokens(compacted), removed)
+
+
+# ✅ Bump when any template below changes so cached responses from old prompts are not reused
+PROMPT_TEMPLATE_VERSION = "4"
+
+# ✅ The analysis is split into independent parts that run concurrently and are cached separately.
+# Only parts that use the job description are re-run when it changes.
+AnalysisPart = namedtuple("AnalysisPart", ["name", "heading", "instructions", "uses_job_description"])
+
+ANALYSIS_PLAN = [
+    AnalysisPart(
+        "assessment", "Overall Assessment",
+        "Provide a brief overall assessment of how effective and ATS-friendly this resume is.",
+        False,
+    ),
+    AnalysisPart(
+        "strengths", "Strengths",
+        "List the three main strengths of this resume as markdown bullet points.",
+        False,
+    ),
+    AnalysisPart(
+        "improvements", "Areas for Improvement",
+        "List the three most important areas for improvement in this resume as markdown bullet points.",
+        False,
+    ),
+    AnalysisPart(
+        "job_match", "Specific Suggestions to Match Job Description",
+        "Give detailed suggestions to better align this resume with the job description.",
+        True,
+    ),
+    AnalysisPart(
+        "improved_resume", "Improved Resume",
+        "Provide a complete, improved version of the resume in markdown.",
+        False,
+    ),
+]
+
+PART_PROMPT = textwrap.dedent("""\
+    You are a professional resume consultant helping to make a resume more effective and ATS-friendly.
+
+    RESUME:
+    {resume}
+    {job_section}
+    {instructions}
+    Reply with the content only: do not repeat the section title "{heading}".
+    """)
+
+JOB_SECTION = textwrap.dedent("""\
+
+    JOB DESCRIPTION:
+    {job_description}
+    """)
+
+PromptReport = namedtuple("PromptReport", ["prompt_tokens", "resume_tokens", "original_resume_tokens", "removed_sections"])
+
+
+# 📌 Function to Pick the parts of the plan that apply to this request
+def analysis_plan(job_description=None):
+    return [part for part in ANALYSIS_PLAN if job_description or not part.uses_job_description]
+
+
+# 📌 Function to Build one prompt per analysis part from compacted inputs, with a token report
+# Cached so the UI can show the report for the prompts it is about to send without recompacting.
+@lru_cache(maxsize=32)
+def build_analysis_prompts(resume_text, job_description=None,
+                           resume_budget=RESUME_TOKEN_BUDGET, job_budget=JOB_DESCRIPTION_TOKEN_BUDGET):
+    resume = compact_text(resume_text, resume_budget)
+    job = compact_text(job_description, job_budget) if job_description else None
+
+    prompts = {}
+    for part in analysis_plan(job_description):
+        job_section = JOB_SECTION.format(job_description=job.text) if part.uses_job_description else ""
+        prompts[part.name] = PART_PROMPT.format(
+            resume=resume.text, job_section=job_section, instructions=part.instructions, heading=part.heading
+        )
+
+    prompt_tokens = sum(estimate_tokens(prompt) for prompt in prompts.values())
+    report = PromptReport(prompt_tokens, resume.tokens, resume.original_tokens, tuple(resume.removed))
+    return prompts, report
@@ -0,0 +1,264 @@
+import argparse
+import io
+import json
+import os
+import random
+import textwrap
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from skills import COMMON_SKILLS
+
+# ✅ Deterministic synthetic resumes for benchmarks: the same seed always gives the same files.
+# Resumes vary in length (positions and bullets), layout (plain, tables, two columns) and skill density.
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Liam", "Sofia", "Kenji", "Fatima", "Noah", "Elena"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Chen", "Garcia", "Okafor", "Murphy", "Rossi", "Tanaka", "Khan", "Miller", "Novak"]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Data Analyst", "Data Scientist", "DevOps Engineer",
+    "Product Manager", "Frontend Developer", "Backend Developer", "Machine Learning Engineer", "QA Engineer",
+]
+EMPLOYERS = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli", "Vandelay"]
+CITIES = ["London", "Berlin", "Bangalore", "Toronto", "Austin", "Singapore", "Lagos", "Madrid"]
+DEGREES = ["B.Sc. Computer Science", "B.Tech Information Technology", "M.Sc. Data Science", "MBA", "B.A. Economics"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+VERBS = ["Built", "Designed", "Led", "Improved", "Migrated", "Automated", "Maintained", "Launched", "Reduced", "Scaled"]
+OBJECTS = [
+    "the billing service", "an internal reporting dashboard", "the customer onboarding flow", "nightly data pipelines",
+    "the mobile checkout", "a search feature", "the deployment process", "monitoring and alerting",
+]
+RESULTS = [
+    "cutting latency by 40%", "serving 1M requests per day", "saving 10 hours a week", "for 20k daily users",
+    "with zero downtime", "ahead of schedule", "across three teams", "raising conversion by 12%",
+]
+
+LENGTHS = {"short": (1, 2), "medium": (3, 5), "long": (6, 12)}
+SKILL_DENSITIES = [0.1, 0.3, 0.6]
+LAYOUTS = {"docx": ["plain", "table", "two_column"], "pdf": ["plain", "two_column"]}
+
+# Fixed timestamp for document metadata and ZIP entries, so output bytes depend only on the seed
+FIXED_TIMESTAMP = datetime(2024, 1, 1)
+
+
+@dataclass
+class SyntheticResume:
+    name: str
+    contact: str
+    file_format: str
+    layout: str
+    length: str
+    skill_density: float
+    skills: list = field(default_factory=list)
+    # (heading, lines) in reading order
+    sections: list = field(default_factory=list)
+
+    @property
+    def text(self):
+        blocks = [self.name, self.contact]
+        for heading, lines in self.sections:
+            blocks.append(heading)
+            blocks.extend(lines)
+        return "\n".join(blocks)
+
+
+def _bullet(rng, skills, skill_density):
+    line = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(RESULTS)}"
+    if rng.random() < skill_density:
+        line += f" using {rng.choice(skills)}"
+    return line
+
+
+# 📌 Function to Generate one resume; (seed, index) fully determine it
+def generate_resume(index, seed=0, file_format="docx"):
+    rng = random.Random(f"{seed}:{index}")
+    length = rng.choice(list(LENGTHS))
+    skill_density = rng.choice(SKILL_DENSITIES)
+    layout = rng.choice(LAYOUTS[file_format])
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}{index}@example.com"
+    contact = f"{email} | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)} | {rng.choice(CITIES)}"
+    skills = rng.sample(COMMON_SKILLS, max(3, int(len(COMMON_SKILLS) * skill_density / 2)))
+
+    experience = []
+    year = 2024
+    for _ in range(rng.randint(*LENGTHS[length])):
+        start = year - rng.randint(1, 4)
+        experience.append(f"{rng.choice(TITLES)} at {rng.choice(EMPLOYERS)} ({start} - {year})")
+        experience.extend(f"- {_bullet(rng, skills, skill_density)}" for _ in range(rng.randint(2, 7)))
+        year = start
+
+    summary = f"{rng.choice(TITLES)} with {2024 - year} years of experience. " + " ".join(
+        f"{_bullet(rng, skills, skill_density)}." for _ in range(rng.randint(1, 3))
+    )
+    education = [f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} ({year - rng.randint(0, 2)})"]
+
+    return SyntheticResume(
+        name=name, contact=contact, file_format=file_format, layout=layout, length=length,
+        skill_density=skill_density, skills=skills,
+        sections=[
+            ("Summary", [summary]),
+            ("Experience", experience),
+            ("Education", education),
+            ("Skills", [", ".join(skills)]),
+        ],
+    )
+
+
+def _normalize_zip(data):
+    # python-docx stamps ZIP entries with the current time; rewrite them with a fixed one
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            entry = zipfile.ZipInfo(info.filename, FIXED_TIMESTAMP.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            target.writestr(entry, source.read(info.filename))
+    return output.getvalue()
+
+
+def _add_lines(container, lines):
+    for line in lines:
+        if line.startswith("- "):
+            container.add_paragraph(line[2:], style="List Bullet")
+        else:
+            container.add_paragraph(line)
+
+
+# 📌 Function to Write a resume as DOCX bytes with python-docx
+def write_docx(resume):
+    from docx import Document
+
+    doc = Document()
+    doc.core_properties.created = doc.core_properties.modified = FIXED_TIMESTAMP
+    doc.core_properties.author = doc.core_properties.last_modified_by = "resume_corpus"
+    sections = dict(resume.sections)
+
+    if resume.layout == "plain":
+        doc.add_heading(resume.name, level=1)
+        doc.add_paragraph(resume.contact)
+    else:
+        # Name and contact details in the page header, as many templates do
+        header = doc.sections[0].header
+        header.paragraphs[0].text = resume.name
+        header.add_paragraph(resume.contact)
+
+    if resume.layout == "two_column":
+        # One-row table: skills and education on the left, everything else on the right
+        left, right = doc.add_table(rows=1, cols=2).rows[0].cells
+        for heading in ("Skills", "Education"):
+            left.add_paragraph(heading, style="Heading 2")
+            _add_lines(left, sections[heading])
+        for heading in ("Summary", "Experience"):
+            right.add_paragraph(heading, style="Heading 2")
+            _add_lines(right, sections[heading])
+    else:
+        for heading, lines in resume.sections:
+            doc.add_heading(heading, level=2)
+            if heading == "Skills" and resume.layout == "table":
+                table = doc.add_table(rows=0, cols=3)
+                for start in range(0, len(resume.skills), 3):
+                    cells = table.add_row().cells
+                    for cell, skill in zip(cells, resume.skills[start:start + 3]):
+                        cell.text = skill
+            else:
+                _add_lines(doc, lines)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return _normalize_zip(buffer.getvalue())
+
+
+PDF_PAGE_SIZE = (595, 842)   # A4 in points
+PDF_MARGIN = 50
+PDF_FONT_SIZE = 10
+PDF_LINE_HEIGHT = 14
+
+
+def _pdf_lines(sections):
+    # (text, bold) pairs, wrapped later to the column width
+    lines = []
+    for heading, body in sections:
+        lines.append((heading, True))
+        lines.extend((line, False) for line in body)
+        lines.append(("", False))
+    return lines
+
+
+def _flow_pdf_lines(doc, lines, x, width):
+    # Write lines down one column, continuing on the next page (created when needed) when it fills up
+    characters_per_line = max(20, int(width / (PDF_FONT_SIZE * 0.5)))
+    page_number, y = 0, PDF_MARGIN + PDF_LINE_HEIGHT
+    for text, bold in lines:
+        for wrapped in textwrap.wrap(text, characters_per_line) or [""]:
+            if y > PDF_PAGE_SIZE[1] - PDF_MARGIN:
+                page_number, y = page_number + 1, PDF_MARGIN + PDF_LINE_HEIGHT
+            while len(doc) <= page_number:
+                doc.new_page(width=PDF_PAGE_SIZE[0], height=PDF_PAGE_SIZE[1])
+            if wrapped:
+                doc[page_number].insert_text(
+                    (x, y), wrapped, fontsize=PDF_FONT_SIZE, fontname="hebo" if bold else "helv"
+                )
+            y += PDF_LINE_HEIGHT
+
+
+# 📌 Function to Write a resume as PDF bytes with PyMuPDF
+def write_pdf(resume):
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page(width=PDF_PAGE_SIZE[0], height=PDF_PAGE_SIZE[1])
+    header = [(resume.name, True), (resume.contact, False), ("", False)]
+    full_width = PDF_PAGE_SIZE[0] - 2 * PDF_MARGIN
+
+    if resume.layout == "two_column":
+        sections = dict(resume.sections)
+        left_width = full_width * 0.35
+        _flow_pdf_lines(doc, header + _pdf_lines([(h, sections[h]) for h in ("Skills", "Education")]),
+                        PDF_MARGIN, left_width)
+        _flow_pdf_lines(doc, _pdf_lines([(h, sections[h]) for h in ("Summary", "Experience")]),
+                        PDF_MARGIN + left_width + 20, full_width - left_width - 20)
+    else:
+        _flow_pdf_lines(doc, header + _pdf_lines(resume.sections), PDF_MARGIN, full_width)
+
+    doc.set_metadata({"producer": "resume_corpus", "creator": "resume_corpus"})
+    data = doc.tobytes(garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    return data
+
+
+WRITERS = {"docx": write_docx, "pdf": write_pdf}
+
+
+# 📌 Function to Generate a corpus: yields (filename, bytes, resume), alternating formats
+def generate_corpus(count, seed=0, formats=("pdf", "docx")):
+    for index in range(count):
+        file_format = formats[index % len(formats)]
+        resume = generate_resume(index, seed, file_format)
+        yield f"resume_{index:04d}.{file_format}", WRITERS[file_format](resume), resume
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic resume corpus (PDF and DOCX).")
+    parser.add_argument("output", help="Directory to write the files and manifest.json to")
+    parser.add_argument("-n", "--count", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", default="pdf,docx", help="Comma-separated formats, used in turn")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = []
+    for filename, data, resume in generate_corpus(args.count, args.seed, tuple(args.formats.split(","))):
+        with open(os.path.join(args.output, filename), "wb") as handle:
+            handle.write(data)
+        manifest.append({
+            "file": filename, "layout": resume.layout, "length": resume.length,
+            "skill_density": resume.skill_density, "skills": resume.skills, "bytes": len(data),
+        })
+    with open(os.path.join(args.output, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump({"seed": args.seed, "files": manifest}, handle, indent=2)
+    print(f"✅ Wrote {len(manifest)} resumes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
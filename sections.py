@@ -0,0 +1,155 @@
+import bisect
+import re
+from collections import namedtuple
+
+# ✅ Section types and the headings that introduce them
+SECTION_ALIASES = {
+    "summary": [
+        "summary", "professional summary", "career summary", "executive summary", "profile",
+        "professional profile", "objective", "career objective", "about me", "about"
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience", "employment",
+        "employment history", "work history", "career history", "internships", "internship"
+    ],
+    "education": [
+        "education", "academic background", "academic qualifications", "qualifications", "education and training"
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+        "technologies", "tech stack", "tools", "skills and tools", "skills & tools", "skills & abilities"
+    ],
+    "projects": ["projects", "personal projects", "key projects", "academic projects", "side projects"],
+    "certifications": [
+        "certifications", "certificates", "certification", "licenses", "licenses and certifications",
+        "licenses & certifications", "courses", "training"
+    ],
+    "awards": ["awards", "achievements", "honors", "honours", "accomplishments", "awards and achievements"],
+    "publications": ["publications", "research"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests", "activities", "extracurricular activities"],
+    "volunteering": ["volunteering", "volunteer experience", "volunteer work"],
+    "references": ["references"],
+    "declaration": ["declaration"],
+    "personal": ["personal details", "personal information", "personal data"],
+}
+
+# Text before the first heading, and headings that are not in the table above
+HEADER = "header"
+OTHER = "other"
+
+_ALIAS_KINDS = {alias: kind for kind, aliases in SECTION_ALIASES.items() for alias in aliases}
+_ALIASES = "|".join(re.escape(alias) for alias in sorted(_ALIAS_KINDS, key=len, reverse=True))
+
+# One compiled pattern finds every heading line in a single pass:
+# - a known heading, alone on its line or followed by ":"/"-" and inline content ("Skills: Python, SQL")
+# - any other short ALL-CAPS line ("LEADERSHIP"), checked further by _is_caps_heading
+# Markdown heading and bold markers may come first, but bullets may not: "• Tools: Git" is a list item.
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:#{1,6}[ \t]*|\*\*)?(?:"
+    r"(?P<known>(?i:" + _ALIASES + r"))\**[ \t]*(?:[:\-–|][ \t]*(?P<inline>[^\n]*?))?"
+    r"|(?P<caps>[A-Z][A-Z&/ ]{2,40}?)\**[ \t]*:?"
+    r")[ \t]*$",
+    re.MULTILINE,
+)
+
+# ALL-CAPS lines that are employer names, not headings ("ACME CORP", "GLOBEX LTD")
+COMPANY_SUFFIX_PATTERN = re.compile(
+    r"\b(?:INC|CORP|CORPORATION|CO|COMPANY|LLC|LLP|LTD|LIMITED|PLC|GMBH|AG|PVT|GROUP|HOLDINGS|LABS|"
+    r"TECHNOLOGIES|SOLUTIONS|SYSTEMS|INDUSTRIES|ENTERPRISES|PARTNERS|CONSULTING)$"
+)
+
+# A section of the resume: heading spans start..content_start, the content content_start..end
+SectionSpan = namedtuple("SectionSpan", ["kind", "heading", "start", "content_start", "end"])
+
+
+def _heading_kind(match):
+    if match.group("known"):
+        return _ALIAS_KINDS[match.group("known").lower()]
+    return OTHER
+
+
+def _previous_line(text, start):
+    # The line before the one starting at `start` (None at the start of the text)
+    if start == 0:
+        return None
+    return text[text.rfind("\n", 0, start - 1) + 1:start - 1]
+
+
+# 📌 Function to Tell an unknown ALL-CAPS heading from an employer, title or acronym written in capitals:
+# it has to follow a blank line, and (by HEADING_PATTERN) has no digits or commas, so no dates
+def _is_caps_heading(match, previous_line):
+    if previous_line is not None and previous_line.strip():
+        return False
+    return not COMPANY_SUFFIX_PATTERN.search(match.group("caps").strip())
+
+
+# ✅ Single-pass section segmenter; text can be fed in pieces as long as no line is split
+class SectionSegmenter:
+    def __init__(self):
+        self.spans = []
+        self._open = (HEADER, "", 0, 0)
+        self._length = 0
+        self._seen_known = False
+        # The last two lines fed so far, to look up the line before a heading at the start of a piece
+        self._tail = ""
+
+    @property
+    def kinds(self):
+        return section_kinds(self.spans + ([self._open_span(self._length)] if self._length else []))
+
+    def _open_span(self, end):
+        kind, heading, start, content_start = self._open
+        return SectionSpan(kind, heading, start, content_start, end)
+
+    def feed(self, text):
+        offset = self._length
+        context = self._tail + text
+        for match in HEADING_PATTERN.finditer(text):
+            kind = _heading_kind(match)
+            # An ALL-CAPS line before any recognised heading is most likely the candidate's name
+            if kind == OTHER and not self._seen_known:
+                continue
+            if kind == OTHER and not _is_caps_heading(match, _previous_line(context, len(self._tail) + match.start())):
+                continue
+            self._seen_known = self._seen_known or kind != OTHER
+            start = offset + match.start()
+            self._close(start)
+            heading = (match.group("known") or match.group("caps")).strip()
+            content_start = offset + (match.start("inline") if match.group("inline") else match.end())
+            self._open = (kind, heading, start, content_start)
+        self._length += len(text)
+        self._tail = context[context.rfind("\n", 0, max(context.rfind("\n"), 0)) + 1:]
+        return self
+
+    def _close(self, end):
+        span = self._open_span(end)
+        if span.kind != HEADER or span.end > span.start:
+            self.spans.append(span)
+
+    def finish(self):
+        self._close(self._length)
+        self._open = None
+        return self.spans
+
+
+# 📌 Function to Split a resume into typed section spans with character offsets
+def segment_sections(text):
+    return SectionSegmenter().feed(text or "").finish()
+
+
+# 📌 Function to List the section types present, in order (header and unknown headings excluded)
+def section_kinds(spans):
+    kinds = {}
+    for span in spans:
+        if span.kind not in (HEADER, OTHER):
+            kinds.setdefault(span.kind, None)
+    return list(kinds)
+
+
+# 📌 Function to Find the span that contains a character offset
+def span_at(spans, offset):
+    index = bisect.bisect_right([span.start for span in spans], offset) - 1
+    if index >= 0 and offset < spans[index].end:
+        return spans[index]
+    return None
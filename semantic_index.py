@@ -0,0 +1,353 @@
+import argparse
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from prompting import normalize_whitespace
+from sections import segment_sections
+
+# ✅ Semantic index settings (overridable from the environment)
+SEMANTIC_INDEX_PATH = os.getenv("SEMANTIC_INDEX_PATH", ".cache/semantic_index")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "")
+# Below this many chunks every query is an exact scan; above it an IVF index is trained
+IVF_MIN_ROWS = int(os.getenv("SEMANTIC_IVF_MIN_ROWS", "20000"))
+IVF_PROBES = int(os.getenv("SEMANTIC_IVF_PROBES", "32"))
+
+MAX_CHUNK_CHARS = 1200
+PREVIEW_CHARS = 160
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 50000
+# The IVF centroids are retrained when the index has grown this much since the last training
+RETRAIN_GROWTH = 4
+INITIAL_CAPACITY = 1024
+
+SearchResult = namedtuple("SearchResult", ["resume_id", "label", "score", "section", "preview"])
+
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# 📌 spaCy embeddings: mean of the tok2vec tensor (no extra dependency)
+class SpacyEmbedder:
+    def __init__(self):
+        from nlp_pipeline import get_nlp
+        self._nlp = get_nlp("vectors")
+        self.name = f"spacy:{self._nlp.meta.get('name', 'model')}"
+        self.dimension = self._nlp("dimension probe").vector.shape[0]
+
+    def embed(self, texts):
+        from nlp_pipeline import pipe_texts
+        return _normalize_rows([doc.vector for doc in pipe_texts(texts, profile="vectors")])
+
+
+# 📌 Sentence-transformers embeddings (better quality; needs `pip install sentence-transformers`)
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.name = f"sentence-transformers:{model_name}"
+        self.dimension = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts):
+        return _normalize_rows(self._model.encode(list(texts), batch_size=32, show_progress_bar=False))
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+# 📌 Function to Get the configured embedder (EMBEDDING_MODEL selects a sentence-transformers model)
+def get_embedder():
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = SentenceTransformerEmbedder(EMBEDDING_MODEL) if EMBEDDING_MODEL else SpacyEmbedder()
+        return _embedder
+
+
+# 📌 Function to Split a resume into section chunks: (section heading, text)
+def chunk_resume(text, max_chars=MAX_CHUNK_CHARS):
+    chunks = []
+    text = normalize_whitespace(text)
+    for span in segment_sections(text):
+        section = span.heading or "Header"
+        current = []
+        size = 0
+        for line in (line for line in text[span.content_start:span.end].split("\n") if line):
+            if current and size + len(line) > max_chars:
+                chunks.append((section, "\n".join(current)))
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+        if current:
+            chunks.append((section, "\n".join(current)))
+    return chunks
+
+
+def _kmeans(vectors, clusters, iterations=KMEANS_ITERATIONS, seed=0):
+    # Spherical k-means: rows are unit vectors, so the nearest centroid has the highest dot product
+    random = np.random.default_rng(seed)
+    centroids = vectors[random.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(clusters):
+            members = vectors[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+            else:
+                centroids[cluster] = vectors[random.integers(len(vectors))]
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+# ✅ Embedding index on disk: a memory-mapped float32 matrix of chunk vectors, chunk metadata
+# as JSON lines, and an inverted-file (IVF) index over k-means centroids for approximate search.
+# Resumes are appended incrementally; re-adding a resume id replaces its chunks.
+class SemanticIndex:
+    def __init__(self, directory=SEMANTIC_INDEX_PATH, embedder=None):
+        self.directory = directory
+        self.embedder = embedder or get_embedder()
+        self.dimension = self.embedder.dimension
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._rows_by_resume = {}
+        self._deleted = set()
+        self._centroids = None
+        self._trained_rows = 0
+        self._lists = None
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def __len__(self):
+        return len(self._rows_by_resume)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._rows_by_resume
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open_matrix(self, name, dtype, capacity, columns=None):
+        shape = (capacity, columns) if columns else (capacity,)
+        mode = "r+" if os.path.exists(self._path(name)) else "w+"
+        return np.memmap(self._path(name), dtype=dtype, mode=mode, shape=shape)
+
+    def _load(self):
+        meta = {}
+        if os.path.exists(self._path("meta.json")):
+            with open(self._path("meta.json"), encoding="utf-8") as handle:
+                meta = json.load(handle)
+            if meta["embedder"] != self.embedder.name or meta["dimension"] != self.dimension:
+                raise ValueError(
+                    f"Semantic index at {self.directory} was built with {meta['embedder']}; "
+                    f"delete it or point SEMANTIC_INDEX_PATH elsewhere to use {self.embedder.name}"
+                )
+
+        self.count = meta.get("count", 0)
+        self._capacity = meta.get("capacity", INITIAL_CAPACITY)
+        self._vectors = self._open_matrix("vectors.f32", np.float32, self._capacity, self.dimension)
+        self._assignments = self._open_matrix("assignments.i32", np.int32, self._capacity)
+
+        if os.path.exists(self._path("chunks.jsonl")):
+            with open(self._path("chunks.jsonl"), encoding="utf-8") as handle:
+                lines = handle.readlines()
+            if len(lines) > self.count:
+                # Rows past `count` belong to a write that never completed; drop them
+                lines = lines[:self.count]
+                with open(self._path("chunks.jsonl"), "w", encoding="utf-8") as handle:
+                    handle.writelines(lines)
+            for row, line in enumerate(lines):
+                chunk = json.loads(line)
+                resume_id = chunk["resume_id"]
+                self._chunks.append((resume_id, chunk["label"], chunk["section"], chunk["preview"]))
+                # Chunk 0 starts a new version of the resume; rows of older versions are dead
+                if chunk["chunk"] == 0 and resume_id in self._rows_by_resume:
+                    self._deleted.update(self._rows_by_resume.pop(resume_id))
+                self._rows_by_resume.setdefault(resume_id, []).append(row)
+
+        if os.path.exists(self._path("centroids.npy")):
+            self._centroids = np.load(self._path("centroids.npy"))
+            self._trained_rows = meta.get("trained_rows", 0)
+            self._build_lists()
+
+    def _save_meta(self):
+        meta = {
+            "embedder": self.embedder.name,
+            "dimension": self.dimension,
+            "count": self.count,
+            "capacity": self._capacity,
+            "trained_rows": self._trained_rows,
+        }
+        temporary = self._path("meta.json.tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        os.replace(temporary, self._path("meta.json"))
+
+    def _grow(self, needed):
+        if needed <= self._capacity:
+            return
+        while self._capacity < needed:
+            self._capacity *= 2
+        self._vectors.flush()
+        self._assignments.flush()
+        # np.memmap cannot resize in place; extend the files and map them again
+        for name, itemsize in (("vectors.f32", 4 * self.dimension), ("assignments.i32", 4)):
+            with open(self._path(name), "r+b") as handle:
+                handle.truncate(self._capacity * itemsize)
+        self._vectors = self._open_matrix("vectors.f32", np.float32, self._capacity, self.dimension)
+        self._assignments = self._open_matrix("assignments.i32", np.int32, self._capacity)
+
+    def _build_lists(self):
+        assignments = np.asarray(self._assignments[:self.count])
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[boundaries[i]:boundaries[i + 1]] for i in range(len(self._centroids))]
+
+    def _assign(self, start, stop, batch=65536):
+        for offset in range(start, stop, batch):
+            end = min(offset + batch, stop)
+            self._assignments[offset:end] = np.argmax(self._vectors[offset:end] @ self._centroids.T, axis=1)
+
+    def _train(self):
+        rows = self.count
+        sample = np.asarray(self._vectors[:rows])
+        if rows > KMEANS_SAMPLE:
+            sample = sample[np.random.default_rng(0).choice(rows, KMEANS_SAMPLE, replace=False)]
+        clusters = max(16, int(4 * np.sqrt(rows)))
+        self._centroids = _kmeans(sample, min(clusters, len(sample)))
+        self._assign(0, rows)
+        self._trained_rows = rows
+        np.save(self._path("centroids.npy"), self._centroids)
+        self._build_lists()
+
+    # 📌 Add (or replace) one resume: chunk by section, embed, append to the memory-mapped matrix
+    def add(self, resume_id, text, label=None):
+        chunks = chunk_resume(text)
+        if not chunks:
+            return 0
+        vectors = self.embedder.embed([f"{section}\n{body}" for section, body in chunks])
+
+        with self._lock:
+            if resume_id in self._rows_by_resume:
+                self._deleted.update(self._rows_by_resume.pop(resume_id))
+
+            start = self.count
+            stop = start + len(chunks)
+            self._grow(stop)
+            self._vectors[start:stop] = vectors
+            with open(self._path("chunks.jsonl"), "a", encoding="utf-8") as handle:
+                for number, (section, body) in enumerate(chunks):
+                    chunk = {
+                        "resume_id": resume_id, "label": label or resume_id, "chunk": number,
+                        "section": section, "preview": body[:PREVIEW_CHARS],
+                    }
+                    handle.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+                    self._chunks.append((resume_id, chunk["label"], section, chunk["preview"]))
+            self._rows_by_resume[resume_id] = list(range(start, stop))
+            self.count = stop
+
+            if self._centroids is not None:
+                self._assign(start, stop)
+            if self.count >= IVF_MIN_ROWS and self.count >= RETRAIN_GROWTH * max(self._trained_rows, 1):
+                self._train()
+            elif self._centroids is not None:
+                # New rows join their centroid's list without retraining
+                for cluster, rows in _group_rows(np.asarray(self._assignments[start:stop]), start).items():
+                    self._lists[cluster] = np.concatenate([self._lists[cluster], rows])
+
+            self._vectors.flush()
+            self._assignments.flush()
+            self._save_meta()
+        return len(chunks)
+
+    def _candidates(self, query):
+        if self._centroids is None:
+            return np.arange(self.count)
+        probes = min(IVF_PROBES, len(self._centroids))
+        nearest = np.argpartition(-(self._centroids @ query), probes - 1)[:probes]
+        return np.concatenate([self._lists[cluster] for cluster in nearest])
+
+    # 📌 Top-k resumes for a free-text query; each resume is scored by its best-matching section
+    # With resume_ids, only those resumes are searched, and all of their chunks are scored
+    def search(self, query, top_k=10, resume_ids=None):
+        query_vector = self.embedder.embed([query])[0]
+        with self._lock:
+            if not self.count:
+                return []
+            if resume_ids is None:
+                rows = np.sort(self._candidates(query_vector))
+            else:
+                rows = [row for resume_id in resume_ids for row in self._rows_by_resume.get(resume_id, ())]
+                if not rows:
+                    return []
+                rows = np.sort(np.asarray(rows, dtype=np.int64))
+            scores = np.asarray(self._vectors[rows]) @ query_vector
+
+            # Take more chunks than needed so duplicates of one resume do not crowd out the rest
+            wanted = min(len(rows), max(top_k * 8, 64))
+            best = np.argpartition(-scores, wanted - 1)[:wanted] if wanted < len(rows) else np.arange(len(rows))
+            best = best[np.argsort(-scores[best], kind="stable")]
+
+            results = []
+            seen = set()
+            for position in best:
+                row = int(rows[position])
+                if row in self._deleted:
+                    continue
+                resume_id, label, section, preview = self._chunks[row]
+                if resume_id in seen:
+                    continue
+                seen.add(resume_id)
+                results.append(SearchResult(resume_id, label, round(float(scores[position]), 4), section, preview))
+                if len(results) == top_k:
+                    break
+            return results
+
+
+def _group_rows(assignments, offset):
+    groups = {}
+    for index, cluster in enumerate(assignments):
+        groups.setdefault(int(cluster), []).append(offset + index)
+    return {cluster: np.asarray(rows, dtype=np.int64) for cluster, rows in groups.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the semantic resume index.")
+    parser.add_argument("--index", default=SEMANTIC_INDEX_PATH, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Index every PDF/DOCX in a folder or ZIP archive")
+    add_parser.add_argument("source")
+    search_parser = commands.add_parser("search", help="Search the index")
+    search_parser.add_argument("query")
+    search_parser.add_argument("-k", "--top-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = SemanticIndex(args.index)
+    if args.command == "add":
+        # Parsing runs on the batch worker pool; embedding happens here as results arrive
+        from batch import iter_resume_sources, screen_resumes
+
+        for row in screen_resumes(iter_resume_sources(args.source)):
+            if row.get("text"):
+                chunks = index.add(row["content_hash"], row["text"], label=row["file"])
+                print(f"✅ {row['file']}: {chunks} chunk(s)")
+            else:
+                print(f"❌ {row['file']}: {row['error']}")
+        print(f"📦 {len(index)} resume(s), {index.count} chunk(s) in {args.index}")
+    else:
+        for result in index.search(args.query, args.top_k):
+            print(f"{result.score:.3f}  {result.label}  [{result.section}]  {result.preview[:80]!r}")
+
+
+if __name__ == "__main__":
+    main()
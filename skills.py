@@ -0,0 +1,166 @@
+from collections import deque, namedtuple
+
+# ✅ Skill taxonomy used across the app
+COMMON_SKILLS = [
+    "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "swift", "kotlin", "go", "rust",
+    "sql", "mysql", "postgresql", "mongodb", "oracle", "nosql", "firebase",
+    "machine learning", "deep learning", "natural language processing", "nlp", "computer vision",
+    "react", "angular", "vue", "node.js", "express", "django", "flask", "spring", "laravel",
+    "docker", "kubernetes", "aws", "azure", "gcp", "cloud computing", "devops", "cicd",
+    "linux", "unix", "bash", "powershell", "git", "github", "gitlab", "bitbucket",
+    "excel", "power bi", "tableau", "data analysis", "data visualization", "statistics", "r",
+    "leadership", "communication", "project management", "agile", "scrum", "kanban",
+    "html", "css", "sass", "less", "responsive design", "ui/ux", "figma", "sketch",
+    "tensorflow", "pytorch", "keras", "pandas", "numpy", "scikit-learn", "matplotlib",
+    "rest api", "graphql", "oauth", "authentication", "blockchain", "cybersecurity"
+]
+
+# A single match of a skill in the scanned text; start/end are character offsets
+SkillMatch = namedtuple("SkillMatch", ["skill", "start", "end"])
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _lower_preserving_offsets(text):
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. "İ") expand when lowercased; keep offsets aligned
+    return ''.join(char.lower()[0] for char in text)
+
+
+# 📌 Aho-Corasick automaton compiled once from the skill taxonomy
+class SkillMatcher:
+    def __init__(self, skills):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.max_length = 0
+
+        for skill in skills:
+            keyword = " ".join(skill.lower().split())
+            if keyword and keyword not in self.skills:
+                self.skills.append(keyword)
+                self.max_length = max(self.max_length, len(keyword))
+                self._add(keyword)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit the outputs of the longest proper suffix
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def scanner(self):
+        return SkillScanner(self)
+
+    # 📌 Find every skill occurrence in one linear pass over the text
+    def find_all(self, text):
+        if not text:
+            return []
+        scanner = self.scanner()
+        matches = scanner.feed(text) + scanner.finish()
+        matches.sort(key=lambda match: (match.start, -match.end))
+        return matches
+
+    # 📌 Unique skills in order of first appearance
+    def extract(self, text):
+        seen = {}
+        for match in self.find_all(text):
+            seen.setdefault(match.skill, match)
+        return list(seen)
+
+
+# 📌 Incremental scan over text that arrives in chunks (pages, paragraphs)
+# Offsets are relative to the concatenation of everything fed so far.
+class SkillScanner:
+    def __init__(self, matcher):
+        self._goto = matcher._goto
+        self._fail = matcher._fail
+        self._output = matcher._output
+        self._state = 0
+        self._offset = 0
+        self._previous = ""
+        # (offset, preceding char) of the last max_length scanned characters
+        self._positions = deque(maxlen=max(matcher.max_length, 1))
+        # Matches at the end of the input wait for the next char to check their right boundary
+        self._pending = []
+
+    def feed(self, text):
+        goto, fail, output = self._goto, self._fail, self._output
+        positions = self._positions
+        state = self._state
+        matches = []
+
+        for char in _lower_preserving_offsets(text):
+            index = self._offset
+            self._offset += 1
+
+            if self._pending:
+                boundary = _is_word_char(char)
+                matches.extend(match for match in self._pending if not (boundary and _is_word_char(match.skill[-1])))
+                self._pending = []
+
+            previous = self._previous
+            self._previous = char
+            # Collapse any whitespace run onto the single space used in the keywords
+            if char.isspace():
+                if previous.isspace():
+                    continue
+                char = " "
+
+            positions.append((index, previous))
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword in output[state]:
+                start, before = positions[-len(keyword)]
+                # Respect the word boundary on the left of the match
+                if before and _is_word_char(before) and _is_word_char(keyword[0]):
+                    continue
+                self._pending.append(SkillMatch(keyword, start, index + 1))
+
+        self._state = state
+        return matches
+
+    def finish(self):
+        matches, self._pending = self._pending, []
+        return matches
+
+
+_default_matcher = None
+
+
+def get_skill_matcher():
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SkillMatcher(COMMON_SKILLS)
+    return _default_matcher
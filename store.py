@@ -0,0 +1,308 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+# ✅ Storage settings (overridable from the environment)
+ANALYSIS_STORE_URL = os.getenv("ANALYSIS_STORE_URL", "sqlite:///.cache/analysis.sqlite3")
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", ".cache/blobs")
+# Resumes, their original files and AI outputs are deleted this many days after their last upload (0 keeps them)
+LIBRARY_RETENTION_DAYS = float(os.getenv("LIBRARY_RETENTION_DAYS", "30"))
+
+StoredResume = namedtuple(
+    "StoredResume",
+    ["resume_id", "filename", "extension", "blob_key", "score", "skills", "ats", "uploaded_at", "text"],
+)
+StoredSummary = namedtuple("StoredSummary", ["resume_id", "filename", "score", "skills", "uploaded_at", "snippet"])
+
+
+# ✅ Content-addressed file store: a blob's key is the SHA-256 of its bytes, so identical
+# uploads are stored once and sessions keep only the key instead of a copy of the file
+class BlobStore:
+    def __init__(self, root=BLOB_STORE_PATH):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        path = self.path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob
+            handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(handle, "wb") as blob:
+                blob.write(data)
+            os.replace(temporary, path)
+        return key
+
+    def get(self, key):
+        with open(self.path(key), "rb") as blob:
+            return blob.read()
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+# ✅ Analysis store interface; SQLiteAnalysisStore is the local implementation
+class AnalysisStore(ABC):
+    @abstractmethod
+    def save_resume(self, resume_id, text, filename=None, extension=None, blob_key=None,
+                    score=None, skills=(), ats=None, owner=None):
+        ...
+
+    @abstractmethod
+    def get_resume(self, resume_id, owner=None):
+        ...
+
+    @abstractmethod
+    def save_ai_output(self, resume_id, model_name, text, job_description=None):
+        ...
+
+    @abstractmethod
+    def get_ai_output(self, resume_id, model_name, job_description=None):
+        ...
+
+    @abstractmethod
+    def search(self, query=None, skill=None, min_score=None, since=None, limit=50, owner=None):
+        ...
+
+    @abstractmethod
+    def owned_resume_ids(self, owner):
+        ...
+
+    @abstractmethod
+    def purge(self, before):
+        ...
+
+
+def _job_key(job_description):
+    return hashlib.sha256(" ".join((job_description or "").split()).encode("utf-8")).hexdigest()
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    resume_id TEXT PRIMARY KEY,
+    filename TEXT,
+    extension TEXT,
+    blob_key TEXT,
+    score REAL,
+    ats TEXT,
+    text TEXT,
+    uploaded_at REAL
+);
+CREATE INDEX IF NOT EXISTS resumes_score ON resumes (score);
+CREATE INDEX IF NOT EXISTS resumes_uploaded_at ON resumes (uploaded_at);
+
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id TEXT,
+    skill TEXT,
+    PRIMARY KEY (resume_id, skill)
+);
+CREATE INDEX IF NOT EXISTS resume_skills_skill ON resume_skills (skill);
+
+-- Who uploaded each resume (a Streamlit session, for example); a resume can have several owners
+CREATE TABLE IF NOT EXISTS resume_owners (
+    resume_id TEXT,
+    owner TEXT,
+    PRIMARY KEY (resume_id, owner)
+);
+CREATE INDEX IF NOT EXISTS resume_owners_owner ON resume_owners (owner);
+
+CREATE TABLE IF NOT EXISTS ai_outputs (
+    resume_id TEXT,
+    model TEXT,
+    job_key TEXT,
+    text TEXT,
+    created_at REAL,
+    PRIMARY KEY (resume_id, model, job_key)
+);
+"""
+
+# External-content FTS5 table over resumes.text, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(filename, text, content='resumes', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS resumes_fts_insert AFTER INSERT ON resumes BEGIN
+    INSERT INTO resumes_fts (rowid, filename, text) VALUES (new.rowid, new.filename, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_fts_delete AFTER DELETE ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, filename, text) VALUES ('delete', old.rowid, old.filename, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_fts_update AFTER UPDATE ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, filename, text) VALUES ('delete', old.rowid, old.filename, old.text);
+    INSERT INTO resumes_fts (rowid, filename, text) VALUES (new.rowid, new.filename, new.text);
+END;
+"""
+
+
+# ✅ SQLite analysis store: parsed text, skills, ATS results and AI outputs,
+# indexed by skill, score and upload date, with FTS5 full-text search when SQLite has it
+class SQLiteAnalysisStore(AnalysisStore):
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            try:
+                self._db.executescript(FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to LIKE
+                self.full_text = False
+            self._db.commit()
+
+    def save_resume(self, resume_id, text, filename=None, extension=None, blob_key=None,
+                    score=None, skills=(), ats=None, owner=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO resumes VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (resume_id) DO UPDATE SET filename = excluded.filename, "
+                "extension = excluded.extension, blob_key = COALESCE(excluded.blob_key, blob_key), "
+                "score = excluded.score, ats = excluded.ats, text = excluded.text, uploaded_at = excluded.uploaded_at",
+                (resume_id, filename, extension, blob_key, score, json.dumps(ats) if ats is not None else None,
+                 text, time.time()),
+            )
+            self._db.execute("DELETE FROM resume_skills WHERE resume_id = ?", (resume_id,))
+            self._db.executemany(
+                "INSERT OR IGNORE INTO resume_skills VALUES (?, ?)", [(resume_id, skill) for skill in skills]
+            )
+            if owner is not None:
+                self._db.execute("INSERT OR IGNORE INTO resume_owners VALUES (?, ?)", (resume_id, owner))
+            self._db.commit()
+
+    # 📌 One stored resume; with an owner, only if that owner uploaded it
+    def get_resume(self, resume_id, owner=None):
+        owned = "" if owner is None else " AND resume_id IN (SELECT resume_id FROM resume_owners WHERE owner = ?)"
+        with self._lock:
+            row = self._db.execute(
+                "SELECT resume_id, filename, extension, blob_key, score, ats, uploaded_at, text "
+                f"FROM resumes WHERE resume_id = ?{owned}", (resume_id,) if owner is None else (resume_id, owner)
+            ).fetchone()
+            if row is None:
+                return None
+            skills = [skill for (skill,) in self._db.execute(
+                "SELECT skill FROM resume_skills WHERE resume_id = ?", (resume_id,)
+            )]
+        return StoredResume(row[0], row[1], row[2], row[3], row[4], skills,
+                            json.loads(row[5]) if row[5] else None, row[6], row[7])
+
+    def save_ai_output(self, resume_id, model_name, text, job_description=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ai_outputs VALUES (?, ?, ?, ?, ?)",
+                (resume_id, model_name, _job_key(job_description), text, time.time()),
+            )
+            self._db.commit()
+
+    def get_ai_output(self, resume_id, model_name, job_description=None):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM ai_outputs WHERE resume_id = ? AND model = ? AND job_key = ?",
+                (resume_id, model_name, _job_key(job_description)),
+            ).fetchone()
+        return row[0] if row else None
+
+    # 📌 Filter by full-text query, skill, minimum score, upload date and owner (newest first, or by relevance)
+    def search(self, query=None, skill=None, min_score=None, since=None, limit=50, owner=None):
+        conditions, parameters = [], []
+        source = "resumes r"
+        snippet = "substr(r.text, 1, 160)"
+        order = "r.uploaded_at DESC"
+        if query and self.full_text:
+            source = "resumes_fts JOIN resumes r ON r.rowid = resumes_fts.rowid"
+            conditions.append("resumes_fts MATCH ?")
+            parameters.append(_fts_query(query))
+            snippet = "snippet(resumes_fts, 1, '**', '**', '…', 16)"
+            order = "bm25(resumes_fts)"
+        elif query:
+            conditions.append("r.text LIKE ?")
+            parameters.append(f"%{query}%")
+        if skill:
+            conditions.append("r.resume_id IN (SELECT resume_id FROM resume_skills WHERE skill = ?)")
+            parameters.append(skill.lower())
+        if min_score is not None:
+            conditions.append("r.score >= ?")
+            parameters.append(min_score)
+        if since is not None:
+            conditions.append("r.uploaded_at >= ?")
+            parameters.append(since)
+        if owner is not None:
+            conditions.append("r.resume_id IN (SELECT resume_id FROM resume_owners WHERE owner = ?)")
+            parameters.append(owner)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT r.resume_id, r.filename, r.score, r.uploaded_at, {snippet} FROM {source} {where} "
+                f"ORDER BY {order} LIMIT ?", parameters + [limit]
+            ).fetchall()
+            results = []
+            for resume_id, filename, score, uploaded_at, text in rows:
+                skills = [skill for (skill,) in self._db.execute(
+                    "SELECT skill FROM resume_skills WHERE resume_id = ?", (resume_id,)
+                )]
+                results.append(StoredSummary(resume_id, filename, score, skills, uploaded_at, text))
+        return results
+
+    # 📌 Ids of every resume an owner uploaded
+    def owned_resume_ids(self, owner):
+        with self._lock:
+            return {resume_id for (resume_id,) in self._db.execute(
+                "SELECT resume_id FROM resume_owners WHERE owner = ?", (owner,)
+            )}
+
+    # 📌 Delete resumes last uploaded before a timestamp, with their skills, owners and AI outputs;
+    # returns the blob keys no remaining resume refers to, for the caller to delete from the blob store
+    def purge(self, before):
+        with self._lock:
+            expired = "SELECT resume_id FROM resumes WHERE uploaded_at < ?"
+            blob_keys = {key for (key,) in self._db.execute(
+                "SELECT DISTINCT blob_key FROM resumes WHERE uploaded_at < ? AND blob_key IS NOT NULL", (before,)
+            )}
+            for table in ("resume_skills", "resume_owners", "ai_outputs"):
+                self._db.execute(f"DELETE FROM {table} WHERE resume_id IN ({expired})", (before,))
+            self._db.execute("DELETE FROM resumes WHERE uploaded_at < ?", (before,))
+            kept = {key for (key,) in self._db.execute("SELECT DISTINCT blob_key FROM resumes WHERE blob_key IS NOT NULL")}
+            self._db.commit()
+        return sorted(blob_keys - kept)
+
+
+def _fts_query(query):
+    # Quote every term so user input like "c++" or "node.js" is never parsed as FTS syntax
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+# ✅ Store implementations by URL scheme; other backends can register themselves
+STORE_FACTORIES = {
+    "sqlite": lambda location: SQLiteAnalysisStore(location),
+}
+
+
+def register_store(scheme, factory):
+    STORE_FACTORIES[scheme] = factory
+
+
+# 📌 Function to Open the analysis store named by a URL such as sqlite:///path/to/file.sqlite3
+def open_store(url=ANALYSIS_STORE_URL):
+    scheme, _, location = url.partition("://")
+    if scheme not in STORE_FACTORIES:
+        raise ValueError(f"Unknown analysis store '{scheme}'. Choose from: {', '.join(STORE_FACTORIES)}")
+    # sqlite:///relative/path and sqlite:////absolute/path, as in SQLAlchemy URLs
+    return STORE_FACTORIES[scheme](location[1:] if location.startswith("/") else location)
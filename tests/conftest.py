@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_gemini import start_fake_gemini
+
+
+# ✅ The app against a fake Gemini and throwaway stores; settings are read at import, so they are set
+# once per test session before the app's modules load
+@pytest.fixture(scope="session")
+def app_environment(tmp_path_factory):
+    server = start_fake_gemini(port=0, latency=0.0, chunk_delay=0.0)
+    storage = tmp_path_factory.mktemp("storage")
+    settings = {
+        "GOOGLE_API_KEY": "test",
+        "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{server.server_address[1]}",
+        "GEMINI_REQUESTS_PER_MINUTE": "1000000",
+        "ANALYSIS_STORE_URL": f"sqlite:///{storage / 'analysis.sqlite3'}",
+        "BLOB_STORE_PATH": str(storage / "blobs"),
+        "LLM_CACHE_PATH": str(storage / "llm_responses.sqlite3"),
+        "SEMANTIC_INDEX_PATH": str(storage / "semantic_index"),
+        "NLP_WARM_UP": "lazy",
+    }
+    with pytest.MonkeyPatch.context() as patch:
+        for name, value in settings.items():
+            patch.setenv(name, value)
+        patch.chdir(ROOT)
+        yield server
+    server.shutdown()
@@ -0,0 +1,60 @@
+import io
+import zipfile
+
+from streamlit.testing.v1 import AppTest
+
+from core import GEMINI_MODEL, IMPROVED_RESUME_MARKER, get_analysis_store
+from resume_corpus import generate_resume, write_docx
+
+ANALYZE_BUTTON = "🚀 Analyze Resume with AI"
+SCREEN_BUTTON = "🚀 Screen Resumes"
+
+
+def _upload_resume(app_test):
+    resume = generate_resume(0, file_format="docx")
+    app_test.file_uploader[0].upload("resume.docx", write_docx(resume)).run()
+    assert not app_test.exception, [element.value for element in app_test.exception]
+    return resume
+
+
+def test_analyze_button_saves_suggestions(app_environment):
+    app_test = AppTest.from_file("../project.py", default_timeout=60).run()
+    _upload_resume(app_test)
+
+    next(button for button in app_test.button if button.label == ANALYZE_BUTTON).click().run()
+
+    assert not app_test.exception, [element.value for element in app_test.exception]
+    assert not app_test.error, [element.value for element in app_test.error]
+    # The suggestions are kept in the session and the store, with the rewritten resume split out
+    suggestions = app_test.session_state.ai_suggestions
+    assert IMPROVED_RESUME_MARKER in suggestions
+    assert app_test.session_state.improved_resume
+    assert IMPROVED_RESUME_MARKER not in app_test.session_state.improved_resume
+    # The fake answers each part separately, as the model does, so every section appears exactly once
+    # and only the rewritten resume ends up in the improved resume
+    for heading in ("Overall Assessment", "Strengths", "Areas for Improvement", "Improved Resume"):
+        assert suggestions.count(f"## {heading}\n") == 1, heading
+    assert "Overall Assessment" not in app_test.session_state.improved_resume
+    assert suggestions.index("## Overall Assessment") < suggestions.index(IMPROVED_RESUME_MARKER)
+    assert get_analysis_store().get_ai_output(app_test.session_state.analysis.content_hash, GEMINI_MODEL) == suggestions
+
+
+def test_oversized_bulk_upload_is_rejected(app_environment, monkeypatch):
+    import batch
+
+    monkeypatch.setattr(batch, "API_MAX_BATCH_FILES", 1)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        for number in range(2):
+            bundle.writestr(f"resume_{number}.docx", write_docx(generate_resume(number, file_format="docx")))
+    app_test = AppTest.from_file("../project.py", default_timeout=60).run()
+    next(uploader for uploader in app_test.file_uploader if uploader.key == "bulk_upload").upload(
+        "resumes.zip", archive.getvalue()
+    ).run()
+
+    next(button for button in app_test.button if button.label == SCREEN_BUTTON).click().run()
+
+    assert not app_test.exception, [element.value for element in app_test.exception]
+    assert any("more than 1 resumes" in element.value for element in app_test.error), \
+        [element.value for element in app_test.error]
+    assert "bulk_results" not in app_test.session_state